@@ -0,0 +1,130 @@
+"""Opt-in throughput numbers for the hot paths; not collected by pytest.
+
+    python -m benchmarks.throughput
+"""
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.engine import ItemCodec, serialize_item
+
+ROWS = 5000
+
+
+class User(DynoLayer):
+    def __init__(self) -> None:
+        super().__init__(
+            entity="users",
+            required_fields=["first_name", "email", "role"],
+            fillable=["id", "first_name", "last_name", "email", "role", "stars", "stats", "phones"],
+            timestamps=True,
+            timestamp_format="numeric",
+            partition_key="id",
+        )
+
+
+def make_rows(count):
+    return [
+        {"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common", "stars": i % 5}
+        for i in range(count)
+    ]
+
+
+def best_elapsed(function, rounds=3):
+    elapsed = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        elapsed.append(time.perf_counter() - started)
+    return min(elapsed)
+
+
+def report(title, count, unit, results):
+    print(title)
+    for label, elapsed in results:
+        print(f"  {label:<24} {count / elapsed:>14,.0f} {unit}/s")
+
+
+def bench_hydration():
+    rows = make_rows(ROWS)
+
+    def hydrate_with_init():
+        for row in rows:
+            instance = User()
+            instance._data = row
+
+    def hydrate_fast():
+        for row in rows:
+            User._hydrate(row)
+
+    User._hydrate(rows[0])
+    report("Hydration", len(rows), "rows", [
+        ("__init__ per row", best_elapsed(hydrate_with_init)),
+        ("_hydrate", best_elapsed(hydrate_fast)),
+    ])
+
+
+def bench_codec():
+    serializer = TypeSerializer()
+    deserializer = TypeDeserializer()
+    raw = [
+        {key: serializer.serialize(value) for key, value in dict(row, stats={"wins": row["id"], "tags": ["a", "b"]},
+                                                                   active=True).items()}
+        for row in make_rows(ROWS)
+    ]
+    codec = ItemCodec()
+
+    def with_boto3():
+        return [{key: deserializer.deserialize(value) for key, value in item.items()} for item in raw]
+
+    def with_codec():
+        return codec.deserialize_items(raw)
+
+    report("Deserialization", len(raw), "items", [
+        ("TypeDeserializer", best_elapsed(with_boto3)),
+        ("ItemCodec", best_elapsed(with_codec)),
+    ])
+
+
+def bench_serializer():
+    rows = [{"id": i, "name": f"User{i}", "stars": Decimal(i % 5), "tags": ["a", "b"], "active": True}
+            for i in range(ROWS)]
+    serializer = TypeSerializer()
+
+    def with_boto3():
+        return [{key: serializer.serialize(value) for key, value in row.items()} for row in rows]
+
+    def with_engine():
+        return [serialize_item(row) for row in rows]
+
+    report("Serialization", len(rows), "items", [
+        ("TypeSerializer", best_elapsed(with_boto3)),
+        ("serialize_item", best_elapsed(with_engine)),
+    ])
+
+
+def bench_number_mode():
+    raw = [{"id": {"N": str(i)}, "stars": {"N": str(i % 5)}, "score": {"N": f"{i}.25"},
+            "stats": {"M": {"wins": {"N": str(i)}, "ratio": {"N": "0.5"}}}} for i in range(ROWS)]
+    decimal_codec = ItemCodec()
+    single_pass = ItemCodec(number_mode="int_or_float")
+
+    def decimal_then_convert():
+        return single_pass.convert_items(decimal_codec.deserialize_items(raw))
+
+    def int_or_float():
+        return single_pass.deserialize_items(raw)
+
+    report("number_mode", len(raw), "items", [
+        ("Decimal + conversion", best_elapsed(decimal_then_convert)),
+        ("int_or_float", best_elapsed(int_or_float)),
+    ])
+
+
+if __name__ == "__main__":
+    bench_hydration()
+    bench_codec()
+    bench_serializer()
+    bench_number_mode()
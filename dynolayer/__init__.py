@@ -1,5 +1,9 @@
 from .config import DynoConfig
 from .dynolayer import DynoLayer
+from .prepared import PreparedQuery
+from .checkpoint import CheckpointStore, FileCheckpointStore, ModelCheckpointStore
+from .session import Session
+from .aio import AsyncDynoLayer, AsyncQuery
 from .exceptions import (
     DynoLayerException,
     QueryException,
@@ -8,4 +12,5 @@ from .exceptions import (
     InvalidArgumentException,
     AutoIdException,
     ConditionalCheckException,
-)
\ No newline at end of file
+    BatchOperationException,
+)
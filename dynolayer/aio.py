@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from dynolayer.config import DynoConfig
+from dynolayer.dynolayer import DynoLayer, _CONTEXT_STATE
+
+_executor = None
+_executor_size = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # boto3 is blocking, so calls run on a shared, bounded pool; its size caps concurrent requests
+    global _executor, _executor_size
+    size = int(DynoConfig.get("async_max_workers"))
+    with _executor_lock:
+        if _executor is None or _executor_size != size:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="dynolayer-aio")
+            _executor_size = size
+        return _executor
+
+
+def shutdown_executor(wait=True) -> None:
+    global _executor, _executor_size
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+        _executor = None
+        _executor_size = None
+
+
+async def _run(function, *args, **kwargs):
+    # The caller's context travels with the call, so DynoLayer.session() keeps working across the hop,
+    # and fail()/last_batch_stats() set by the call are copied back to the awaiting task
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), partial(context.run, function, *args, **kwargs))
+    finally:
+        for variable in _CONTEXT_STATE:
+            variable.set(context.get(variable))
+
+
+async def _iterate(pages) -> AsyncIterator:
+    _end = object()
+    try:
+        while True:
+            page = await _run(next, pages, _end)
+            if page is _end:
+                return
+            yield page
+    finally:
+        await _run(pages.close)
+
+
+class AsyncQuery:
+    # Builder methods stay synchronous and chainable; only the methods that do I/O are awaited
+    def __init__(self, query: DynoLayer):
+        self._query = query
+
+    def __getattr__(self, item):
+        attribute = getattr(self._query, item)
+        if not callable(attribute):
+            return attribute
+
+        def chain(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            return self if result is self._query else result
+        return chain
+
+    async def get(self, all=False, paginate=False, as_dicts=False, deadline=None):
+        return await _run(self._query.get, all, paginate, as_dicts, deadline)
+
+    async def fetch(self, all=False, paginate=False, as_dicts=False, deadline=None):
+        return await _run(self._query.fetch, all, paginate, as_dicts, deadline)
+
+    async def count(self) -> int:
+        return await _run(self._query.count)
+
+    async def exists(self) -> bool:
+        return await _run(self._query.exists)
+
+    async def first(self, as_dicts=False):
+        return await _run(self._query.first, as_dicts)
+
+    async def explain(self, paginate=False, analyze=False) -> Optional[Dict]:
+        return await _run(self._query.explain, paginate, analyze)
+
+    async def stream(self, as_dicts=False, prefetch: int = None, checkpoint=None,
+                     checkpoint_every: int = 1) -> AsyncIterator:
+        # Hops to the pool once per page rather than once per item
+        pages = self._query.stream_pages(as_dicts=as_dicts, prefetch=prefetch, checkpoint=checkpoint,
+                                         checkpoint_every=checkpoint_every)
+        async for page in _iterate(pages):
+            for row in page:
+                yield row
+
+    async def stream_pages(self, chunk_size: int = None, as_dicts=False, prefetch: int = None, checkpoint=None,
+                           checkpoint_every: int = 1) -> AsyncIterator:
+        pages = self._query.stream_pages(chunk_size, as_dicts=as_dicts, prefetch=prefetch, checkpoint=checkpoint,
+                                         checkpoint_every=checkpoint_every)
+        async for page in _iterate(pages):
+            yield page
+
+
+class AsyncDynoLayer:
+    def __init__(self, model: Type[DynoLayer]):
+        self.model = model
+
+    def __getattr__(self, item):
+        # Everything without I/O (fail(), last_batch_stats(), cache_stats(), session(), ...) is passed through
+        return getattr(self.model, item)
+
+    def where(self, *args) -> AsyncQuery:
+        return AsyncQuery(self.model.where(*args))
+
+    def all(self) -> AsyncQuery:
+        return AsyncQuery(self.model.all())
+
+    def find(self, terms: str = None, /, **values) -> AsyncQuery:
+        return AsyncQuery(self.model().find(terms, **values))
+
+    def query(self) -> AsyncQuery:
+        return AsyncQuery(self.model())
+
+    async def get_item(self, key: dict, attributes: List[str] = None) -> Optional[DynoLayer]:
+        return await _run(self.model.get_item, key, attributes)
+
+    async def find_or_fail(self, key: dict, message="Record not found.",
+                           attributes: List[str] = None) -> Optional[DynoLayer]:
+        return await _run(self.model.find_or_fail, key, message, attributes)
+
+    async def create(self, data: Dict, unique=False) -> Optional[DynoLayer]:
+        return await _run(self.model.create, data, unique)
+
+    async def delete(self, key: dict) -> bool:
+        return await _run(self.model.delete, key)
+
+    async def save(self, record: DynoLayer, condition=None) -> bool:
+        return await _run(record.save, condition)
+
+    async def destroy(self, record: DynoLayer) -> bool:
+        return await _run(record.destroy)
+
+    async def batch_create(self, items: List[Dict], pipeline=False, workers: int = None) -> List[DynoLayer]:
+        return await _run(self.model.batch_create, items, pipeline, workers)
+
+    async def batch_find(self, keys: List[Dict], workers: int = None, as_dicts=False):
+        return await _run(self.model.batch_find, keys, workers, as_dicts)
+
+    async def batch_destroy(self, keys: List[Dict], pipeline=False, workers: int = None) -> bool:
+        return await _run(self.model.batch_destroy, keys, pipeline, workers)
+
+    @staticmethod
+    async def transact_write(operations: List[Dict]) -> bool:
+        return await _run(DynoLayer.transact_write, operations)
+
+    @staticmethod
+    async def transact_get(requests: List[tuple]) -> List[Any]:
+        return await _run(DynoLayer.transact_get, requests)
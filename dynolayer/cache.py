@@ -0,0 +1,177 @@
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+class LRUCache:
+    _MISSING = object()
+
+    def __init__(self, max_size=128):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        # A callable limit lets caches created at import time follow DynoConfig changes
+        return self._max_size() if callable(self._max_size) else self._max_size
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            limit = self.max_size
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ItemCache:
+    # Process-local read-through cache of full items, keyed by their primary key
+    _instances = weakref.WeakSet()
+
+    def __init__(self, table: str, key_attributes, ttl=None, max_entries=None, max_bytes=None):
+        self.table = table
+        self.key_attributes = tuple(key_attributes)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        ItemCache._instances.add(self)
+
+    def key_for(self, key_or_item: dict) -> tuple:
+        return tuple(key_or_item.get(attr) for attr in self.key_attributes)
+
+    def get(self, key: dict):
+        cache_key = self.key_for(key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self.__remove(cache_key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+        # Callers get their own copy, so mutating a model never changes the cached item
+        return copy.deepcopy(entry[0])
+
+    def set(self, item: dict):
+        # The size is an estimate based on the item's repr, good enough to bound memory
+        size = len(repr(item))
+        if self.max_bytes and size > self.max_bytes:
+            return
+        cache_key = self.key_for(item)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if cache_key in self._entries:
+                self.__remove(cache_key)
+            self._entries[cache_key] = (copy.deepcopy(item), expires_at, size)
+            self._bytes += size
+            while self._entries and (
+                (self.max_entries and len(self._entries) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                self.__remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key_or_item: dict):
+        cache_key = self.key_for(key_or_item)
+        with self._lock:
+            if cache_key in self._entries:
+                self.__remove(cache_key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+    @classmethod
+    def discard_from_table(cls, table: str, key_or_item: dict):
+        # Writes that bypass the model (e.g. transact_write) invalidate every cache of the table
+        for cache in list(cls._instances):
+            if cache.table == table:
+                cache.discard(key_or_item)
+
+    def __remove(self, cache_key):
+        _, _, size = self._entries.pop(cache_key)
+        self._bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def serialize_position(position: Optional[Dict], segments: int = None) -> Dict[str, Any]:
+    # Keys may hold Decimal/Binary values, so they are stored in DynamoDB JSON
+    if position is None:
+        return {"segments": segments, "position": None}
+    if segments:
+        return {
+            "segments": segments,
+            "position": {str(segment): _serialize_key(key) for segment, key in position.items()},
+        }
+    return {"segments": None, "position": _serialize_key(position)}
+
+
+def deserialize_position(state: Dict[str, Any]) -> Optional[Dict]:
+    position = state.get("position")
+    if position is None:
+        return None
+    if state.get("segments"):
+        return {int(segment): _deserialize_key(key) for segment, key in position.items()}
+    return _deserialize_key(position)
+
+
+def _serialize_key(key: Optional[Dict]) -> Dict:
+    return {attr: _serializer.serialize(value) for attr, value in (key or {}).items()}
+
+
+def _deserialize_key(key: Dict) -> Dict:
+    return {attr: _deserializer.deserialize(value) for attr, value in key.items()}
+
+
+class CheckpointStore(ABC):
+    @abstractmethod
+    def load(self) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def save(self, state: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class FileCheckpointStore(CheckpointStore):
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename, so a timeout mid-write never leaves a truncated checkpoint
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ModelCheckpointStore(CheckpointStore):
+    def __init__(self, model, name: str, attribute: str = "checkpoint"):
+        self.model = model
+        self.name = name
+        self.attribute = attribute
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        record = self.model.get_item(self.__key())
+        self.__raise_on_failure()
+        state = record.data().get(self.attribute) if record is not None else None
+        if state is None:
+            return None
+        return json.loads(state)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self.model.create({**self.__key(), self.attribute: json.dumps(state)})
+        self.__raise_on_failure()
+
+    def clear(self) -> None:
+        self.model.delete(self.__key())
+        self.__raise_on_failure()
+
+    def __key(self) -> Dict[str, str]:
+        return {self.model()._partition_keys[0]: self.name}
+
+    def __raise_on_failure(self):
+        # A checkpoint that silently fails to persist would restart the export from scratch
+        error = self.model.fail()
+        if error is not None:
+            raise error
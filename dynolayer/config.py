@@ -13,6 +13,26 @@ class DynoConfig:
         "retry_max_attempts": 3,
         "retry_mode": "adaptive",
         "auto_id_table": "dynolayer_sequences",
+        "auto_id_block_size": 1,
+        "parallel_max_workers": 32,
+        "batch_max_workers": 4,
+        "batch_max_retries": 8,
+        "batch_backoff_base": 0.05,
+        "batch_backoff_max": 5.0,
+        "expression_cache_size": 256,
+        "auto_index": True,
+        "scan_policy": "allow",
+        "scan_max_pages": None,
+        "scan_max_items": None,
+        "deadline_margin_ms": 500,
+        "item_cache": False,
+        "item_cache_ttl": 60,
+        "item_cache_max_entries": 1000,
+        "item_cache_max_bytes": None,
+        "coalesce_reads": False,
+        "async_max_workers": 16,
+        "engine": "resource",
+        "number_mode": "decimal",
     }
 
     _env_map = {
@@ -1,43 +1,338 @@
+import copy
+import queue
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import boto3
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from dynolayer.config import DynoConfig
-from dynolayer.exceptions import ConditionalCheckException
+from dynolayer.engine import (
+    DEFAULT_CODECS, ClientResource, ClientTable, ItemCodec, NumberModeResource, NumberModeTable,
+)
+from dynolayer.exceptions import ConditionalCheckException, BatchOperationException, InvalidArgumentException
+
+
+class _ScanBudget:
+    # Shared by every segment of a parallel scan, so pages and items are reserved under a lock
+    def __init__(self, max_pages=None, max_items=None):
+        self.max_pages = max_pages
+        self.max_items = max_items
+        self.pages = 0
+        self.items = 0
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def acquire(self, limit=None):
+        with self._lock:
+            if self.max_pages is not None and self.pages >= self.max_pages:
+                self.exhausted = True
+                return False, None
+            if self.max_items is not None:
+                remaining = self.max_items - self.items
+                if remaining <= 0:
+                    self.exhausted = True
+                    return False, None
+                # Limit caps the items DynamoDB reads for the page, so the budget is never exceeded
+                limit = min(limit, remaining) if limit else remaining
+                self.items += limit
+            self.pages += 1
+            return True, limit
+
+    def release(self, reserved, scanned):
+        if self.max_items is None:
+            return
+        with self._lock:
+            self.items -= max(reserved - scanned, 0)
+
+
+class _Deadline:
+    # Stops pagination while there is still time for the slowest page seen so far plus a margin
+    def __init__(self, deadline, margin_ms=0):
+        if callable(deadline):
+            self._remaining_ms = deadline
+        else:
+            ends_at = time.monotonic() + deadline
+            self._remaining_ms = lambda: (ends_at - time.monotonic()) * 1000
+        self.margin_ms = margin_ms
+        self.slowest_ms = 0.0
+        self.expired = False
+
+    def allows_page(self) -> bool:
+        if self._remaining_ms() - self.margin_ms > self.slowest_ms:
+            return True
+        self.expired = True
+        return False
+
+    def fetch(self, operation, **kwargs):
+        started = time.perf_counter()
+        response = operation(**kwargs)
+        self.slowest_ms = max(self.slowest_ms, (time.perf_counter() - started) * 1000)
+        return response
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class _SingleFlight:
+    # Concurrent calls with the same key wait for the one already in flight instead of repeating it
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key, operation):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                flight.waiters += 1
+                self.collapsed += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            # Every waiter gets its own copy, so callers never share mutable results
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = operation()
+            with self._lock:
+                del self._flights[key]
+                waiters = flight.waiters
+            if waiters:
+                # Waiters copy from a snapshot taken before they wake up, never from the object handed
+                # to the leader's caller, which may already be changing it
+                flight.result = copy.deepcopy(result)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self.executed + self.collapsed
+            return {
+                "executed": self.executed,
+                "collapsed": self.collapsed,
+                "collapse_ratio": self.collapsed / requests if requests else 0.0,
+                "in_flight": len(self._flights),
+            }
+
+
+def _request_key(value):
+    # Hashable fingerprint of request parameters, including boto3 condition objects
+    if isinstance(value, ConditionBase):
+        expression = value.get_expression()
+        return expression["operator"], tuple(_request_key(item) for item in expression["values"])
+    if isinstance(value, AttributeBase):
+        return type(value).__name__, value.name
+    if isinstance(value, dict):
+        return frozenset((key, _request_key(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_request_key(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_request_key(item) for item in value)
+    # The type keeps True and 1 apart
+    return type(value).__name__, value
+
+
+_executor = None
+_executor_size = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Long-lived pool for parallel scans and batches: its threads keep their boto3 resources between calls
+    global _executor, _executor_size
+    size = int(DynoConfig.get("parallel_max_workers"))
+    with _executor_lock:
+        if _executor is None or _executor_size != size:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="dynolayer")
+            _executor_size = size
+        return _executor
+
+
+def shutdown_executor(wait=True) -> None:
+    global _executor, _executor_size
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+        _executor = None
+        _executor_size = None
+
+
+class _ProducerThreads:
+    # Background producers of streams. They block until the consumer catches up, so they must not sit on
+    # the pool _map_parallel waits on: an idle thread here is reused (keeping its boto3 resources) and a
+    # new one is started whenever none is idle, so a producer never waits for a free thread
+    def __init__(self, idle_timeout=60.0):
+        self.idle_timeout = idle_timeout
+        self._tasks = queue.Queue()
+        self._idle = 0
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def submit(self, function) -> None:
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+                self._tasks.put(function)
+                return
+            self._started += 1
+            name = f"dynolayer-stream_{self._started}"
+        threading.Thread(target=self._work, args=(function,), name=name, daemon=True).start()
+
+    def _work(self, function):
+        while True:
+            try:
+                function()
+            except BaseException:
+                # Producers report their own errors through the stream
+                pass
+            with self._lock:
+                self._idle += 1
+            try:
+                function = self._tasks.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Tasks are queued under the lock, so one handed over right after the timeout is still seen
+                with self._lock:
+                    try:
+                        function = self._tasks.get_nowait()
+                    except queue.Empty:
+                        self._idle -= 1
+                        return
+
+
+_producer_threads = _ProducerThreads()
+
+
+def _map_parallel(function, items, workers: int) -> list:
+    # Runs function over items with at most `workers` calls at a time and keeps the order of items.
+    # The caller works too, so a busy (or nested) pool only slows a call down, it never blocks it.
+    items = list(items)
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [function(item) for item in items]
+
+    results = [None] * len(items)
+    positions = iter(range(len(items)))
+    errors = []
+    lock = threading.Lock()
+
+    def run():
+        while True:
+            with lock:
+                position = None if errors else next(positions, None)
+            if position is None:
+                return
+            try:
+                results[position] = function(items[position])
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+
+    executor = _get_executor()
+    futures = [executor.submit(run) for _ in range(workers - 1)]
+    run()
+    for future in futures:
+        future.result()
+    if errors:
+        raise errors[0]
+    return results
 
 
 class CrudMixin:
+    _session = None
     _dynamodb = None
     _client = None
     _table_keys_cache = {}
-    _table_cache = {}
+    _local = threading.local()
+    _id_blocks = {}
+    # One lock per (sequences table, entity), so a reservation only holds back ids of the same sequence
+    _id_block_locks = {}
+    _id_blocks_lock = threading.Lock()
+    # boto3 sessions are not safe to create concurrently; clients are shared, resources are per thread
+    _boto_lock = threading.RLock()
+    _cache_lock = threading.Lock()
+    _single_flight = _SingleFlight()
+    _PROBE_PAGE_SIZE = 10
+    _PROBE_MAX_PAGE_SIZE = 1000
+    _VALID_ENGINES = ("resource", "client")
+    engine = None
+    number_mode = None
+    attribute_types = None
+    _item_codec = None
 
     @classmethod
     def _get_session(cls):
-        profile_name = DynoConfig.get("profile_name")
-        if profile_name:
-            return boto3.Session(profile_name=profile_name)
-        return boto3.Session()
+        # One session for the process: it caches the service models, so per-thread resources are cheap
+        with CrudMixin._boto_lock:
+            if CrudMixin._session is None:
+                profile_name = DynoConfig.get("profile_name")
+                CrudMixin._session = boto3.Session(profile_name=profile_name) if profile_name else boto3.Session()
+            return CrudMixin._session
 
     @classmethod
     def _get_dynamodb(cls):
-        if cls._dynamodb is None:
-            cls._dynamodb = cls._get_session().resource(
-                "dynamodb",
-                **cls._build_boto_kwargs(),
-            )
-        return cls._dynamodb
+        # Shared resource kept for callers outside the library; internally _get_thread_dynamodb() is used
+        if CrudMixin._dynamodb is None:
+            with CrudMixin._boto_lock:
+                if CrudMixin._dynamodb is None:
+                    CrudMixin._dynamodb = cls._get_session().resource(
+                        "dynamodb",
+                        **cls._build_boto_kwargs(),
+                    )
+        return CrudMixin._dynamodb
 
     @classmethod
     def _get_client(cls):
-        if cls._client is None:
-            cls._client = cls._get_session().client(
-                "dynamodb",
-                **cls._build_boto_kwargs(),
-            )
-        return cls._client
+        # Low-level clients are thread-safe, so a single one is shared
+        if CrudMixin._client is None:
+            with CrudMixin._boto_lock:
+                if CrudMixin._client is None:
+                    CrudMixin._client = cls._get_session().client(
+                        "dynamodb",
+                        **cls._build_boto_kwargs(),
+                    )
+        return CrudMixin._client
+
+    @classmethod
+    def _get_thread_dynamodb(cls):
+        # boto3 resources are not thread-safe, so every thread gets its own
+        local = CrudMixin._local
+        if getattr(local, "dynamodb", None) is None:
+            with CrudMixin._boto_lock:
+                resource = cls._get_session().resource(
+                    "dynamodb",
+                    **cls._build_boto_kwargs(),
+                )
+            local.tables = {}
+            local.dynamodb = resource
+        return local.dynamodb
 
     @classmethod
     def _build_boto_kwargs(cls):
@@ -65,10 +360,14 @@ class CrudMixin:
 
     @classmethod
     def _reset_boto_clients(cls):
+        CrudMixin._session = None
         CrudMixin._dynamodb = None
         CrudMixin._client = None
-        CrudMixin._table_keys_cache.clear()
-        CrudMixin._table_cache.clear()
+        with CrudMixin._cache_lock:
+            CrudMixin._table_keys_cache.clear()
+        CrudMixin._local = threading.local()
+        CrudMixin._id_blocks.clear()
+        CrudMixin._id_block_locks.clear()
 
     def __init__(self, entity: str, partition_key: str = "", sort_key: str = None):
         self._entity = entity
@@ -79,9 +378,56 @@ class CrudMixin:
 
     @property
     def _table(self):
-        if self._entity not in CrudMixin._table_cache:
-            CrudMixin._table_cache[self._entity] = self._get_dynamodb().Table(self._entity)
-        return CrudMixin._table_cache[self._entity]
+        return self._thread_table()
+
+    def _thread_table(self, entity: str = None):
+        entity = entity or self._entity
+        codec = self._codec()
+        if self._client_engine():
+            return ClientTable(self._get_client(), entity, codec)
+        dynamodb = self._get_thread_dynamodb()
+        tables = CrudMixin._local.tables
+        if entity not in tables:
+            tables[entity] = dynamodb.Table(entity)
+        if codec.number_mode != "decimal":
+            return NumberModeTable(tables[entity], codec)
+        return tables[entity]
+
+    def _thread_dynamodb(self):
+        codec = self._codec()
+        if self._client_engine():
+            return ClientResource(self._get_client(), codec)
+        if codec.number_mode != "decimal":
+            return NumberModeResource(self._get_thread_dynamodb(), codec)
+        return self._get_thread_dynamodb()
+
+    def _client_engine(self) -> bool:
+        setting = getattr(type(self), "engine", None)
+        engine = setting if setting is not None else DynoConfig.get("engine")
+        if engine not in self._VALID_ENGINES:
+            raise InvalidArgumentException(
+                f"Invalid engine: '{engine}'",
+                method="engine",
+                expected=f"One of: {', '.join(self._VALID_ENGINES)}",
+                received=str(engine)
+            )
+        return engine == "client"
+
+    @classmethod
+    def _codec(cls) -> ItemCodec:
+        # Built once per model class (and rebuilt if number_mode changes); models without declared
+        # types share the default codec of their number_mode
+        number_mode = cls.number_mode if cls.number_mode is not None else DynoConfig.get("number_mode")
+        codec = cls.__dict__.get("_item_codec")
+        if codec is None or codec.number_mode != number_mode:
+            if cls.attribute_types:
+                codec = ItemCodec(cls.attribute_types, number_mode)
+            elif number_mode in DEFAULT_CODECS:
+                codec = DEFAULT_CODECS[number_mode]
+            else:
+                codec = ItemCodec(number_mode=number_mode)
+            cls._item_codec = codec
+        return codec
 
     def _describe(self):
         return self._get_client().describe_table(TableName=self._entity)
@@ -135,30 +481,117 @@ class CrudMixin:
 
         return True
 
-    def _batch_get(self, keys: list):
+    def _batch_write(self, requests: list, workers=None):
+        started = time.perf_counter()
+        chunks = [requests[i:i + 25] for i in range(0, len(requests), 25)]
+        workers = min(workers or int(DynoConfig.get("batch_max_workers")), len(chunks) or 1)
+
+        results = _map_parallel(self._batch_write_chunk, chunks, workers)
+
+        failed_items = [request for result in results for request in result["failed_items"]]
+        return {
+            "operation": "batch_write",
+            "written": sum(result["written"] for result in results),
+            "retried": sum(result["retried"] for result in results),
+            "failed": len(failed_items),
+            "failed_items": failed_items,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def _batch_write_chunk(self, chunk: list):
+        max_retries = int(DynoConfig.get("batch_max_retries"))
+        dynamodb = self._thread_dynamodb()
+        pending = chunk
+        retried = 0
+        attempt = 0
+
+        while True:
+            response = dynamodb.batch_write_item(RequestItems={self._entity: pending})
+            unprocessed = response.get("UnprocessedItems", {}).get(self._entity, [])
+            if not unprocessed or attempt >= max_retries:
+                break
+
+            time.sleep(self._backoff_delay(attempt))
+            attempt += 1
+            retried += len(unprocessed)
+            pending = unprocessed
+
+        return {
+            "written": len(chunk) - len(unprocessed),
+            "retried": retried,
+            "failed_items": unprocessed,
+        }
+
+    def _batch_get(self, keys: list, workers=None):
+        started = time.perf_counter()
+        chunks = [keys[i:i + 100] for i in range(0, len(keys), 100)]
+        workers = min(workers or int(DynoConfig.get("batch_max_workers")), len(chunks) or 1)
+
+        results = _map_parallel(self._batch_get_chunk, chunks, workers)
+
         all_items = []
+        chunk_stats = []
+        for i, (items, stats) in enumerate(results):
+            all_items.extend(items)
+            chunk_stats.append({"chunk": i, **stats})
+
+        self._batch_stats = {
+            "operation": "batch_get",
+            "chunks": chunk_stats,
+            "retries": sum(stats["retries"] for stats in chunk_stats),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
 
-        for i in range(0, len(keys), 100):
-            chunk = keys[i:i + 100]
-            response = self._get_dynamodb().batch_get_item(
-                RequestItems={
-                    self._entity: {"Keys": chunk}
-                }
-            )
-            all_items.extend(response.get("Responses", {}).get(self._entity, []))
+        return all_items
+
+    def _batch_get_chunk(self, chunk: list):
+        started = time.perf_counter()
+        max_retries = int(DynoConfig.get("batch_max_retries"))
+        dynamodb = self._thread_dynamodb()
+        request_items = {self._entity: {"Keys": chunk}}
+        items = []
+        retries = 0
+
+        while True:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            items.extend(response.get("Responses", {}).get(self._entity, []))
 
             unprocessed = response.get("UnprocessedKeys", {})
-            while unprocessed.get(self._entity):
-                response = self._get_dynamodb().batch_get_item(RequestItems=unprocessed)
-                all_items.extend(response.get("Responses", {}).get(self._entity, []))
-                unprocessed = response.get("UnprocessedKeys", {})
+            if not unprocessed.get(self._entity):
+                break
+
+            if retries >= max_retries:
+                raise BatchOperationException(
+                    f"batch_get_item left unprocessed keys after {retries} retries.",
+                    operation="batch_get",
+                    unprocessed=len(unprocessed[self._entity]["Keys"]),
+                    retries=retries,
+                )
 
-        return all_items
+            time.sleep(self._backoff_delay(retries))
+            retries += 1
+            request_items = unprocessed
 
-    def _update(self, data: dict, index_key: dict, condition=None):
+        return items, {
+            "keys": len(chunk),
+            "retries": retries,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        # Full jitter: sleep a random amount up to the capped exponential delay
+        ceiling = min(
+            float(DynoConfig.get("batch_backoff_max")),
+            float(DynoConfig.get("batch_backoff_base")) * (2 ** attempt),
+        )
+        return random.uniform(0, ceiling)
+
+    def _update(self, data: dict, index_key: dict, condition=None, remove=None):
         expression_values = dict()
         expression_names = dict()
         update_expression = list()
+        remove_expression = list()
 
         for i, (key, value) in enumerate(data.items()):
             safe = re.sub(r"[^a-zA-Z0-9_]", "_", key) + f"_{i}"
@@ -166,15 +599,25 @@ class CrudMixin:
             expression_names[f"#{safe}"] = key
             update_expression.append(f"#{safe} = :{safe}")
 
-        update_expression = "SET " + ", ".join(update_expression)
+        for i, key in enumerate(remove or []):
+            safe = re.sub(r"[^a-zA-Z0-9_]", "_", key) + f"_r{i}"
+            expression_names[f"#{safe}"] = key
+            remove_expression.append(f"#{safe}")
+
+        clauses = []
+        if update_expression:
+            clauses.append("SET " + ", ".join(update_expression))
+        if remove_expression:
+            clauses.append("REMOVE " + ", ".join(remove_expression))
 
         kwargs = {
             "Key": index_key,
-            "UpdateExpression": update_expression,
-            "ExpressionAttributeValues": expression_values,
+            "UpdateExpression": " ".join(clauses),
             "ExpressionAttributeNames": expression_names,
             "ReturnValues": "UPDATED_NEW",
         }
+        if expression_values:
+            kwargs["ExpressionAttributeValues"] = expression_values
         if condition is not None:
             kwargs["ConditionExpression"] = condition
 
@@ -191,6 +634,23 @@ class CrudMixin:
 
         return True
 
+    def _condition_check(self, index_key: dict, condition):
+        # Used when there is nothing to write: the condition is still evaluated, without touching the item
+        table = ClientTable(self._get_client(), self._entity, self._codec())
+        try:
+            table.condition_check(Key=index_key, ConditionExpression=condition)
+        except ClientError as e:
+            reasons = e.response.get("CancellationReasons") or []
+            if any(reason.get("Code") == "ConditionalCheckFailed" for reason in reasons):
+                raise ConditionalCheckException(
+                    "Conditional check failed on update.",
+                    operation="update",
+                    key=index_key,
+                )
+            raise
+
+        return True
+
     def _transact_write(self, operations: list):
         self._get_client().transact_write_items(TransactItems=operations)
         return True
@@ -200,7 +660,7 @@ class CrudMixin:
         return [item.get("Item", {}) for item in response.get("Responses", [])]
 
     def _query(self, key_condition: str, filter_expression=None, index=None,
-               limit=None, return_all=False, pe=None, offset=None):
+               limit=None, return_all=False, pe=None, offset=None, deadline=None, take=None, key_attributes=None):
         query_attributes = {"KeyConditionExpression": key_condition}
 
         if filter_expression:
@@ -218,19 +678,47 @@ class CrudMixin:
         if offset:
             query_attributes["ExclusiveStartKey"] = offset
 
-        response = self._table.query(**query_attributes)
-        data = response["Items"]
-        if return_all:
-            while "LastEvaluatedKey" in response:
-                query_attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-                response = self._table.query(**query_attributes)
-                data.extend(response["Items"])
-
-        return {
-            "Items": data,
-            "Count": response.get("Count", len(data)),
-            "LastEvaluatedKey": response.get("LastEvaluatedKey")
-        }
+        def run():
+            # Resolved here so that only the leader of a coalesced read builds a table for its thread
+            query = self._table.query if deadline is None else partial(deadline.fetch, self._table.query)
+            if take:
+                self._take_page_limit(query_attributes, limit, take, 0)
+            response = query(**query_attributes)
+            data = response["Items"]
+            if return_all or take:
+                while "LastEvaluatedKey" in response and not (take and len(data) >= take):
+                    if deadline is not None and not deadline.allows_page():
+                        break
+                    query_attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+                    if take:
+                        self._take_page_limit(query_attributes, limit, take, len(data))
+                    response = query(**query_attributes)
+                    data.extend(response["Items"])
+
+            if take:
+                return self._take_items(data, response.get("LastEvaluatedKey"), take, key_attributes)
+
+            return {
+                "Items": data,
+                "Count": response.get("Count", len(data)),
+                "LastEvaluatedKey": response.get("LastEvaluatedKey")
+            }
+
+        # A deadline belongs to one caller, so time-bounded reads are never shared
+        if deadline is None and self._coalescing_enabled():
+            key = ("query", self._entity, self._flight_scope(), _request_key(query_attributes), return_all, take,
+                   tuple(key_attributes or ()))
+            return self._single_flight.do(key, run)
+        return run()
+
+    def _coalescing_enabled(self) -> bool:
+        setting = getattr(type(self), "coalesce_reads", None)
+        return bool(setting if setting is not None else DynoConfig.get("coalesce_reads"))
+
+    def _flight_scope(self) -> tuple:
+        # Models that decode the same table differently (engine, number_mode, attribute_types) never share
+        # a flight: the codec is built per model class, or shared only by models that decode alike
+        return self._client_engine(), type(self)._codec()
 
     def _count_query(self, key_condition, filter_expression=None, index=None):
         query_attributes = {
@@ -255,25 +743,57 @@ class CrudMixin:
 
         return total
 
-    def _count_scan(self, filter_expression=None):
+    def _count_scan(self, filter_expression=None, segment=None, total_segments=None, offset=None, budget=None):
         scan_attributes = {"Select": "COUNT"}
+        table = self._table
 
         if filter_expression:
             scan_attributes["FilterExpression"] = filter_expression
 
-        total = 0
-        response = self._table.scan(**scan_attributes)
-        total += response.get("Count", 0)
+        if offset:
+            scan_attributes["ExclusiveStartKey"] = offset
+
+        if total_segments:
+            scan_attributes["Segment"] = segment
+            scan_attributes["TotalSegments"] = total_segments
+            table = self._thread_table()
+
+        response = self._scan_page(table, scan_attributes, None, budget)
+        if response is None:
+            return {"Count": 0, "LastEvaluatedKey": offset or {}}
 
+        total = response.get("Count", 0)
         while "LastEvaluatedKey" in response:
             scan_attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-            response = self._table.scan(**scan_attributes)
+            next_response = self._scan_page(table, scan_attributes, None, budget)
+            if next_response is None:
+                break
+            response = next_response
             total += response.get("Count", 0)
 
-        return total
+        return {"Count": total, "LastEvaluatedKey": response.get("LastEvaluatedKey")}
+
+    def _parallel_count_scan(self, filter_expression=None, segments=1, workers=None, offset=None, budget=None):
+        offsets = self._segment_offsets(offset, segments)
 
-    def _scan(self, filter_expression: str, limit=None, return_all=False, pe=None, offset=None):
+        def count_segment(segment):
+            return self._count_scan(filter_expression, segment=segment, total_segments=segments,
+                                    offset=offsets[segment], budget=budget)
+
+        pending = sorted(offsets)
+        responses = _map_parallel(count_segment, pending, workers or segments)
+
+        last_keys = {
+            segment: response["LastEvaluatedKey"]
+            for segment, response in zip(pending, responses)
+            if response["LastEvaluatedKey"] is not None
+        }
+        return {"Count": sum(response["Count"] for response in responses), "LastEvaluatedKey": last_keys or None}
+
+    def _scan(self, filter_expression: str, limit=None, return_all=False, pe=None, offset=None,
+              segment=None, total_segments=None, budget=None, deadline=None, take=None, key_attributes=None):
         scan_attributes = {}
+        table = self._table
 
         if filter_expression:
             scan_attributes["FilterExpression"] = filter_expression
@@ -287,16 +807,313 @@ class CrudMixin:
         if offset:
             scan_attributes["ExclusiveStartKey"] = offset
 
-        response = self._table.scan(**scan_attributes)
+        if total_segments:
+            scan_attributes["Segment"] = segment
+            scan_attributes["TotalSegments"] = total_segments
+            table = self._thread_table()
+
+        scan_page = self._scan_page if deadline is None else partial(deadline.fetch, self._scan_page)
+        page_limit = self._take_page_limit(scan_attributes, limit, take, 0) if take else limit
+        response = scan_page(table=table, scan_attributes=scan_attributes, limit=page_limit, budget=budget)
+        if response is None:
+            # The budget ran out before this segment started; {} resumes it from the beginning
+            return {"Items": [], "Count": 0, "LastEvaluatedKey": offset or {}}
+
         data = response["Items"]
-        if return_all:
-            while "LastEvaluatedKey" in response:
+        if return_all or take:
+            while "LastEvaluatedKey" in response and not (take and len(data) >= take):
+                if deadline is not None and not deadline.allows_page():
+                    break
                 scan_attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-                response = self._table.scan(**scan_attributes)
+                if take:
+                    page_limit = self._take_page_limit(scan_attributes, limit, take, len(data))
+                next_response = scan_page(table=table, scan_attributes=scan_attributes, limit=page_limit,
+                                          budget=budget)
+                if next_response is None:
+                    break
+                response = next_response
                 data.extend(response["Items"])
 
+        if take:
+            return self._take_items(data, response.get("LastEvaluatedKey"), take, key_attributes)
+
         return {
             "Items": data,
             "Count": response.get("Count", len(data)),
             "LastEvaluatedKey": response.get("LastEvaluatedKey")
-        }
\ No newline at end of file
+        }
+
+    def _parallel_scan(self, filter_expression=None, limit=None, return_all=False, pe=None, offset=None,
+                       segments=1, workers=None, budget=None, deadline=None, take=None, key_attributes=None):
+        offsets = self._segment_offsets(offset, segments)
+
+        def scan_segment(segment, start, quota):
+            return self._scan(filter_expression, limit, return_all, pe, start,
+                              segment=segment, total_segments=segments, budget=budget, deadline=deadline,
+                              take=quota, key_attributes=key_attributes)
+
+        pending = sorted(offsets)
+        # With take, every segment reads an equal share in parallel instead of the whole quota
+        quota = -(-take // len(pending)) if take and pending else take
+        responses = _map_parallel(lambda segment: scan_segment(segment, offsets[segment], quota), pending,
+                                  workers or segments)
+        if take:
+            responses = self._top_up_segments(scan_segment, pending, responses, take, budget, deadline)
+
+        data = []
+        count = 0
+        last_keys = {}
+        for segment, response in zip(pending, responses):
+            if take and len(data) >= take:
+                # Nothing of this segment is returned, so it resumes from where it started
+                last_keys[segment] = offsets[segment] or {}
+                continue
+            if take and len(data) + len(response["Items"]) > take:
+                response = self._take_items(response["Items"], response["LastEvaluatedKey"], take - len(data),
+                                            key_attributes)
+            data.extend(response["Items"])
+            count += response["Count"]
+            if response["LastEvaluatedKey"] is not None:
+                last_keys[segment] = response["LastEvaluatedKey"]
+
+        return {
+            "Items": data,
+            "Count": count,
+            "LastEvaluatedKey": last_keys or None
+        }
+
+    @staticmethod
+    def _top_up_segments(scan_segment, pending, responses, take, budget=None, deadline=None):
+        # Segments that ran out before their share leave room for the others: segments that still have
+        # items continue, in order, until take is reached
+        collected = sum(len(response["Items"]) for response in responses)
+        responses = list(responses)
+        for position, segment in enumerate(pending):
+            if collected >= take or (budget is not None and budget.exhausted) \
+                    or (deadline is not None and deadline.expired):
+                break
+            response = responses[position]
+            if not response["LastEvaluatedKey"]:
+                continue
+            more = scan_segment(segment, response["LastEvaluatedKey"], take - collected)
+            collected += len(more["Items"])
+            responses[position] = {
+                "Items": response["Items"] + more["Items"],
+                "Count": response["Count"] + more["Count"],
+                "LastEvaluatedKey": more["LastEvaluatedKey"],
+            }
+        return responses
+
+    def _probe(self, attributes: dict, use_query=True, limit=None, count_only=False, budget=None):
+        # Reads as little as possible until the first match: a single item when nothing is filtered,
+        # otherwise small pages that double in size until an item passes the filter
+        attributes = dict(attributes)
+        if count_only:
+            attributes["Select"] = "COUNT"
+            attributes.pop("ProjectionExpression", None)
+
+        page_size = (limit or self._PROBE_PAGE_SIZE) if "FilterExpression" in attributes else 1
+        while True:
+            attributes["Limit"] = page_size
+            if use_query:
+                response = self._table.query(**attributes)
+            else:
+                response = self._scan_page(self._table, attributes, page_size, budget)
+                if response is None:
+                    return None
+
+            if response.get("Count") or "LastEvaluatedKey" not in response:
+                return response
+            attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            page_size = min(page_size * 2, self._PROBE_MAX_PAGE_SIZE)
+
+    @staticmethod
+    def _take_page_limit(attributes: dict, limit, take, collected):
+        # Without a filter every evaluated item is returned, so the page never needs to be bigger
+        # than what is still missing. With a filter the page size stays as configured.
+        page_limit = limit
+        if "FilterExpression" not in attributes:
+            page_limit = min(limit or take, take - collected)
+        if page_limit:
+            attributes["Limit"] = page_limit
+        return page_limit
+
+    @staticmethod
+    def _take_items(items, last_key, take, key_attributes):
+        # A page that overshoots is cut at `take`; the continuation key then points at the last returned item
+        if len(items) > take:
+            items = items[:take]
+            last_key = {attr: items[-1][attr] for attr in key_attributes}
+        return {"Items": items, "Count": len(items), "LastEvaluatedKey": last_key}
+
+    @staticmethod
+    def _segment_offsets(offset, segments):
+        # offset maps segment -> ExclusiveStartKey; segments missing from it are already exhausted.
+        # Segment numbers may come back as strings once the offset went through JSON.
+        if not offset:
+            return {segment: None for segment in range(segments)}
+
+        offsets = {}
+        for segment, key in offset.items():
+            number = str(segment)
+            if not number.isdigit() or int(number) >= segments or not isinstance(key, (dict, type(None))):
+                raise InvalidArgumentException(
+                    "A parallel scan resumes from the {segment: LastEvaluatedKey} map returned by "
+                    "last_evaluated_key() for the same number of segments.",
+                    method="offset",
+                    expected=f"dict of segment (0 to {segments - 1}) -> LastEvaluatedKey",
+                    received=str(offset),
+                )
+            offsets[int(number)] = key
+        return offsets
+
+    @staticmethod
+    def _scan_page(table, scan_attributes: dict, limit=None, budget=None):
+        # Returns None when the scan budget does not allow another page
+        if budget is None:
+            return table.scan(**scan_attributes)
+
+        allowed, page_limit = budget.acquire(limit)
+        if not allowed:
+            return None
+        if page_limit:
+            scan_attributes["Limit"] = page_limit
+
+        response = table.scan(**scan_attributes)
+        budget.release(page_limit, response.get("ScannedCount", 0))
+        return response
+
+    def _analyze(self, operation: str, attributes: dict, return_all=False, segments=None, workers=None):
+        # Runs the request page by page and adds up what DynamoDB reports for each page
+        attributes = dict(attributes, ReturnConsumedCapacity="TOTAL")
+
+        def run(table, request):
+            stats = {"pages": 0, "count": 0, "scanned_count": 0, "consumed_capacity": 0.0, "has_more": False}
+            while True:
+                response = getattr(table, operation)(**request)
+                stats["pages"] += 1
+                stats["count"] += response.get("Count", 0)
+                stats["scanned_count"] += response.get("ScannedCount", 0)
+                stats["consumed_capacity"] += float(response.get("ConsumedCapacity", {}).get("CapacityUnits", 0))
+                if "LastEvaluatedKey" not in response:
+                    return stats
+                if not return_all:
+                    stats["has_more"] = True
+                    return stats
+                request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        started = time.perf_counter()
+        if segments:
+            def run_segment(segment):
+                return run(self._thread_table(), dict(attributes, Segment=segment, TotalSegments=segments))
+
+            results = _map_parallel(run_segment, range(segments), workers or segments)
+        else:
+            results = [run(self._table, attributes)]
+
+        return {
+            "pages": sum(result["pages"] for result in results),
+            "count": sum(result["count"] for result in results),
+            "scanned_count": sum(result["scanned_count"] for result in results),
+            "consumed_capacity": sum(result["consumed_capacity"] for result in results),
+            "has_more": any(result["has_more"] for result in results),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _parallel_scan_pages(self, scan_attributes: dict, segments=1, workers=None, offset=None, budget=None,
+                             depth=None):
+        offsets = self._segment_offsets(offset, segments)
+        pages = queue.Queue(maxsize=depth or (workers or segments) * 2)
+        stop = threading.Event()
+
+        def publish(message):
+            self._publish(pages, stop, message)
+
+        def scan_segment(segment):
+            attributes = dict(scan_attributes, Segment=segment, TotalSegments=segments)
+            if offsets[segment]:
+                attributes["ExclusiveStartKey"] = offsets[segment]
+            try:
+                table = self._thread_table()
+                while not stop.is_set():
+                    response = self._scan_page(table, attributes, scan_attributes.get("Limit"), budget)
+                    if response is None:
+                        break
+                    publish(("page", segment, response))
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    attributes["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            except Exception as e:
+                publish(("error", segment, e))
+            finally:
+                publish(("done", segment, None))
+
+        pending = iter(sorted(offsets))
+        lock = threading.Lock()
+
+        def run():
+            # `workers` runners share the segments. They block while the consumer is behind, so they run on
+            # producer threads rather than on the shared pool, where a parallel call made while consuming
+            # the stream would wait for them forever
+            while not stop.is_set():
+                with lock:
+                    segment = next(pending, None)
+                if segment is None:
+                    return
+                scan_segment(segment)
+
+        runners = min(workers or segments, len(offsets), int(DynoConfig.get("parallel_max_workers")))
+        try:
+            for _ in range(runners):
+                _producer_threads.submit(run)
+
+            remaining = len(offsets)
+            while remaining:
+                kind, segment, payload = pages.get()
+                if kind == "done":
+                    remaining -= 1
+                elif kind == "error":
+                    raise payload
+                else:
+                    yield segment, payload
+        finally:
+            stop.set()
+
+    def _prefetch_pages(self, pages, depth: int):
+        # pages(table) runs on a producer thread and stays at most `depth` pages ahead of the consumer
+        buffer = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for response in pages(self._thread_table()):
+                    # An abandoned stream must not cost another page
+                    if stop.is_set() or not self._publish(buffer, stop, ("page", response)):
+                        return
+            except Exception as e:
+                self._publish(buffer, stop, ("error", e))
+            finally:
+                self._publish(buffer, stop, ("done", None))
+
+        _producer_threads.submit(produce)
+        try:
+            while True:
+                kind, payload = buffer.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise payload
+                yield payload
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _publish(buffer: queue.Queue, stop: threading.Event, message) -> bool:
+        # Blocks while the consumer is behind, but gives up (returning False) once it stops listening
+        while not stop.is_set():
+            try:
+                buffer.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -1,19 +1,57 @@
 from __future__ import annotations
 
+import copy
+import math
 import re
+import threading
 import uuid
 import warnings
-from decimal import Decimal
-from typing import List, Dict, Literal, Any, Optional
+from contextvars import ContextVar
+from typing import List, Dict, Literal, Any, Optional, Callable
 
-from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.conditions import Attr, ConditionExpressionBuilder
+from botocore.exceptions import ClientError
 
+from dynolayer.cache import ItemCache
+from dynolayer.checkpoint import CheckpointStore, serialize_position, deserialize_position
 from dynolayer.config import DynoConfig
-from dynolayer.crud_mixin import CrudMixin
+from dynolayer.crud_mixin import CrudMixin, _ScanBudget, _Deadline, _request_key
+from dynolayer.engine import floats_to_decimal, serialize_item
 from dynolayer.exceptions import (
     DynoLayerException, QueryException, ValidationException, RecordNotFoundException,
-    InvalidArgumentException, AutoIdException, )
-from dynolayer.utils import extract_params, parse_expression, transform_params_in_query, transform_params_in_filter, Collection
+    InvalidArgumentException, AutoIdException, BatchOperationException, )
+from dynolayer.prepared import PreparedQuery
+from dynolayer.session import Session, current_session
+from dynolayer.utils import (
+    extract_params, parse_expression, transform_params_in_query, transform_params_in_filter, Collection,
+    expression_cache_stats, _KEY_OPERATORS, )
+
+
+# Class-level results (fail(), last_batch_stats()) live in contextvars, so every thread and asyncio task
+# only sees the outcome of its own calls. Each holds a {model class: value} dict replaced on write.
+_class_last_error: ContextVar[Optional[Dict]] = ContextVar("dynolayer_class_last_error", default=None)
+_class_last_batch_stats: ContextVar[Optional[Dict]] = ContextVar("dynolayer_class_last_batch_stats", default=None)
+_CONTEXT_STATE = (_class_last_error, _class_last_batch_stats)
+
+
+def _context_value(variable: ContextVar, cls) -> Any:
+    values = variable.get()
+    return values.get(cls) if values else None
+
+
+def _set_context_value(variable: ContextVar, cls, value) -> None:
+    values = dict(variable.get() or {})
+    if value is None:
+        values.pop(cls, None)
+    else:
+        values[cls] = value
+    variable.set(values)
+
+
+def _snapshot(data: Dict) -> Dict:
+    # Scalars cannot change in place, so only lists, maps and sets need a copy of their own
+    return {key: copy.deepcopy(value) if isinstance(value, (dict, list, set)) else value
+            for key, value in data.items()}
 
 
 class _HybridWhere:
@@ -31,7 +69,7 @@ class _HybridFail:
     def __get__(self, obj, cls):
         if obj is None:
             def class_fail():
-                return cls._class_last_error
+                return cls._get_class_last_error()
             return class_fail
 
         def instance_fail():
@@ -41,13 +79,24 @@ class _HybridFail:
 
 class DynoLayer(CrudMixin):
     _VALID_AUTO_ID_STRATEGIES = ("uuid4", "uuid1", "uuid7", "numeric")
+    _VALID_SCAN_POLICIES = ("allow", "warn", "raise")
     raise_on_error = False
-    _class_last_error = None
+    auto_index = None
+    scan_policy = None
+    scan_max_pages = None
+    scan_max_items = None
+    item_cache = None
+    item_cache_ttl = None
+    item_cache_max_entries = None
+    item_cache_max_bytes = None
+    coalesce_reads = None
+    _prototype = None
+    _item_cache = None
 
     def __init__(self, entity="", required_fields=None, partition_key: str = "id", timestamps=True,
                  fillable=None, timestamp_format: Literal["numeric", "iso"] = "iso",
                  auto_id: Literal["uuid4", "uuid1", "uuid7", "numeric"] = None,
-                 auto_id_length=None, auto_id_table=None, sort_key: str = None):
+                 auto_id_length=None, auto_id_table=None, sort_key: str = None, auto_id_block_size=None):
         if auto_id is not None:
             if auto_id not in self._VALID_AUTO_ID_STRATEGIES:
                 raise InvalidArgumentException(
@@ -69,6 +118,20 @@ class DynoLayer(CrudMixin):
                         expected="integer between 16 and 32",
                         received=str(auto_id_length)
                     )
+            if auto_id_block_size is not None:
+                if auto_id != "numeric":
+                    raise InvalidArgumentException(
+                        "auto_id_block_size is only supported with 'numeric' strategy.",
+                        method="__init__"
+                    )
+                if not isinstance(auto_id_block_size, int) or isinstance(auto_id_block_size, bool) \
+                        or auto_id_block_size < 1:
+                    raise InvalidArgumentException(
+                        "auto_id_block_size must be a positive integer.",
+                        method="__init__",
+                        expected="positive integer",
+                        received=str(auto_id_block_size)
+                    )
 
         super().__init__(entity, partition_key=partition_key, sort_key=sort_key)
 
@@ -85,19 +148,30 @@ class DynoLayer(CrudMixin):
         self._auto_id = auto_id
         self._auto_id_length = auto_id_length
         self._auto_id_table = auto_id_table
+        self._auto_id_block_size = auto_id_block_size
         self._all_index_keys = {key for idx in self._indexes.values() for key in idx["keys"]}
 
         self._index = None
         self._limit = None
+        self._take = None
         self._project_expression = None
         self._filter_expression = list()
         self._key_condition_expression = list()
         self._force_scan = False
         self._offset = None
         self._scan_all = False
+        self._segments = None
+        self._workers = None
+        self._raw = False
 
         self._data = {}
 
+        # Dirty tracking: only loaded instances send partial updates
+        self._persisted = False
+        self._dirty = set()
+        self._removed = set()
+        self._snapshot = None
+
         # Error tracking for silent mode
         self._last_error = None
 
@@ -117,6 +191,17 @@ class DynoLayer(CrudMixin):
     def get_count(self) -> int:
         return self._get_count
 
+    def is_dirty(self) -> bool:
+        changed, removed = self.__changes()
+        return bool(changed or removed)
+
+    def get_dirty(self) -> Dict:
+        return {key: self._data[key] for key in self.__changes()[0] if key in self._data}
+
+    def mark_dirty(self, *attributes: str) -> DynoLayer:
+        self._dirty.update(attributes)
+        return self
+
     def __getattr__(self, item):
         return self._data.get(item)
 
@@ -124,19 +209,49 @@ class DynoLayer(CrudMixin):
         if key.startswith("_"):
             super().__setattr__(key, value)
         else:
-            self._data[key] = value
+            self[key] = value
 
     def __getitem__(self, key):
         return self._data[key]
 
     def __setitem__(self, key, value):
         self._data[key] = value
+        self._dirty.add(key)
+        self._removed.discard(key)
 
     def __contains__(self, key):
         return key in self._data
 
     def __delitem__(self, key):
         del self._data[key]
+        self._dirty.discard(key)
+        self._removed.add(key)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._prototype = None
+        cls._item_cache = None
+
+    @classmethod
+    def _hydrate(cls, row: Dict) -> DynoLayer:
+        # Model configuration is resolved once per class by running __init__ a single time;
+        # result rows clone that state instead of re-running __init__ for every item
+        prototype = cls._prototype
+        if prototype is None:
+            prototype = cls._prototype = cls()
+
+        state = prototype.__dict__.copy()
+        state["_data"] = row
+        state["_persisted"] = True
+        state["_dirty"] = set()
+        state["_removed"] = set()
+        state["_snapshot"] = _snapshot(row)
+        state["_filter_expression"] = list()
+        state["_key_condition_expression"] = list()
+
+        instance = cls.__new__(cls)
+        instance.__dict__ = state
+        return instance
 
     @classmethod
     def configure(cls, **kwargs) -> None:
@@ -151,30 +266,51 @@ class DynoLayer(CrudMixin):
 
     @classmethod
     def get_item(cls, key: dict, attributes: List[str] = None) -> Optional[DynoLayer]:
-        cls._class_last_error = None
+        cls._set_class_last_error(None)
         try:
             instance = cls()
             instance.__validate_key_dict(key)
 
+            session = current_session()
+            if session is not None:
+                loaded = session.get(instance._entity, key, cls)
+                if loaded is not None:
+                    return loaded
+
+            cache = instance.__item_cache()
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    if attributes:
+                        return cls._hydrate({attr: cached[attr] for attr in attributes if attr in cached})
+                    return instance.__remember(cls._hydrate(cached), session)
+
             kwargs = {"TableName": instance._entity, "Key": key}
             if attributes:
                 attr_names = {f"#proj_{i}": attr for i, attr in enumerate(attributes)}
                 kwargs["ProjectionExpression"] = ", ".join(attr_names.keys())
                 kwargs["ExpressionAttributeNames"] = attr_names
 
-            response = instance._table.get_item(**kwargs)
+            if instance._coalescing_enabled():
+                flight_key = ("get_item", instance._entity, instance._flight_scope(), _request_key(key),
+                              tuple(attributes or ()))
+                response = cls._single_flight.do(flight_key, lambda: instance._table.get_item(**kwargs))
+            else:
+                response = instance._table.get_item(**kwargs)
 
             if not response.get("Item"):
                 return None
 
-            for key, value in response["Item"].items():
-                instance._data[key] = value
-
-            return instance
+            # Projected reads are not cached; only full items can serve every later read
+            if attributes:
+                return cls._hydrate(response["Item"])
+            if cache is not None:
+                cache.set(response["Item"])
+            return instance.__remember(cls._hydrate(response["Item"]), session)
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return None
 
     def find(self, terms: str = None, /, **values) -> DynoLayer:
@@ -188,25 +324,52 @@ class DynoLayer(CrudMixin):
 
         return self
 
+    @staticmethod
+    def expression_cache_stats() -> Dict:
+        return expression_cache_stats()
+
+    @staticmethod
+    def session() -> Session:
+        return Session()
+
+    @staticmethod
+    def coalesce_stats() -> Dict:
+        return CrudMixin._single_flight.stats()
+
+    @classmethod
+    def cache_stats(cls) -> Optional[Dict]:
+        return cls._item_cache.stats() if cls._item_cache is not None else None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        # Dropping the cache also re-reads the item_cache_* settings on the next read
+        cls._item_cache = None
+
     where = _HybridWhere()
     fail = _HybridFail()
 
+    @classmethod
+    def prepare(cls, terms: str, index: str = None, attributes: List[str] = None) -> PreparedQuery:
+        return PreparedQuery(cls, terms, index=index, attributes=attributes)
+
     @classmethod
     def delete(cls, key: dict) -> bool:
-        cls._class_last_error = None
+        cls._set_class_last_error(None)
         try:
             instance = cls()
             instance.__validate_key_dict(key)
-            return instance._delete(key)
+            deleted = instance._delete(key)
+            instance.__discard_cached([key])
+            return deleted
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return False
 
     @classmethod
     def create(cls, data: Dict, unique=False) -> Optional[DynoLayer]:
-        cls._class_last_error = None
+        cls._set_class_last_error(None)
         try:
             instance = cls()
 
@@ -223,17 +386,20 @@ class DynoLayer(CrudMixin):
 
             condition = Attr(instance._hash_key).not_exists() if unique else None
             instance._put(instance.__safe(), condition=condition)
+            instance.__discard_cached([instance._data])
+            instance.__mark_clean()
 
             return instance
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return None
 
     @classmethod
-    def batch_create(cls, items: List[Dict]) -> List[DynoLayer]:
-        cls._class_last_error = None
+    def batch_create(cls, items: List[Dict], pipeline=False, workers: int = None) -> List[DynoLayer]:
+        cls._set_class_last_error(None)
+        cls._set_class_last_batch_stats(None)
         try:
             ref_instance = cls()
             instances = []
@@ -275,49 +441,141 @@ class DynoLayer(CrudMixin):
                     instance._data["updated_at"] = instance._get_current_timestamp(instance._timestamp_format)
 
             safe_items = [inst.__safe() for inst in instances]
-            cls()._batch_put(safe_items)
+            if pipeline:
+                stats = cls()._batch_write([{"PutRequest": {"Item": item}} for item in safe_items], workers=workers)
+                cls._set_class_last_batch_stats(stats)
+                ref_instance.__discard_cached(safe_items)
+                if stats["failed"]:
+                    # Only the items DynamoDB accepted match the table; the rest stay dirty
+                    failed = {
+                        tuple(request["PutRequest"]["Item"][key] for key in ref_instance._partition_keys)
+                        for request in stats["failed_items"]
+                    }
+                    for instance in instances:
+                        if tuple(instance._data[key] for key in instance._partition_keys) not in failed:
+                            instance.__mark_clean()
+                    raise BatchOperationException(
+                        f"batch_write_item left {stats['failed']} unprocessed items after retries.",
+                        operation="batch_write",
+                        unprocessed=stats["failed"],
+                        retries=stats["retried"],
+                    )
+            else:
+                cls()._batch_put(safe_items)
+                ref_instance.__discard_cached(safe_items)
+
+            for instance in instances:
+                instance.__mark_clean()
 
             return instances
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return []
 
     @classmethod
-    def batch_find(cls, keys: List[Dict]) -> Collection:
-        cls._class_last_error = None
+    def last_batch_stats(cls) -> Optional[Dict]:
+        return cls._get_class_last_batch_stats()
+
+    @classmethod
+    def _get_class_last_error(cls) -> Optional[DynoLayerException]:
+        return _context_value(_class_last_error, cls)
+
+    @classmethod
+    def _set_class_last_error(cls, error: Optional[DynoLayerException]) -> None:
+        _set_context_value(_class_last_error, cls, error)
+
+    @classmethod
+    def _get_class_last_batch_stats(cls) -> Optional[Dict]:
+        return _context_value(_class_last_batch_stats, cls)
+
+    @classmethod
+    def _set_class_last_batch_stats(cls, stats: Optional[Dict]) -> None:
+        _set_context_value(_class_last_batch_stats, cls, stats)
+
+    @classmethod
+    def batch_find(cls, keys: List[Dict], workers: int = None, as_dicts=False) -> Collection | List[Dict]:
+        cls._set_class_last_error(None)
+        cls._set_class_last_batch_stats(None)
         try:
             instance = cls()
             for key in keys:
                 instance.__validate_key_dict(key)
-            raw_items = instance._batch_get(keys)
 
-            items = []
-            for row in raw_items:
-                model_instance = cls()
-                model_instance._data = row.copy()
-                items.append(model_instance)
-
-            return Collection(items)
+            loaded = []
+            pending = keys
+            session = current_session()
+            if session is not None:
+                pending = []
+                for key in keys:
+                    found = session.get(instance._entity, key, cls)
+                    if found is None:
+                        pending.append(key)
+                    else:
+                        loaded.append(found)
+
+            cached_items = []
+            missing = pending
+            cache = instance.__item_cache()
+            if cache is not None:
+                # Only the keys that miss the cache are sent to BatchGetItem
+                missing = []
+                for key in pending:
+                    item = cache.get(key)
+                    if item is None:
+                        missing.append(key)
+                    else:
+                        cached_items.append(item)
+
+            raw_items = []
+            if missing:
+                raw_items = instance._batch_get(missing, workers=workers)
+                cls._set_class_last_batch_stats(instance._batch_stats)
+                if cache is not None:
+                    for item in raw_items:
+                        cache.set(item)
+            raw_items = cached_items + raw_items
+
+            if session is not None:
+                models = loaded + [instance.__remember(cls._hydrate(row), session) for row in raw_items]
+                return [model.data() for model in models] if as_dicts else Collection(models)
+            if as_dicts:
+                return raw_items
+            return Collection([cls._hydrate(row) for row in raw_items])
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
-            return Collection([])
+            cls._set_class_last_error(e)
+            return [] if as_dicts else Collection([])
 
     @classmethod
-    def batch_destroy(cls, keys: List[Dict]) -> bool:
-        cls._class_last_error = None
+    def batch_destroy(cls, keys: List[Dict], pipeline=False, workers: int = None) -> bool:
+        cls._set_class_last_error(None)
+        cls._set_class_last_batch_stats(None)
         try:
             instance = cls()
             for key in keys:
                 instance.__validate_key_dict(key)
-            return instance._batch_delete(keys)
+            if pipeline:
+                stats = instance._batch_write([{"DeleteRequest": {"Key": key}} for key in keys], workers=workers)
+                cls._set_class_last_batch_stats(stats)
+                instance.__discard_cached(keys)
+                if stats["failed"]:
+                    raise BatchOperationException(
+                        f"batch_write_item left {stats['failed']} unprocessed items after retries.",
+                        operation="batch_write",
+                        unprocessed=stats["failed"],
+                        retries=stats["retried"],
+                    )
+                return True
+            deleted = instance._batch_delete(keys)
+            instance.__discard_cached(keys)
+            return deleted
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return False
 
     @classmethod
@@ -352,13 +610,14 @@ class DynoLayer(CrudMixin):
         update_parts = []
 
         for i, (k, value) in enumerate(data.items()):
-            if isinstance(value, float):
-                value = Decimal(str(value))
             safe = re.sub(r"[^a-zA-Z0-9_]", "_", k) + f"_{i}"
             expression_values[f":{safe}"] = value
             expression_names[f"#{safe}"] = k
             update_parts.append(f"#{safe} = :{safe}")
 
+        if not instance._client_engine():
+            expression_values = floats_to_decimal(expression_values)
+
         return {"Update": {
             "TableName": instance._entity,
             "Key": key,
@@ -369,65 +628,64 @@ class DynoLayer(CrudMixin):
 
     @staticmethod
     def transact_write(operations: List[Dict]) -> bool:
-        from boto3.dynamodb.types import TypeSerializer
         from dynolayer.crud_mixin import CrudMixin
 
-        serializer = TypeSerializer()
         serialized_ops = []
 
         for op in operations:
             serialized_op = {}
             for op_type, params in op.items():
                 serialized_params = dict(params)
-                if "Item" in serialized_params:
-                    serialized_params["Item"] = {
-                        k: serializer.serialize(v) for k, v in serialized_params["Item"].items()
-                    }
-                if "Key" in serialized_params:
-                    serialized_params["Key"] = {
-                        k: serializer.serialize(v) for k, v in serialized_params["Key"].items()
-                    }
-                if "ExpressionAttributeValues" in serialized_params:
-                    serialized_params["ExpressionAttributeValues"] = {
-                        k: serializer.serialize(v) for k, v in serialized_params["ExpressionAttributeValues"].items()
-                    }
+                for name in ("Item", "Key", "ExpressionAttributeValues"):
+                    if name in serialized_params:
+                        serialized_params[name] = serialize_item(serialized_params[name])
                 serialized_op[op_type] = serialized_params
             serialized_ops.append(serialized_op)
 
         client = CrudMixin._get_client()
         client.transact_write_items(TransactItems=serialized_ops)
+
+        for op in operations:
+            for op_type, params in op.items():
+                if op_type in ("Put", "Update", "Delete"):
+                    key = params.get("Key") or params.get("Item")
+                    ItemCache.discard_from_table(params["TableName"], key)
+                    session = current_session()
+                    if session is not None:
+                        session.discard(params["TableName"], key)
         return True
 
     @staticmethod
     def transact_get(requests: List[tuple]) -> List[Optional[DynoLayer]]:
-        from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
         from dynolayer.crud_mixin import CrudMixin
 
-        serializer = TypeSerializer()
-        deserializer = TypeDeserializer()
+        session = current_session()
+        items = [None] * len(requests)
         order = []
         transact_items = []
 
-        for model_cls, key in requests:
+        for position, (model_cls, key) in enumerate(requests):
             instance = model_cls()
             instance._DynoLayer__validate_key_dict(key)
-            serialized_key = {k: serializer.serialize(v) for k, v in key.items()}
-            transact_items.append({"Get": {"TableName": instance._entity, "Key": serialized_key}})
-            order.append(model_cls)
+            if session is not None:
+                # Items already loaded in the session are not read again
+                items[position] = session.get(instance._entity, key, model_cls)
+                if items[position] is not None:
+                    continue
+            transact_items.append({"Get": {"TableName": instance._entity, "Key": serialize_item(key)}})
+            order.append((position, instance))
+
+        if not transact_items:
+            return items
 
         client = CrudMixin._get_client()
         response = client.transact_get_items(TransactItems=transact_items)
 
-        items = []
-        for i, resp in enumerate(response.get("Responses", [])):
+        for (position, instance), resp in zip(order, response.get("Responses", [])):
             raw = resp.get("Item")
             if raw:
-                deserialized = {k: deserializer.deserialize(v) for k, v in raw.items()}
-                model_instance = order[i]()
-                model_instance._data = deserialized
-                items.append(model_instance)
-            else:
-                items.append(None)
+                deserialized = instance._codec().deserialize_item(raw)
+                items[position] = instance._DynoLayer__remember(type(instance)._hydrate(deserialized), session)
 
         return items
 
@@ -435,16 +693,37 @@ class DynoLayer(CrudMixin):
         self._last_error = None
         try:
             self.__validate_required_fields()
+
+            # Loaded instances only send what changed; a changed key means writing a new item
+            changed, removed = self.__changes()
+            partial = self._persisted and not changed.intersection(self._partition_keys)
+            if partial and not (changed or removed) and condition is None:
+                return True
+
             self.__apply_auto_id()
             self.__validate_required_fields(self._partition_keys)
             keys = {key: self.data()[key] for key in self._partition_keys}
 
             if self._timestamps:
-                self._data["created_at"] = self._data["created_at"] if self._data.get(
-                    "created_at") else self._get_current_timestamp(self._timestamp_format)
+                if not self._data.get("created_at"):
+                    self._data["created_at"] = self._get_current_timestamp(self._timestamp_format)
+                    changed.add("created_at")
                 self._data["updated_at"] = self._get_current_timestamp(self._timestamp_format)
+                changed.add("updated_at")
+
+            if partial:
+                data = self.__safe(only=[key for key in changed if key in self._data and key not in keys])
+                removed = [key for key in removed if key not in self._data and key not in keys]
+                if data or removed:
+                    self._update(data, keys, condition=condition, remove=removed)
+                elif condition is not None:
+                    self._condition_check(keys, condition)
+            else:
+                self._update(self.__safe(self._partition_keys), keys, condition=condition)
+            self.__discard_cached([keys], keep=self)
 
-            return self._update(self.__safe(self._partition_keys), keys, condition=condition)
+            self.__mark_clean()
+            return True
         except DynoLayerException as e:
             if self.raise_on_error:
                 raise
@@ -455,7 +734,9 @@ class DynoLayer(CrudMixin):
         self._last_error = None
         try:
             keys = {key: self.data()[key] for key in self._partition_keys}
-            return self._delete(keys)
+            deleted = self._delete(keys)
+            self.__discard_cached([keys])
+            return deleted
         except DynoLayerException as e:
             if self.raise_on_error:
                 raise
@@ -498,6 +779,17 @@ class DynoLayer(CrudMixin):
         self._limit = limit
         return self
 
+    def take(self, count: int) -> DynoLayer:
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            raise InvalidArgumentException(
+                "take must be a positive integer.",
+                method="take",
+                expected="positive integer",
+                received=str(count)
+            )
+        self._take = count
+        return self
+
     def attributes_to_get(self, project_expression: str | List[str]) -> DynoLayer:
         if isinstance(project_expression, list):
             self._project_expression = ", ".join(project_expression)
@@ -521,9 +813,36 @@ class DynoLayer(CrudMixin):
         self._offset = last_evaluated_key
         return self
 
-    def get(self, all=False, paginate=False) -> Collection | DynoLayer | None:
+    def raw(self) -> DynoLayer:
+        self._raw = True
+        return self
+
+    def parallel(self, segments: int, workers: int = None) -> DynoLayer:
+        if not isinstance(segments, int) or isinstance(segments, bool) or segments < 1 or segments > 1000000:
+            raise InvalidArgumentException(
+                "segments must be an integer between 1 and 1000000.",
+                method="parallel",
+                expected="integer between 1 and 1000000",
+                received=str(segments)
+            )
+        if workers is not None and (not isinstance(workers, int) or isinstance(workers, bool) or workers < 1):
+            raise InvalidArgumentException(
+                "workers must be a positive integer.",
+                method="parallel",
+                expected="positive integer",
+                received=str(workers)
+            )
+
+        self._segments = segments
+        self._workers = workers
+        return self
+
+    def get(self, all=False, paginate=False, as_dicts=False,
+            deadline: float | Callable[[], float] = None) -> Collection | DynoLayer | List[Dict] | Dict | None:
         self._last_error = None
+        as_dicts = as_dicts or self._raw
         try:
+            page_deadline = self.__build_deadline(deadline) if paginate else None
             if not self._scan_all and not self._filter_expression and not self._key_condition_expression:
                 raise QueryException(
                     "You must specify a filter condition before executing this operation.",
@@ -534,6 +853,7 @@ class DynoLayer(CrudMixin):
                     ]
                 )
 
+            self.__plan_index()
             self.__resolve_key_conditions()
             self.__validate_index()
 
@@ -541,20 +861,32 @@ class DynoLayer(CrudMixin):
             if self._filter_expression:
                 filter_expression = transform_params_in_filter(self._filter_expression)
 
-            items = []
-            if self._key_condition_expression and not self._force_scan and not self._scan_all:
+            use_query = bool(self._key_condition_expression) and not self._force_scan and not self._scan_all
+            project_expression = self._project_expression
+            key_attributes = None
+            if self._take:
+                key_attributes = self.__key_attributes(use_query)
+                project_expression = self.__project_with_keys(key_attributes)
+
+            if use_query:
                 key_condition = transform_params_in_query(self._key_condition_expression)
-                response = self._query(key_condition, filter_expression, self._index, self._limit, paginate, self._project_expression, self._offset)
-                for row in response["Items"]:
-                    model_instance = self.__class__()
-                    model_instance._data = row.copy()
-                    items.append(model_instance)
+                response = self._query(key_condition, filter_expression, self._index, self._limit, paginate,
+                                       project_expression, self._offset, deadline=page_deadline,
+                                       take=self._take, key_attributes=key_attributes)
+            elif self._segments:
+                response = self._parallel_scan(filter_expression, self._limit, paginate, project_expression,
+                                               self._offset, self._segments, self._workers,
+                                               budget=self._scan_budget("get"), deadline=page_deadline,
+                                               take=self._take, key_attributes=key_attributes)
             else:
-                response = self._scan(filter_expression, self._limit, paginate, self._project_expression, self._offset)
-                for row in response["Items"]:
-                    model_instance = self.__class__()
-                    model_instance._data = row.copy()
-                    items.append(model_instance)
+                response = self._scan(filter_expression, self._limit, paginate, project_expression, self._offset,
+                                      budget=self._scan_budget("get"), deadline=page_deadline,
+                                      take=self._take, key_attributes=key_attributes)
+
+            if as_dicts:
+                items = response["Items"]
+            else:
+                items = [self._hydrate(row) for row in response["Items"]]
 
             # Store pagination metadata BEFORE reset
             last_key = response.get("LastEvaluatedKey")
@@ -567,20 +899,125 @@ class DynoLayer(CrudMixin):
             self._get_count = count
 
             if not all:
-                return Collection(items).first()
+                return items[0] if items else None
 
-            return Collection(items)
+            return items if as_dicts else Collection(items, last_evaluated_key=last_key)
         except DynoLayerException as e:
             if self.raise_on_error:
                 raise
             self._last_error = e
             self.__reset_query_builder()
-            return Collection([])
+            return [] if as_dicts else Collection([])
+
+    def fetch(self, all=False, paginate=False, as_dicts=False,
+              deadline: float | Callable[[], float] = None) -> Collection | DynoLayer | List[Dict] | Dict | None:
+        return self.get(all, paginate, as_dicts, deadline)
+
+    def stream(self, as_dicts=False, prefetch: int = None, checkpoint: CheckpointStore = None,
+               checkpoint_every: int = 1):
+        self.__validate_stream_options(prefetch, checkpoint_every, "stream")
+        if checkpoint is not None:
+            return self.__stream_items(self.__stream_pages(None, as_dicts, prefetch, checkpoint, checkpoint_every))
+        return self.__stream(as_dicts, prefetch)
+
+    def stream_pages(self, chunk_size: int = None, as_dicts=False, prefetch: int = None,
+                     checkpoint: CheckpointStore = None, checkpoint_every: int = 1):
+        if chunk_size is not None and (not isinstance(chunk_size, int) or isinstance(chunk_size, bool)
+                                       or chunk_size < 1):
+            raise InvalidArgumentException(
+                "chunk_size must be a positive integer.",
+                method="stream_pages",
+                expected="positive integer",
+                received=str(chunk_size)
+            )
+        self.__validate_stream_options(prefetch, checkpoint_every, "stream_pages")
+        return self.__stream_pages(chunk_size, as_dicts, prefetch, checkpoint, checkpoint_every)
+
+    @staticmethod
+    def __stream_items(pages):
+        for page in pages:
+            yield from page
 
-    def fetch(self, all=False, paginate=False) -> Collection | DynoLayer | None:
-        return self.get(all, paginate)
+    def __stream(self, as_dicts, prefetch):
+        hydrate = None if as_dicts or self._raw else self._hydrate
 
-    def stream(self):
+        plan = self.__prepare_stream()
+        for _, response in self.__stream_responses(plan, prefetch):
+            if hydrate is None:
+                yield from response["Items"]
+            else:
+                for row in response["Items"]:
+                    yield hydrate(row)
+
+    def __stream_pages(self, chunk_size, as_dicts, prefetch, checkpoint=None, checkpoint_every=1):
+        hydrate = None if as_dicts or self._raw else self._hydrate
+
+        plan = self.__prepare_stream(with_keys=chunk_size is not None)
+        parallel = bool(plan["segments"]) and not plan["use_query"]
+        segments = plan["segments"] if parallel else None
+        if checkpoint is not None and not plan["offset"]:
+            plan["offset"] = self.__load_checkpoint(checkpoint, segments)
+
+        # Resume position per segment (a single None entry outside parallel scans)
+        positions = self._segment_offsets(plan["offset"], segments) if parallel else {None: plan["offset"]}
+
+        def advance(segment, key):
+            if key:
+                positions[segment] = key
+            else:
+                positions.pop(segment, None)
+
+        def current_position():
+            if parallel:
+                return {segment: key or {} for segment, key in positions.items()} or None
+            return positions.get(None)
+
+        consumed = 0
+
+        def emit(rows):
+            # The checkpoint is only saved once the consumer comes back for the next chunk
+            nonlocal consumed
+            items = rows if hydrate is None else [hydrate(row) for row in rows]
+            position = current_position()
+            yield Collection(items, last_evaluated_key=position)
+            consumed += 1
+            if checkpoint is not None and position is not None and consumed % checkpoint_every == 0:
+                checkpoint.save(serialize_position(position, segments))
+
+        buffer = []
+        for segment, response in self.__stream_responses(plan, prefetch):
+            rows = response["Items"]
+            page_key = response.get("LastEvaluatedKey")
+            if chunk_size is None:
+                advance(segment, page_key)
+                yield from emit(rows)
+                continue
+
+            if not rows:
+                advance(segment, page_key)
+            for index, row in enumerate(rows, start=1):
+                buffer.append(row)
+                if index == len(rows):
+                    # The page key also skips items the filter dropped after the last row
+                    advance(segment, page_key)
+                else:
+                    positions[segment] = {attr: row[attr] for attr in plan["key_attributes"]}
+                if len(buffer) == chunk_size:
+                    yield from emit(buffer)
+                    buffer = []
+
+        if buffer:
+            yield from emit(buffer)
+
+        if checkpoint is not None:
+            if positions:
+                # Stopped early by the scan budget: keep the position to resume from
+                checkpoint.save(serialize_position(current_position(), segments))
+            else:
+                checkpoint.clear()
+
+    def __prepare_stream(self, with_keys=False) -> Dict:
+        self.__plan_index()
         self.__resolve_key_conditions()
         self.__validate_index()
 
@@ -588,37 +1025,162 @@ class DynoLayer(CrudMixin):
         if self._filter_expression:
             filter_expression = transform_params_in_filter(self._filter_expression)
 
-        use_query = self._key_condition_expression and not self._force_scan and not self._scan_all
+        use_query = bool(self._key_condition_expression) and not self._force_scan and not self._scan_all
+        budget = None if use_query else self._scan_budget("stream")
 
+        key_attributes = self.__key_attributes(use_query)
+
+        kwargs = {}
         if use_query:
-            key_condition = transform_params_in_query(self._key_condition_expression)
-            kwargs = {"KeyConditionExpression": key_condition}
-            if filter_expression:
-                kwargs["FilterExpression"] = filter_expression
+            kwargs["KeyConditionExpression"] = transform_params_in_query(self._key_condition_expression)
             if self._index:
                 kwargs["IndexName"] = self._index
-            if self._project_expression:
-                kwargs["ProjectionExpression"] = self._project_expression
-            op = self._table.query
-        else:
-            kwargs = {}
-            if filter_expression:
-                kwargs["FilterExpression"] = filter_expression
-            if self._project_expression:
-                kwargs["ProjectionExpression"] = self._project_expression
-            op = self._table.scan
-
+        if filter_expression:
+            kwargs["FilterExpression"] = filter_expression
+        if self._project_expression:
+            # Chunk checkpoints are built from the key of the last item in the chunk
+            kwargs["ProjectionExpression"] = (
+                self.__project_with_keys(key_attributes) if with_keys else self._project_expression
+            )
+        if self._limit:
+            # In a stream the limit only sets the page size; every page is still read
+            kwargs["Limit"] = self._limit
+
+        plan = {
+            "kwargs": kwargs,
+            "use_query": use_query,
+            "budget": budget,
+            "key_attributes": key_attributes,
+            "segments": self._segments,
+            "workers": self._workers,
+            "offset": self._offset,
+            "limit": self._limit,
+        }
         self.__reset_query_builder()
+        return plan
+
+    def __probe_request(self, operation: str) -> tuple:
+        if not self._scan_all and not self._filter_expression and not self._key_condition_expression:
+            raise QueryException(
+                "You must specify a filter condition before executing this operation.",
+                operation=operation,
+                suggestions=[
+                    "Use .where() to add a filter condition",
+                    "Use .all() to check the whole table"
+                ]
+            )
+
+        self.__plan_index()
+        self.__resolve_key_conditions()
+        self.__validate_index()
+
+        use_query = bool(self._key_condition_expression) and not self._force_scan and not self._scan_all
+        attributes = {}
+        if use_query:
+            attributes["KeyConditionExpression"] = transform_params_in_query(self._key_condition_expression)
+            if self._index:
+                attributes["IndexName"] = self._index
+        if self._filter_expression:
+            attributes["FilterExpression"] = transform_params_in_filter(self._filter_expression)
+        if self._project_expression:
+            attributes["ProjectionExpression"] = self._project_expression
+        if self._offset:
+            attributes["ExclusiveStartKey"] = self._offset
+        return attributes, use_query
+
+    def __key_attributes(self, use_query: bool) -> List[str]:
+        key_attributes = list(self._partition_keys)
+        if use_query and self._index:
+            key_attributes += [key for key in self._indexes[self._index]["keys"] if key not in key_attributes]
+        return key_attributes
+
+    def __project_with_keys(self, key_attributes: List[str]) -> Optional[str]:
+        if not self._project_expression:
+            return None
+        projection = [attr.strip() for attr in self._project_expression.split(",")]
+        projection += [key for key in key_attributes if key not in projection]
+        return ", ".join(projection)
+
+    def __stream_responses(self, plan: Dict, prefetch):
+        kwargs, use_query, budget = plan["kwargs"], plan["use_query"], plan["budget"]
+        segments, offset, limit = plan["segments"], plan["offset"], plan["limit"]
+
+        if not use_query and segments:
+            # Segments still pending when the budget runs out form the continuation key
+            positions = self._segment_offsets(offset, segments)
+            for segment, response in self._parallel_scan_pages(kwargs, segments, plan["workers"], offset, budget,
+                                                               depth=prefetch):
+                if "LastEvaluatedKey" in response:
+                    positions[segment] = response["LastEvaluatedKey"]
+                else:
+                    positions.pop(segment)
+                yield segment, response
+            if budget is not None and budget.exhausted:
+                self._last_evaluated_key = {segment: key or {} for segment, key in positions.items()}
+            return
+
+        def pages(table):
+            request = dict(kwargs)
+            if offset:
+                request["ExclusiveStartKey"] = offset
+            while True:
+                response = table.query(**request) if use_query else self._scan_page(table, request, limit, budget)
+                if response is None:
+                    self._last_evaluated_key = request["ExclusiveStartKey"]
+                    return
+                yield response
+                if "LastEvaluatedKey" not in response:
+                    return
+                request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        responses = self._prefetch_pages(pages, prefetch) if prefetch else pages(self._table)
+        for response in responses:
+            yield None, response
+
+    @staticmethod
+    def __load_checkpoint(checkpoint: CheckpointStore, segments: Optional[int]) -> Optional[Dict]:
+        state = checkpoint.load()
+        if state is None:
+            return None
+        if state.get("segments") != segments:
+            raise InvalidArgumentException(
+                "Checkpoint was saved with a different parallel scan layout.",
+                method="stream",
+                expected=f"segments={state.get('segments')}",
+                received=f"segments={segments}"
+            )
+        return deserialize_position(state)
+
+    @staticmethod
+    def __build_deadline(deadline) -> Optional[_Deadline]:
+        if deadline is None:
+            return None
+        if not callable(deadline) and (not isinstance(deadline, (int, float)) or isinstance(deadline, bool)
+                                       or deadline <= 0):
+            raise InvalidArgumentException(
+                "deadline must be a positive number of seconds or a callable returning the remaining milliseconds.",
+                method="get",
+                expected="positive number or callable",
+                received=str(deadline)
+            )
+        return _Deadline(deadline, margin_ms=float(DynoConfig.get("deadline_margin_ms")))
 
-        while True:
-            response = op(**kwargs)
-            for row in response["Items"]:
-                model_instance = self.__class__()
-                model_instance._data = row.copy()
-                yield model_instance
-            if "LastEvaluatedKey" not in response:
-                break
-            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    @staticmethod
+    def __validate_stream_options(prefetch, checkpoint_every, method: str):
+        if prefetch is not None and (not isinstance(prefetch, int) or isinstance(prefetch, bool) or prefetch < 0):
+            raise InvalidArgumentException(
+                "prefetch must be a non-negative integer.",
+                method=method,
+                expected="non-negative integer",
+                received=str(prefetch)
+            )
+        if not isinstance(checkpoint_every, int) or isinstance(checkpoint_every, bool) or checkpoint_every < 1:
+            raise InvalidArgumentException(
+                "checkpoint_every must be a positive integer.",
+                method=method,
+                expected="positive integer",
+                received=str(checkpoint_every)
+            )
 
     def count(self) -> int:
         self._last_error = None
@@ -633,6 +1195,7 @@ class DynoLayer(CrudMixin):
                     ]
                 )
 
+            self.__plan_index()
             self.__resolve_key_conditions()
             self.__validate_index()
 
@@ -644,7 +1207,14 @@ class DynoLayer(CrudMixin):
                 key_condition = transform_params_in_query(self._key_condition_expression)
                 total = self._count_query(key_condition, filter_expression, self._index)
             else:
-                total = self._count_scan(filter_expression)
+                budget = self._scan_budget("count")
+                if self._segments:
+                    response = self._parallel_count_scan(filter_expression, self._segments, self._workers,
+                                                         self._offset, budget)
+                else:
+                    response = self._count_scan(filter_expression, offset=self._offset, budget=budget)
+                total = response["Count"]
+                self._last_evaluated_key = response["LastEvaluatedKey"]
 
             self.__reset_query_builder()
             return total
@@ -655,18 +1225,157 @@ class DynoLayer(CrudMixin):
             self.__reset_query_builder()
             return 0
 
+    def exists(self) -> bool:
+        self._last_error = None
+        try:
+            attributes, use_query = self.__probe_request("exists")
+            budget = None if use_query else self._scan_budget("exists")
+            response = self._probe(attributes, use_query, self._limit, count_only=True, budget=budget)
+
+            self.__reset_query_builder()
+            return bool(response and response["Count"])
+        except DynoLayerException as e:
+            if self.raise_on_error:
+                raise
+            self._last_error = e
+            self.__reset_query_builder()
+            return False
+
+    def first(self, as_dicts=False) -> DynoLayer | Dict | None:
+        self._last_error = None
+        as_dicts = as_dicts or self._raw
+        try:
+            attributes, use_query = self.__probe_request("first")
+            budget = None if use_query else self._scan_budget("first")
+            response = self._probe(attributes, use_query, self._limit, budget=budget)
+
+            self.__reset_query_builder()
+            if not response or not response["Items"]:
+                return None
+
+            item = response["Items"][0]
+            return item if as_dicts else self._hydrate(item)
+        except DynoLayerException as e:
+            if self.raise_on_error:
+                raise
+            self._last_error = e
+            self.__reset_query_builder()
+            return None
+
+    def explain(self, paginate=False, analyze=False) -> Optional[Dict]:
+        self._last_error = None
+        state = self.__snapshot_query_builder()
+        try:
+            if not self._scan_all and not self._filter_expression and not self._key_condition_expression:
+                raise QueryException(
+                    "You must specify a filter condition before executing this operation.",
+                    operation="explain",
+                    suggestions=[
+                        "Use .where() to add a filter condition",
+                        "Use .all() to explain a full scan"
+                    ]
+                )
+
+            explicit_index = self._index
+            had_key_conditions = bool(self._key_condition_expression)
+            self.__plan_index()
+            self.__resolve_key_conditions()
+            self.__validate_index()
+
+            use_query = bool(self._key_condition_expression) and not self._force_scan and not self._scan_all
+            key_conditions = self._key_condition_expression if use_query else []
+            filters = list(self._filter_expression)
+            if not use_query:
+                # A scan evaluates every condition, key attributes included, as a filter
+                filters = [{"AND": cond} for cond in self._key_condition_expression] + filters
+
+            builder = ConditionExpressionBuilder()
+            names, values = {}, {}
+            attributes = {}
+            if key_conditions:
+                key_condition = transform_params_in_query(key_conditions)
+                built = builder.build_expression(key_condition, is_key_condition=True)
+                attributes["KeyConditionExpression"] = key_condition
+                names.update(built.attribute_name_placeholders)
+                values.update(built.attribute_value_placeholders)
+            if filters:
+                filter_expression = transform_params_in_filter(filters)
+                built_filter = builder.build_expression(filter_expression)
+                attributes["FilterExpression"] = filter_expression
+                names.update(built_filter.attribute_name_placeholders)
+                values.update(built_filter.attribute_value_placeholders)
+            if use_query and self._index:
+                attributes["IndexName"] = self._index
+            if self._project_expression:
+                attributes["ProjectionExpression"] = self._project_expression
+            if self._limit:
+                attributes["Limit"] = self._limit
+
+            segments = None if use_query else self._segments
+            plan = {
+                "operation": "Query" if use_query else "Scan",
+                "table": self._entity,
+                "index": self._index if use_query else None,
+                "index_source": ("explicit" if explicit_index else "auto") if use_query and self._index else None,
+                "key_conditions": [
+                    {"attribute": attr, "operator": condition, "value": value}
+                    for cond in key_conditions for attr, (condition, value) in cond.items()
+                ],
+                "filters": [
+                    {"connector": connector, "attribute": attr, "operator": condition, "value": value}
+                    for filt in filters for connector, inner in filt.items()
+                    for attr, (condition, value) in inner.items()
+                ],
+                "key_condition_expression": built.condition_expression if key_conditions else None,
+                "filter_expression": built_filter.condition_expression if filters else None,
+                "expression_attribute_names": names,
+                "expression_attribute_values": values,
+                "projection": [attr.strip() for attr in self._project_expression.split(",")]
+                if self._project_expression else None,
+                "limit": self._limit,
+                "take": self._take,
+                "segments": segments,
+                "paginate": paginate,
+                "estimated_read_units": None if use_query else self.__estimate_scan_capacity(),
+                "warnings": [],
+            }
+
+            if not use_query:
+                plan["warnings"].append("Full table scan: every item is read and billed before filters apply.")
+            if not use_query and had_key_conditions and not self._force_scan and not self._scan_all:
+                plan["warnings"].append(
+                    "Key attributes were demoted to filters; no index matches these conditions."
+                )
+
+            if analyze:
+                offset = self._offset if not segments else None
+                if offset:
+                    attributes["ExclusiveStartKey"] = offset
+                plan["analyze"] = self._analyze(
+                    "query" if use_query else "scan", attributes, paginate, segments, self._workers
+                )
+
+            return plan
+        except DynoLayerException as e:
+            if self.raise_on_error:
+                raise
+            self._last_error = e
+            return None
+        finally:
+            self.__restore_query_builder(state)
+
     @classmethod
     def find_or_fail(cls, key: dict, message="Record not found.", attributes: List[str] = None) -> Optional[DynoLayer]:
-        cls._class_last_error = None
+        cls._set_class_last_error(None)
         try:
             instance = cls.get_item(key, attributes=attributes)
-            if instance is None and cls._class_last_error is None:
+            if instance is None and cls._get_class_last_error() is None:
                 raise RecordNotFoundException(message, key=key, entity=cls.__name__)
             return instance
         except DynoLayerException as e:
             if cls.raise_on_error:
                 raise
-            cls._class_last_error = e
+            cls._set_class_last_error(e)
             return None
 
     def _load_indexes(self):
@@ -678,25 +1387,21 @@ class DynoLayer(CrudMixin):
         else:
             table_description = self._describe()["Table"]
             indexes = {}
-            for idx in table_description.get("GlobalSecondaryIndexes", []):
-                idx_schema = idx["KeySchema"]
-                idx_hash = next(a["AttributeName"] for a in idx_schema if a["KeyType"] == "HASH")
-                idx_range = next((a["AttributeName"] for a in idx_schema if a["KeyType"] == "RANGE"), None)
-                indexes[idx["IndexName"]] = {
-                    "keys": [a["AttributeName"] for a in idx_schema],
-                    "hash_key": idx_hash,
-                    "range_key": idx_range,
-                }
-            for idx in table_description.get("LocalSecondaryIndexes", []):
+            for idx in table_description.get("GlobalSecondaryIndexes", []) + \
+                    table_description.get("LocalSecondaryIndexes", []):
                 idx_schema = idx["KeySchema"]
                 idx_hash = next(a["AttributeName"] for a in idx_schema if a["KeyType"] == "HASH")
                 idx_range = next((a["AttributeName"] for a in idx_schema if a["KeyType"] == "RANGE"), None)
+                projection = idx.get("Projection", {})
                 indexes[idx["IndexName"]] = {
                     "keys": [a["AttributeName"] for a in idx_schema],
                     "hash_key": idx_hash,
                     "range_key": idx_range,
+                    "projection": projection.get("ProjectionType", "ALL"),
+                    "projected": projection.get("NonKeyAttributes", []),
                 }
-            CrudMixin._table_keys_cache[cache_key] = indexes
+            with CrudMixin._cache_lock:
+                CrudMixin._table_keys_cache[cache_key] = indexes
 
         self._indexes = indexes
         self._all_index_keys = {key for idx in indexes.values() for key in idx["keys"]}
@@ -735,13 +1440,47 @@ class DynoLayer(CrudMixin):
         return generated
 
     def __generate_numeric_id(self):
+        return self.__generate_numeric_id_batch(1)[0]
+
+    def __generate_numeric_id_batch(self, count):
+        # hi/lo allocation: ids are handed out from a block reserved on the sequences table
         table_name = self._auto_id_table or DynoConfig.get("auto_id_table")
+        block_size = self._auto_id_block_size or int(DynoConfig.get("auto_id_block_size"))
+        cache_key = (table_name, self._entity)
+
+        if block_size == 1:
+            # Nothing is cached between calls, so the atomic counter alone keeps the ids unique
+            last_id = self.__reserve_numeric_ids(table_name, count)
+            return list(range(last_id - count + 1, last_id + 1))
+
+        with CrudMixin._id_blocks_lock:
+            lock = CrudMixin._id_block_locks.setdefault(cache_key, threading.Lock())
+
+        with lock:
+            next_id, last_id = CrudMixin._id_blocks.get(cache_key, (1, 0))
+            taken = min(count, last_id - next_id + 1)
+            ids = list(range(next_id, next_id + taken))
+            next_id += taken
+
+            missing = count - taken
+            if missing:
+                reserved = max(block_size, missing)
+                last_id = self.__reserve_numeric_ids(table_name, reserved)
+                next_id = last_id - reserved + 1
+                ids.extend(range(next_id, next_id + missing))
+                next_id += missing
+
+            CrudMixin._id_blocks[cache_key] = (next_id, last_id)
+
+        return ids
+
+    def __reserve_numeric_ids(self, table_name, count):
         try:
-            response = self._get_dynamodb().Table(table_name).update_item(
+            response = self._thread_table(table_name).update_item(
                 Key={"entity": self._entity},
                 UpdateExpression="ADD #counter :inc",
                 ExpressionAttributeNames={"#counter": "current_value"},
-                ExpressionAttributeValues={":inc": 1},
+                ExpressionAttributeValues={":inc": count},
                 ReturnValues="UPDATED_NEW"
             )
             return int(response["Attributes"]["current_value"])
@@ -755,27 +1494,167 @@ class DynoLayer(CrudMixin):
                 )
             raise
 
-    def __generate_numeric_id_batch(self, count):
-        table_name = self._auto_id_table or DynoConfig.get("auto_id_table")
-        try:
-            response = self._get_dynamodb().Table(table_name).update_item(
-                Key={"entity": self._entity},
-                UpdateExpression="ADD #counter :inc",
-                ExpressionAttributeNames={"#counter": "current_value"},
-                ExpressionAttributeValues={":inc": count},
-                ReturnValues="UPDATED_NEW"
+    def __plan_index(self):
+        # Picks an index when the conditions would otherwise fall through to a full scan
+        if self._index or self._force_scan or self._scan_all or not self.__auto_index_enabled():
+            return
+
+        equalities, ranges, attributes = set(), set(), set()
+        conditions = [("AND", cond) for cond in self._key_condition_expression]
+        conditions += [next(iter(filt.items())) for filt in self._filter_expression]
+        for operator, cond in conditions:
+            if operator in ("OR", "OR_NOT"):
+                return
+            attr, (condition, _) = next(iter(cond.items()))
+            attributes.add(attr)
+            if operator != "AND":
+                continue
+            if condition == "=":
+                equalities.add(attr)
+            if condition in _KEY_OPERATORS:
+                ranges.add(attr)
+
+        hash_key = self._partition_keys[0]
+        sort_key = self._partition_keys[1] if len(self._partition_keys) > 1 else None
+        if hash_key in equalities and (sort_key is None or sort_key in ranges):
+            return
+        if not equalities:
+            return
+
+        indexes = self.__planner_indexes()
+        if not indexes:
+            return
+
+        best_index, best_score = None, 1 if hash_key in equalities else 0
+        for name in sorted(indexes):
+            info = indexes[name]
+            if info["hash_key"] not in equalities:
+                continue
+            # Items without the range key are missing from the index, so it must be constrained too
+            if info["range_key"] is not None and info["range_key"] not in ranges:
+                continue
+            if not self.__index_covers(info, attributes):
+                continue
+            score = 2 if info["range_key"] is not None else 1
+            if score > best_score:
+                best_index, best_score = name, score
+
+        if best_index:
+            self._index = best_index
+
+    def __auto_index_enabled(self) -> bool:
+        return bool(self.__model_setting("auto_index"))
+
+    def __model_setting(self, name: str):
+        # Class attributes override DynoConfig, which falls back to env vars and defaults
+        value = getattr(type(self), name)
+        return value if value is not None else DynoConfig.get(name)
+
+    def __item_cache(self) -> Optional[ItemCache]:
+        if not self.__model_setting("item_cache"):
+            return None
+        cls = type(self)
+        if cls._item_cache is None:
+            settings = {}
+            for name in ("item_cache_ttl", "item_cache_max_entries", "item_cache_max_bytes"):
+                value = self.__model_setting(name)
+                if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool)
+                                          or value <= 0):
+                    raise InvalidArgumentException(
+                        f"{name} must be a positive number.",
+                        method="item_cache",
+                        expected="positive number or None",
+                        received=str(value)
+                    )
+                settings[name] = value
+            cls._item_cache = ItemCache(
+                self._entity, self._partition_keys,
+                ttl=settings["item_cache_ttl"],
+                max_entries=settings["item_cache_max_entries"],
+                max_bytes=settings["item_cache_max_bytes"],
             )
-            end = int(response["Attributes"]["current_value"])
-            return list(range(end - count + 1, end + 1))
-        except Exception as e:
-            if "ResourceNotFoundException" in type(e).__name__ or "ResourceNotFound" in str(e):
-                raise AutoIdException(
-                    f"Sequences table '{table_name}' not found. "
-                    f"Create it with partition key 'entity' (String).",
-                    strategy="numeric",
-                    entity=self._entity
+        return cls._item_cache
+
+    def __discard_cached(self, keys: List[Dict], keep: DynoLayer = None):
+        # Invalidate even when item_cache was switched off after the cache was filled
+        cache = type(self)._item_cache
+        session = current_session()
+        for key in keys:
+            if cache is not None:
+                cache.discard(key)
+            if session is not None:
+                session.discard(self._entity, key, keep=keep)
+
+    def __remember(self, instance: DynoLayer, session) -> DynoLayer:
+        if session is not None:
+            session.add(self._entity, {key: instance._data.get(key) for key in self._partition_keys}, instance)
+        return instance
+
+    def _scan_budget(self, operation: str) -> Optional[_ScanBudget]:
+        policy = self.__model_setting("scan_policy")
+        if policy not in self._VALID_SCAN_POLICIES:
+            raise InvalidArgumentException(
+                f"Invalid scan_policy: '{policy}'",
+                method=operation,
+                expected=f"One of: {', '.join(self._VALID_SCAN_POLICIES)}",
+                received=str(policy)
+            )
+
+        # all(), find() without terms and force_scan() are deliberate scans
+        if policy != "allow" and not self._scan_all and not self._force_scan:
+            message = f"Query on '{self._entity}' has no usable key condition and would scan the whole table."
+            if policy == "raise":
+                raise QueryException(
+                    message,
+                    operation=operation,
+                    suggestions=[
+                        "Add an equality condition on the partition key of the table or of an index",
+                        "Use .force_scan() if the scan is intended"
+                    ]
                 )
-            raise
+            warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+        limits = {}
+        for name in ("scan_max_pages", "scan_max_items"):
+            value = self.__model_setting(name)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+                raise InvalidArgumentException(
+                    f"{name} must be a positive integer.",
+                    method=operation,
+                    expected="positive integer",
+                    received=str(value)
+                )
+            limits[name] = value
+
+        if limits["scan_max_pages"] is None and limits["scan_max_items"] is None:
+            return None
+        return _ScanBudget(limits["scan_max_pages"], limits["scan_max_items"])
+
+    def __planner_indexes(self) -> Optional[Dict]:
+        if self._indexes:
+            return self._indexes
+
+        unavailable_key = f"{self._entity}:indexes_unavailable"
+        if unavailable_key in CrudMixin._table_keys_cache:
+            return None
+        try:
+            self._load_indexes()
+        except ClientError:
+            # Without DescribeTable permission the query keeps its original plan
+            with CrudMixin._cache_lock:
+                CrudMixin._table_keys_cache[unavailable_key] = True
+            return None
+        return self._indexes
+
+    def __index_covers(self, info: Dict, attributes: set) -> bool:
+        if info["projection"] == "ALL":
+            return True
+        if not self._project_expression:
+            return False
+
+        projected = set(info["keys"]) | set(self._partition_keys) | set(info["projected"])
+        requested = {attr.strip() for attr in self._project_expression.split(",")}
+        return (attributes | requested) <= projected
 
     def __resolve_key_conditions(self):
         if self._force_scan or self._scan_all:
@@ -799,13 +1678,26 @@ class DynoLayer(CrudMixin):
             operator = next(iter(filt))
             inner = filt[operator]
             attr = next(iter(inner))
-            if attr in valid_keys:
+            if operator == "AND" and attr in valid_keys and inner[attr][0] in _KEY_OPERATORS:
                 resolved_key_conditions.append({attr: inner[attr]})
             else:
                 resolved_filter.append(filt)
 
-        self._key_condition_expression = resolved_key_conditions
-        self._filter_expression = resolved_filter
+        self._key_condition_expression, self._filter_expression = self.__demote_unqueryable_key_conditions(
+            resolved_key_conditions, resolved_filter)
+
+    def __demote_unqueryable_key_conditions(self, key_conditions: list, filters: list) -> tuple:
+        # DynamoDB can only Query with an equality on the hash key; without one (e.g. where("id", ">", 3))
+        # the key conditions run as scan filters instead of producing an invalid Query. An explicit
+        # index is left alone so DynamoDB reports the mistake.
+        if self._index:
+            return key_conditions, filters
+        has_hash_equality = any(
+            self._hash_key in cond and cond[self._hash_key][0] == "=" for cond in key_conditions
+        )
+        if has_hash_equality:
+            return key_conditions, filters
+        return [], [{"AND": cond} for cond in key_conditions] + filters
 
     def __validate_key_dict(self, key: dict):
         missing = [k for k in self._partition_keys if k not in key]
@@ -852,33 +1744,86 @@ class DynoLayer(CrudMixin):
                     required_fields=required
                 )
 
-    def __safe(self, unset_keys=None):
-        data = self._data.copy()
+    def __safe(self, unset_keys=None, only=None):
+        if only is not None:
+            data = {key: self._data[key] for key in only}
+        else:
+            data = self._data.copy()
 
         if unset_keys and isinstance(unset_keys, list):
             for key in unset_keys:
                 del data[key]
 
-        for key, value in data.items():
-            if isinstance(value, float):
-                data[key] = Decimal(str(value))
-
-        return data
+        # The client engine writes floats directly; the boto3 resource only accepts Decimal
+        if self._client_engine():
+            return data
+        return floats_to_decimal(data)
+
+    def __mark_clean(self):
+        self._persisted = True
+        self._dirty = set()
+        self._removed = set()
+        self._snapshot = _snapshot(self._data)
+
+    def __changes(self) -> tuple:
+        # Assignments are tracked as they happen; comparing with the snapshot also catches in-place
+        # mutations (list.append, nested maps, data()[...] = ...) that never reach __setitem__
+        changed, removed = set(self._dirty), set(self._removed)
+        snapshot = self._snapshot
+        if snapshot is not None:
+            changed.update(key for key, value in self._data.items()
+                           if key not in snapshot or snapshot[key] != value)
+            removed.update(key for key in snapshot if key not in self._data)
+        return changed, removed
 
     def __set_filter_expression(self, attribute: str, condition: str, value: str | int | List[str | int] | None,
                                 filter_operator: Literal["AND", "OR", "AND_NOT", "OR_NOT"]):
         keys = set(self._partition_keys) | self._all_index_keys
-        if attribute in keys:
+        if filter_operator == "AND" and attribute in keys and condition in _KEY_OPERATORS:
             self._key_condition_expression.append({attribute: (condition, value)})
         else:
             self._filter_expression.append({filter_operator: {attribute: (condition, value)}})
 
+    def __estimate_scan_capacity(self) -> Optional[float]:
+        # Eventually consistent scans cost 0.5 RCU per 4 KB; DynamoDB refreshes TableSizeBytes every ~6 hours
+        try:
+            size = self._describe()["Table"].get("TableSizeBytes")
+        except ClientError:
+            return None
+        if size is None:
+            return None
+        return max(math.ceil(size / 4096), 1) * 0.5
+
+    def __snapshot_query_builder(self) -> Dict:
+        return {
+            "_index": self._index,
+            "_limit": self._limit,
+            "_take": self._take,
+            "_project_expression": self._project_expression,
+            "_key_condition_expression": list(self._key_condition_expression),
+            "_filter_expression": list(self._filter_expression),
+            "_force_scan": self._force_scan,
+            "_offset": self._offset,
+            "_scan_all": self._scan_all,
+            "_segments": self._segments,
+            "_workers": self._workers,
+            "_raw": self._raw,
+        }
+
+    def __restore_query_builder(self, state: Dict):
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+
     def __reset_query_builder(self):
         self._index = None
         self._limit = None
+        self._take = None
         self._project_expression = None
         self._key_condition_expression = list()
         self._filter_expression = list()
         self._force_scan = False
         self._offset = None
-        self._scan_all = False
\ No newline at end of file
+        self._scan_all = False
+        self._segments = None
+        self._workers = None
+        self._raw = False
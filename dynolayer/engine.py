@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.table import BatchWriter
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, Binary, TypeSerializer
+
+from dynolayer.exceptions import InvalidArgumentException
+
+# Anything without a fast path (sets, subclasses) goes through boto3, so errors and edge cases match it
+_fallback = TypeSerializer()
+
+
+def _serialize_number(value) -> Dict:
+    number = str(DYNAMODB_CONTEXT.create_decimal(value))
+    if number in ("Infinity", "NaN"):
+        raise TypeError("Infinity and NaN not supported")
+    return {"N": number}
+
+
+def _serialize_float(value: float) -> Dict:
+    # repr() is the shortest string that round-trips, so floats are written without a Decimal in between
+    if not math.isfinite(value):
+        raise TypeError("Infinity and NaN not supported")
+    return {"N": repr(value).upper()}
+
+
+_SERIALIZERS = {
+    str: lambda value: {"S": value},
+    bool: lambda value: {"BOOL": value},
+    int: lambda value: {"N": str(value)},
+    float: _serialize_float,
+    Decimal: _serialize_number,
+    type(None): lambda value: {"NULL": True},
+    dict: lambda value: {"M": {key: serialize(item) for key, item in value.items()}},
+    list: lambda value: {"L": [serialize(item) for item in value]},
+    tuple: lambda value: {"L": [serialize(item) for item in value]},
+    bytes: lambda value: {"B": value},
+    bytearray: lambda value: {"B": value},
+    Binary: lambda value: {"B": value.value},
+}
+
+
+def serialize(value: Any) -> Dict:
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is None:
+        return _fallback.serialize(value)
+    return serializer(value)
+
+
+def _int_or_float(raw: str):
+    if "." in raw or "e" in raw or "E" in raw:
+        return float(raw)
+    return int(raw)
+
+
+def _decimal_int_or_float(value: Decimal):
+    return int(value) if value.as_tuple().exponent >= 0 else float(value)
+
+
+# How "N" strings are decoded, and how Decimals already built by the boto3 resource are converted
+NUMBER_DECODERS = {"decimal": Decimal, "int_or_float": _int_or_float, "float": float}
+_DECIMAL_CONVERTERS = {"int_or_float": _decimal_int_or_float, "float": float}
+
+
+def _build_decoder(number):
+    def deserialize(value: Dict) -> Any:
+        for tag, raw in value.items():
+            return decoders[tag](raw)
+        raise TypeError("Value must be a nonempty dictionary whose key is a valid dynamodb type.")
+
+    decoders = {
+        "S": lambda raw: raw,
+        # DynamoDB numbers have at most 38 digits, so Decimal() is exact without the rounding context
+        "N": number,
+        "BOOL": lambda raw: raw,
+        "NULL": lambda raw: None,
+        "M": lambda raw: {key: deserialize(item) for key, item in raw.items()},
+        "L": lambda raw: [deserialize(item) for item in raw],
+        "B": Binary,
+        "SS": set,
+        "NS": lambda raw: set(map(number, raw)),
+        "BS": lambda raw: set(map(Binary, raw)),
+    }
+    return deserialize, decoders
+
+
+deserialize, _DESERIALIZERS = _build_decoder(Decimal)
+
+
+def floats_to_decimal(item: Dict) -> Dict:
+    # One pass over the item for the boto3 resource, which only accepts Decimal; containers are only
+    # rebuilt when they hold a float
+    converted = None
+    for key, value in item.items():
+        new = _to_decimal(value)
+        if new is not value:
+            if converted is None:
+                converted = dict(item)
+            converted[key] = new
+    return item if converted is None else converted
+
+
+def _to_decimal(value):
+    kind = type(value)
+    if kind is float:
+        return Decimal(repr(value))
+    if kind is dict:
+        return floats_to_decimal(value)
+    if kind is list or kind is tuple:
+        items = [_to_decimal(item) for item in value]
+        if any(new is not old for new, old in zip(items, value)):
+            return items if kind is list else tuple(items)
+    elif kind is set:
+        if any(type(item) is float for item in value):
+            return {_to_decimal(item) for item in value}
+    return value
+
+
+def serialize_item(item: Optional[Dict]) -> Optional[Dict]:
+    if item is None:
+        return None
+    return {key: serialize(value) for key, value in item.items()}
+
+
+def deserialize_item(raw: Optional[Dict]) -> Optional[Dict]:
+    if raw is None:
+        return None
+    return {key: deserialize(value) for key, value in raw.items()}
+
+
+class ItemCodec:
+    # Attributes with a declared type skip the lookup by tag; a stored value of another type
+    # (e.g. NULL) still falls back to the generic path
+    def __init__(self, attribute_types: Optional[Dict[str, str]] = None, number_mode: str = "decimal"):
+        if number_mode not in NUMBER_DECODERS:
+            raise InvalidArgumentException(
+                f"Invalid number_mode: '{number_mode}'",
+                method="number_mode",
+                expected=f"One of: {', '.join(NUMBER_DECODERS)}",
+                received=str(number_mode)
+            )
+        self.attribute_types = dict(attribute_types or {})
+        self.number_mode = number_mode
+        self.deserialize, self._tags = _build_decoder(NUMBER_DECODERS[number_mode])
+        self._convert_decimal = _DECIMAL_CONVERTERS.get(number_mode)
+        self._decoders = {}
+        for attribute, tag in self.attribute_types.items():
+            if tag not in _DESERIALIZERS:
+                raise InvalidArgumentException(
+                    f"Invalid type '{tag}' declared for attribute '{attribute}'.",
+                    method="attribute_types",
+                    expected=f"One of: {', '.join(_DESERIALIZERS)}",
+                    received=str(tag)
+                )
+            self._decoders[attribute] = self._declared(tag)
+
+    def _declared(self, tag: str):
+        decoder = self._tags[tag]
+        generic = self.deserialize
+
+        def decode(value):
+            if tag in value:
+                return decoder(value[tag])
+            return generic(value)
+        return decode
+
+    def serialize_item(self, item: Optional[Dict]) -> Optional[Dict]:
+        return serialize_item(item)
+
+    def deserialize_item(self, raw: Optional[Dict]) -> Optional[Dict]:
+        if raw is None:
+            return None
+        generic = self.deserialize
+        decoders = self._decoders
+        if not decoders:
+            return {key: generic(value) for key, value in raw.items()}
+        return {key: decoders.get(key, generic)(value) for key, value in raw.items()}
+
+    def deserialize_items(self, raw_items) -> list:
+        return [self.deserialize_item(raw) for raw in raw_items]
+
+    def convert_item(self, item: Optional[Dict]) -> Optional[Dict]:
+        # For items the boto3 resource already deserialized: Decimals are converted to number_mode
+        if item is None or self._convert_decimal is None:
+            return item
+        return {key: self._convert(value) for key, value in item.items()}
+
+    def convert_items(self, items) -> list:
+        if self._convert_decimal is None:
+            return items
+        return [self.convert_item(item) for item in items]
+
+    def _convert(self, value):
+        kind = type(value)
+        if kind is Decimal:
+            return self._convert_decimal(value)
+        if kind is dict:
+            return {key: self._convert(item) for key, item in value.items()}
+        if kind is list:
+            return [self._convert(item) for item in value]
+        if kind is set:
+            return {self._convert(item) for item in value}
+        return value
+
+
+DEFAULT_CODECS = {mode: ItemCodec(number_mode=mode) for mode in NUMBER_DECODERS}
+DEFAULT_CODEC = DEFAULT_CODECS["decimal"]
+
+
+class ClientResource:
+    # Stands in for the boto3 resource on top of the low-level client: requests are serialized and
+    # responses deserialized by an ItemCodec instead of boto3's generic TypeSerializer/TypeDeserializer
+    def __init__(self, client, codec: ItemCodec = DEFAULT_CODEC):
+        self.client = client
+        self.codec = codec
+
+    def Table(self, name: str) -> ClientTable:
+        return ClientTable(self.client, name, self.codec)
+
+    def batch_write_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        serialize = self.codec.serialize_item
+        request_items = {
+            table: [self._map_request(request, serialize) for request in requests]
+            for table, requests in RequestItems.items()
+        }
+        response = self.client.batch_write_item(RequestItems=request_items, **kwargs)
+        deserialize = self.codec.deserialize_item
+        response["UnprocessedItems"] = {
+            table: [self._map_request(request, deserialize) for request in requests]
+            for table, requests in response.get("UnprocessedItems", {}).items()
+        }
+        return response
+
+    def batch_get_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        serialize = self.codec.serialize_item
+        request_items = {
+            table: dict(request, Keys=[serialize(key) for key in request["Keys"]])
+            for table, request in RequestItems.items()
+        }
+        response = self.client.batch_get_item(RequestItems=request_items, **kwargs)
+        response["Responses"] = {
+            table: self.codec.deserialize_items(items) for table, items in response.get("Responses", {}).items()
+        }
+        deserialize = self.codec.deserialize_item
+        response["UnprocessedKeys"] = {
+            table: dict(request, Keys=[deserialize(key) for key in request["Keys"]])
+            for table, request in response.get("UnprocessedKeys", {}).items()
+        }
+        return response
+
+    @staticmethod
+    def _map_request(request: Dict, convert) -> Dict:
+        if "PutRequest" in request:
+            return {"PutRequest": {"Item": convert(request["PutRequest"]["Item"])}}
+        return {"DeleteRequest": {"Key": convert(request["DeleteRequest"]["Key"])}}
+
+
+class NumberModeTable:
+    # Wraps a boto3 resource Table when a model reads numbers as int/float: the resource has already
+    # built Decimals, so items are converted once on the way out. Keys taken from those items (save,
+    # destroy, continuation keys) hold floats, so they go back to Decimal on the way in.
+    _KEY_PARAMS = ("Key", "ExclusiveStartKey")
+
+    def __init__(self, table, codec: ItemCodec):
+        self._table = table
+        self.codec = codec
+
+    def __getattr__(self, item):
+        return getattr(self._table, item)
+
+    def get_item(self, **kwargs) -> Dict:
+        response = self._table.get_item(**self._request(kwargs))
+        if "Item" in response:
+            response["Item"] = self.codec.convert_item(response["Item"])
+        return response
+
+    def update_item(self, **kwargs) -> Dict:
+        return self._table.update_item(**self._request(kwargs))
+
+    def delete_item(self, **kwargs) -> Dict:
+        return self._table.delete_item(**self._request(kwargs))
+
+    def batch_writer(self, **kwargs):
+        return _DecimalKeyWriter(self._table.batch_writer(**kwargs))
+
+    def query(self, **kwargs) -> Dict:
+        return self._page(self._table.query(**self._request(kwargs)))
+
+    def scan(self, **kwargs) -> Dict:
+        return self._page(self._table.scan(**self._request(kwargs)))
+
+    def _request(self, kwargs: Dict) -> Dict:
+        for param in self._KEY_PARAMS:
+            if kwargs.get(param):
+                kwargs[param] = floats_to_decimal(kwargs[param])
+        return kwargs
+
+    def _page(self, response: Dict) -> Dict:
+        if "Items" in response:
+            response["Items"] = self.codec.convert_items(response["Items"])
+        return response
+
+
+class _DecimalKeyWriter:
+    def __init__(self, writer):
+        self._writer = writer
+
+    def __enter__(self):
+        self._writer.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._writer.__exit__(*exc_info)
+
+    def put_item(self, Item: Dict) -> None:
+        self._writer.put_item(Item=floats_to_decimal(Item))
+
+    def delete_item(self, Key: Dict) -> None:
+        self._writer.delete_item(Key=floats_to_decimal(Key))
+
+
+class NumberModeResource:
+    def __init__(self, resource, codec: ItemCodec):
+        self._resource = resource
+        self.codec = codec
+
+    def __getattr__(self, item):
+        return getattr(self._resource, item)
+
+    def batch_write_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        request_items = {
+            table: [ClientResource._map_request(request, floats_to_decimal) for request in requests]
+            for table, requests in RequestItems.items()
+        }
+        return self._resource.batch_write_item(RequestItems=request_items, **kwargs)
+
+    def batch_get_item(self, RequestItems: Dict, **kwargs) -> Dict:
+        request_items = {
+            table: dict(request, Keys=[floats_to_decimal(key) for key in request["Keys"]])
+            for table, request in RequestItems.items()
+        }
+        response = self._resource.batch_get_item(RequestItems=request_items, **kwargs)
+        response["Responses"] = {
+            table: self.codec.convert_items(items) for table, items in response.get("Responses", {}).items()
+        }
+        return response
+
+
+class ClientTable:
+    # Mirrors the subset of boto3's Table used by CrudMixin, so both engines share every code path
+    _CONDITIONS = (("ConditionExpression", False), ("FilterExpression", False), ("KeyConditionExpression", True))
+    _ITEM_PARAMS = ("Item", "Key", "ExclusiveStartKey")
+
+    def __init__(self, client, name: str, codec: ItemCodec = DEFAULT_CODEC):
+        self.client = client
+        self.name = name
+        self.codec = codec
+
+    def get_item(self, **kwargs) -> Dict:
+        response = self.client.get_item(**self._request(kwargs))
+        if "Item" in response:
+            response["Item"] = self.codec.deserialize_item(response["Item"])
+        return response
+
+    def put_item(self, **kwargs) -> Dict:
+        return self._attributes(self.client.put_item(**self._request(kwargs)))
+
+    def update_item(self, **kwargs) -> Dict:
+        return self._attributes(self.client.update_item(**self._request(kwargs)))
+
+    def delete_item(self, **kwargs) -> Dict:
+        return self._attributes(self.client.delete_item(**self._request(kwargs)))
+
+    def query(self, **kwargs) -> Dict:
+        return self._page(self.client.query(**self._request(kwargs)))
+
+    def scan(self, **kwargs) -> Dict:
+        return self._page(self.client.scan(**self._request(kwargs)))
+
+    def condition_check(self, **kwargs) -> Dict:
+        # Evaluates a ConditionExpression against the item without writing anything
+        return self.client.transact_write_items(TransactItems=[{"ConditionCheck": self._request(kwargs)}])
+
+    def batch_writer(self, overwrite_by_pkeys=None) -> BatchWriter:
+        return BatchWriter(self.name, ClientResource(self.client, self.codec), overwrite_by_pkeys=overwrite_by_pkeys)
+
+    def _request(self, kwargs: Dict) -> Dict:
+        request = dict(kwargs, TableName=self.name)
+        builder = None
+        names = dict(request.get("ExpressionAttributeNames") or {})
+        values = dict(request.get("ExpressionAttributeValues") or {})
+
+        for param, is_key_condition in self._CONDITIONS:
+            condition = request.get(param)
+            if isinstance(condition, ConditionBase):
+                # One builder per request, so placeholders of different expressions never collide
+                builder = builder or ConditionExpressionBuilder()
+                built = builder.build_expression(condition, is_key_condition=is_key_condition)
+                request[param] = built.condition_expression
+                names.update(built.attribute_name_placeholders)
+                values.update(built.attribute_value_placeholders)
+
+        if names:
+            request["ExpressionAttributeNames"] = names
+        if values:
+            request["ExpressionAttributeValues"] = {key: serialize(value) for key, value in values.items()}
+        for param in self._ITEM_PARAMS:
+            if request.get(param) is not None:
+                request[param] = self.codec.serialize_item(request[param])
+        return request
+
+    def _page(self, response: Dict) -> Dict:
+        if "Items" in response:
+            response["Items"] = self.codec.deserialize_items(response["Items"])
+        if "LastEvaluatedKey" in response:
+            response["LastEvaluatedKey"] = deserialize_item(response["LastEvaluatedKey"])
+        return response
+
+    def _attributes(self, response: Dict) -> Dict:
+        if "Attributes" in response:
+            response["Attributes"] = self.codec.deserialize_item(response["Attributes"])
+        return response
@@ -166,6 +166,26 @@ class AutoIdException(DynoLayerException):
         super().__init__(message, details)
 
 
+class BatchOperationException(DynoLayerException):
+    """
+    Exception raised when a batch operation cannot complete.
+
+    This exception is raised when DynamoDB keeps returning unprocessed
+    keys or items after every retry has been exhausted.
+    """
+
+    def __init__(self, message, operation=None, unprocessed=None, retries=None):
+        details = {}
+        if operation:
+            details['operation'] = operation
+        if unprocessed is not None:
+            details['unprocessed'] = unprocessed
+        if retries is not None:
+            details['retries'] = retries
+
+        super().__init__(message, details)
+
+
 class InvalidArgumentException(DynoLayerException):
     """
     Exception raised for invalid arguments.
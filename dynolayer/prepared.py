@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from dynolayer.exceptions import DynoLayerException, InvalidArgumentException, QueryException
+from dynolayer.utils import Collection, compile_expression, _bind_placeholder, _KEY_OPERATORS
+
+_COMPARISON_OPERATORS = {"=", "<", "<=", ">", ">=", "<>"}
+
+# Keyword arguments of get()/fetch(); placeholders with these names could never be bound
+_RESERVED_PLACEHOLDERS = ("all", "paginate", "limit", "offset", "as_dicts")
+
+_FUNCTION_OPERATORS = {
+    "begins_with": "begins_with",
+    "contains": "contains",
+    "attribute_type": "attribute_type",
+}
+
+
+class PreparedQuery:
+    def __init__(self, model, terms: str, index: str = None, attributes: List[str] = None):
+        self._model = model
+        self._instance = model()
+        self._index = index
+        self._names: Dict[str, str] = {}
+        self._bindings: List[Tuple[int, str, Any]] = []
+
+        template = compile_expression(terms)
+        reserved = sorted({
+            name for _, _, _, placeholder in template
+            for name in (placeholder if isinstance(placeholder, tuple) else (placeholder,))
+            if name in _RESERVED_PLACEHOLDERS
+        })
+        if reserved:
+            raise InvalidArgumentException(
+                f"Placeholder ':{reserved[0]}' clashes with a keyword argument of get().",
+                method="prepare",
+                expected=f"A placeholder name other than: {', '.join(_RESERVED_PLACEHOLDERS)}",
+                received=", ".join(f":{name}" for name in reserved),
+            )
+
+        if index:
+            self._instance._index = index
+            self._instance._load_indexes()
+            if index not in self._instance._indexes:
+                raise QueryException(
+                    f"Index '{index}' does not exist on table '{self._instance._entity}'.",
+                    operation="prepare",
+                    suggestions=[f"Available indexes: {', '.join(self._instance._indexes.keys())}"]
+                )
+            index_info = self._instance._indexes[index]
+            hash_key = index_info["hash_key"]
+            valid_keys = set(index_info["keys"])
+        else:
+            hash_key = self._instance._hash_key
+            valid_keys = set(self._instance._partition_keys)
+
+        # Conditions fold left to right, so a fragment is a top-level conjunct (and may become a key
+        # condition) only if it is joined with AND and no OR comes after it
+        conjuncts = set()
+        for position in range(len(template) - 1, -1, -1):
+            connector = template[position][0]
+            if connector in ("OR", "OR_NOT"):
+                break
+            if connector == "AND":
+                conjuncts.add(position)
+
+        key_conditions = []
+        filters = []
+        for position, (connector, attr, op, placeholder) in enumerate(template):
+            if position in conjuncts and attr in valid_keys and op in _KEY_OPERATORS:
+                key_conditions.append((position, attr, op, placeholder))
+            else:
+                filters.append((position, connector, attr, op, placeholder))
+
+        has_hash_condition = any(attr == hash_key and op == "=" for _, attr, op, _ in key_conditions)
+        if index and not has_hash_condition:
+            raise QueryException(
+                f"Index '{index}' requires partition key '{hash_key}' in the query condition.",
+                operation="prepare",
+                suggestions=[f"Add '{hash_key} = :value' to your expression"]
+            )
+        if not has_hash_condition:
+            # Without an equality on the hash key DynamoDB cannot Query, so everything becomes a filter
+            filters = sorted(
+                filters + [(position, "AND", attr, op, placeholder) for position, attr, op, placeholder in key_conditions]
+            )
+            key_conditions = []
+
+        self.operation = "Query" if key_conditions else "Scan"
+        self.key_condition_expression = " AND ".join(
+            self.__render(position, attr, op, placeholder) for position, attr, op, placeholder in key_conditions
+        ) or None
+        self.filter_expression = self.__render_filter(filters)
+
+        self.projection_expression = None
+        self._projection_names = {}
+        if attributes:
+            self._projection_names = {f"#p{i}": attr for i, attr in enumerate(attributes)}
+            self.projection_expression = ", ".join(self._projection_names)
+
+    @property
+    def index(self) -> Optional[str]:
+        return self._index
+
+    @property
+    def expression_attribute_names(self) -> Dict[str, str]:
+        return {**self._names, **self._projection_names}
+
+    def get(self, all=False, paginate=False, limit: int = None, offset: dict = None, as_dicts=False, **values):
+        try:
+            response = self.__execute(values, paginate, limit, offset)
+        except DynoLayerException as e:
+            if self._model.raise_on_error:
+                raise
+            self._model._set_class_last_error(e)
+            return [] if as_dicts else Collection([])
+
+        items = response["Items"]
+        if not as_dicts:
+            items = [self._model._hydrate(row) for row in items]
+
+        if not all:
+            return items[0] if items else None
+
+        if as_dicts:
+            return items
+        return Collection(items, last_evaluated_key=response.get("LastEvaluatedKey"))
+
+    def fetch(self, all=False, paginate=False, limit: int = None, offset: dict = None, as_dicts=False, **values):
+        return self.get(all, paginate, limit, offset, as_dicts, **values)
+
+    def count(self, **values) -> int:
+        try:
+            params = self.__params(values)
+            budget = self.__budget("count")
+        except DynoLayerException as e:
+            if self._model.raise_on_error:
+                raise
+            self._model._set_class_last_error(e)
+            return 0
+
+        params["Select"] = "COUNT"
+        return sum(response.get("Count", 0) for response in self.__pages(params, True, budget))
+
+    def __execute(self, values, paginate, limit, offset):
+        params = self.__params(values)
+        budget = self.__budget("get")
+        if self.projection_expression:
+            params["ProjectionExpression"] = self.projection_expression
+            params["ExpressionAttributeNames"] = self.expression_attribute_names
+        if limit:
+            params["Limit"] = limit
+        if offset:
+            params["ExclusiveStartKey"] = offset
+
+        items = []
+        last_key = None
+        for response in self.__pages(params, paginate, budget):
+            items.extend(response["Items"])
+            last_key = response.get("LastEvaluatedKey")
+
+        return {"Items": items, "LastEvaluatedKey": last_key}
+
+    def __budget(self, operation: str):
+        # A prepared Scan is an implicit scan, so it answers to scan_policy and the scan budgets
+        return self._instance._scan_budget(operation) if self.operation == "Scan" else None
+
+    def __pages(self, params: Dict[str, Any], paginate: bool, budget):
+        table = self._instance._table
+        while True:
+            if self.operation == "Query":
+                response = table.query(**params)
+            else:
+                response = self._instance._scan_page(table, params, params.get("Limit"), budget)
+                if response is None:
+                    return
+            yield response
+            if not paginate or "LastEvaluatedKey" not in response:
+                return
+            params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def __params(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        attribute_values = {}
+        in_slots = {}
+
+        for position, op, placeholder in self._bindings:
+            if op == "between":
+                start, end = placeholder
+                attribute_values[f":v{position}a"] = _bind_placeholder(start, values)
+                attribute_values[f":v{position}b"] = _bind_placeholder(end, values)
+            elif op == "in":
+                value = _bind_placeholder(placeholder, values)
+                if not isinstance(value, list):
+                    raise InvalidArgumentException(
+                        f"Operator 'in' requires a list value for ':{placeholder}'.",
+                        method="prepare",
+                        expected="list",
+                        received=type(value).__name__,
+                    )
+                names = []
+                for i, item in enumerate(value):
+                    attribute_values[f":v{position}_{i}"] = item
+                    names.append(f":v{position}_{i}")
+                in_slots[f"in{position}"] = ", ".join(names)
+            else:
+                attribute_values[f":v{position}"] = _bind_placeholder(placeholder, values)
+
+        params = {}
+        if self.key_condition_expression:
+            params["KeyConditionExpression"] = self.key_condition_expression
+        if self.filter_expression:
+            params["FilterExpression"] = self.filter_expression.format(**in_slots) if in_slots \
+                else self.filter_expression
+        if self._index:
+            params["IndexName"] = self._index
+        if self._names:
+            params["ExpressionAttributeNames"] = dict(self._names)
+        if attribute_values:
+            params["ExpressionAttributeValues"] = attribute_values
+
+        return params
+
+    def __name(self, attr: str) -> str:
+        for name, value in self._names.items():
+            if value == attr:
+                return name
+        name = f"#n{len(self._names)}"
+        self._names[name] = attr
+        return name
+
+    def __render(self, position: int, attr: str, op: str, placeholder: Any) -> str:
+        name = self.__name(attr)
+        if op != "exists" and op != "not_exists":
+            self._bindings.append((position, op, placeholder))
+
+        if op in _COMPARISON_OPERATORS:
+            return f"{name} {op} :v{position}"
+        if op in _FUNCTION_OPERATORS:
+            return f"{_FUNCTION_OPERATORS[op]}({name}, :v{position})"
+        if op == "between":
+            return f"{name} BETWEEN :v{position}a AND :v{position}b"
+        if op == "in":
+            return f"{name} IN ({{in{position}}})"
+        if op == "exists":
+            return f"attribute_exists({name})"
+        return f"attribute_not_exists({name})"
+
+    def __render_filter(self, filters) -> Optional[str]:
+        # Same left-to-right folding as transform_params_in_filter
+        expression = None
+        for position, connector, attr, op, placeholder in filters:
+            fragment = self.__render(position, attr, op, placeholder)
+            if expression is None:
+                expression = f"(NOT ({fragment}))" if connector in ("AND_NOT", "OR_NOT") else f"({fragment})"
+            elif connector == "AND":
+                expression = f"{expression} AND ({fragment})"
+            elif connector == "OR":
+                expression = f"({expression} OR ({fragment}))"
+            elif connector == "AND_NOT":
+                expression = f"{expression} AND (NOT ({fragment}))"
+            else:
+                expression = f"({expression} OR (NOT ({fragment})))"
+
+        return expression
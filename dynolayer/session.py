@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+_current_session: ContextVar[Optional["Session"]] = ContextVar("dynolayer_session", default=None)
+
+
+def current_session() -> Optional[Session]:
+    return _current_session.get()
+
+
+class Session:
+    # Identity map for one unit of work: each (entity, primary key) is loaded at most once
+    def __init__(self):
+        self._identities = {}
+        # entity -> key attribute names seen on add(), so discard() can build the exact identity
+        self._key_schemas = {}
+        self._parent = None
+        self._token = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def identity(entity: str, key: Dict) -> tuple:
+        return entity, frozenset(key.items())
+
+    def get(self, entity: str, key: Dict, model_cls=None):
+        instance = self._identities.get(self.identity(entity, key))
+        if instance is None or (model_cls is not None and not isinstance(instance, model_cls)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return instance
+
+    def add(self, entity: str, key: Dict, instance) -> None:
+        self._identities[self.identity(entity, key)] = instance
+        self._key_schemas.setdefault(entity, set()).add(tuple(sorted(key)))
+
+    def discard(self, entity: str, key_or_item: Dict, keep=None) -> None:
+        # Writes made inside a nested session also evict the identities loaded by the outer ones
+        session = self
+        while session is not None:
+            session._discard(entity, key_or_item, keep)
+            session = session._parent
+
+    def _discard(self, entity: str, key_or_item: Dict, keep=None) -> None:
+        # key_or_item may be a full item (e.g. a Put in transact_write): the key attributes recorded by add()
+        # pick the exact identity out of it. Every identity went through add(), so an entity without a
+        # recorded schema has nothing to evict.
+        for schema in self._key_schemas.get(entity, ()):
+            if not all(attr in key_or_item for attr in schema):
+                continue
+            identity = self.identity(entity, {attr: key_or_item[attr] for attr in schema})
+            instance = self._identities.get(identity)
+            if instance is not None and instance is not keep:
+                del self._identities[identity]
+
+    def __len__(self):
+        return len(self._identities)
+
+    def __enter__(self) -> Session:
+        self._parent = _current_session.get()
+        self._token = _current_session.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_session.reset(self._token)
+        self._token = None
+        self._parent = None
+        self._identities.clear()
+        self._key_schemas.clear()
+        return False
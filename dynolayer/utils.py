@@ -3,11 +3,18 @@ from typing import Any, Dict, Tuple, Literal, Union, List
 
 from boto3.dynamodb.conditions import Attr, Key, ConditionBase
 
+from dynolayer.cache import LRUCache
+from dynolayer.config import DynoConfig
+
 
 # Collection class for model instances
 class Collection:
-    def __init__(self, items):
+    def __init__(self, items, last_evaluated_key=None):
         self._items = items
+        self._last_evaluated_key = last_evaluated_key
+
+    def last_evaluated_key(self):
+        return self._last_evaluated_key
 
     def first(self):
         return self._items[0] if self._items else None
@@ -16,10 +23,15 @@ class Collection:
         return len(self._items)
 
     def pluck(self, key):
-        return [item.data().get(key) for item in self._items]
+        return [self._row(item).get(key) for item in self._items]
 
     def to_list(self):
-        return [item.data() for item in self._items]
+        return [self._row(item) for item in self._items]
+
+    @staticmethod
+    def _row(item):
+        # Raw-mode collections hold the item dicts themselves
+        return item if isinstance(item, dict) else item.data()
 
     def __iter__(self):
         return iter(self._items)
@@ -53,30 +65,38 @@ _CONNECTOR_MAP = {
     'OR NOT': 'OR_NOT',
 }
 
+# Operators DynamoDB accepts in a KeyConditionExpression
+_KEY_OPERATORS = {"=", "<", "<=", ">", ">=", "begins_with", "between"}
 
-def parse_expression(expression: str, **values) -> List[Tuple[str, str, str, Any]]:
+
+def _expression_cache_size():
+    return int(DynoConfig.get("expression_cache_size"))
+
+
+_expression_cache = LRUCache(max_size=_expression_cache_size)
+
+
+def compile_expression(expression: str) -> Tuple[Tuple[str, str, str, Any], ...]:
+    # Only the parsed structure is cached; values are bound per call by bind_expression
+    template = _expression_cache.get(expression)
+    if template is None:
+        template = _compile_expression(expression)
+        _expression_cache.set(expression, template)
+    return template
+
+
+def expression_cache_stats() -> Dict[str, Any]:
+    return _expression_cache.stats()
+
+
+def _compile_expression(expression: str) -> Tuple[Tuple[str, str, str, Any], ...]:
     from dynolayer.exceptions import InvalidArgumentException
 
     protected = []
     expr = expression
 
     for m in _BETWEEN_RE.finditer(expr):
-        attr, p1, p2 = m.group(1), m.group(2), m.group(3)
-        if p1 not in values:
-            raise InvalidArgumentException(
-                f"Missing value for placeholder ':{p1}'.",
-                method="find",
-                expected=f"kwarg '{p1}'",
-                received="not provided",
-            )
-        if p2 not in values:
-            raise InvalidArgumentException(
-                f"Missing value for placeholder ':{p2}'.",
-                method="find",
-                expected=f"kwarg '{p2}'",
-                received="not provided",
-            )
-        protected.append((attr, 'between', [values[p1], values[p2]]))
+        protected.append((m.group(1), 'between', (m.group(2), m.group(3))))
         expr = expr.replace(m.group(0), _BETWEEN_PLACEHOLDER, 1)
 
     parts = _CONNECTOR_RE.split(expr.strip())
@@ -106,34 +126,14 @@ def parse_expression(expression: str, **values) -> List[Tuple[str, str, str, Any
 
         unary_match = _UNARY_RE.match(fragment)
         if unary_match:
-            attr = unary_match.group(1)
-            op = unary_match.group(2)
-            results.append((connector, attr, op, None))
+            results.append((connector, unary_match.group(1), unary_match.group(2), None))
             connector = 'AND'
             i += 1
             continue
 
         cond_match = _CONDITION_RE.match(fragment)
         if cond_match:
-            attr = cond_match.group(1)
-            op = cond_match.group(2)
-            placeholder = cond_match.group(3)
-            if placeholder not in values:
-                raise InvalidArgumentException(
-                    f"Missing value for placeholder ':{placeholder}'.",
-                    method="find",
-                    expected=f"kwarg '{placeholder}'",
-                    received="not provided",
-                )
-            val = values[placeholder]
-            if op == 'in' and not isinstance(val, list):
-                raise InvalidArgumentException(
-                    f"Operator 'in' requires a list value for ':{placeholder}'.",
-                    method="find",
-                    expected="list",
-                    received=type(val).__name__,
-                )
-            results.append((connector, attr, op, val))
+            results.append((connector, cond_match.group(1), cond_match.group(2), cond_match.group(3)))
             connector = 'AND'
             i += 1
             continue
@@ -151,9 +151,50 @@ def parse_expression(expression: str, **values) -> List[Tuple[str, str, str, Any
             method="find",
         )
 
+    return tuple(results)
+
+
+def _bind_placeholder(placeholder: str, values: Dict[str, Any]) -> Any:
+    from dynolayer.exceptions import InvalidArgumentException
+
+    if placeholder not in values:
+        raise InvalidArgumentException(
+            f"Missing value for placeholder ':{placeholder}'.",
+            method="find",
+            expected=f"kwarg '{placeholder}'",
+            received="not provided",
+        )
+    return values[placeholder]
+
+
+def bind_expression(template, values: Dict[str, Any]) -> List[Tuple[str, str, str, Any]]:
+    from dynolayer.exceptions import InvalidArgumentException
+
+    results: List[Tuple[str, str, str, Any]] = []
+    for connector, attr, op, placeholder in template:
+        if op == 'between':
+            start, end = placeholder
+            val = [_bind_placeholder(start, values), _bind_placeholder(end, values)]
+        elif placeholder is None:
+            val = None
+        else:
+            val = _bind_placeholder(placeholder, values)
+            if op == 'in' and not isinstance(val, list):
+                raise InvalidArgumentException(
+                    f"Operator 'in' requires a list value for ':{placeholder}'.",
+                    method="find",
+                    expected="list",
+                    received=type(val).__name__,
+                )
+        results.append((connector, attr, op, val))
+
     return results
 
 
+def parse_expression(expression: str, **values) -> List[Tuple[str, str, str, Any]]:
+    return bind_expression(compile_expression(expression), values)
+
+
 def extract_params(*args):
     from dynolayer.exceptions import InvalidArgumentException
 
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import boto3
 import pytest
 from faker import Faker
@@ -107,3 +110,90 @@ def save_records(faker, aws_mock):
             "updated_at": int((datetime.now(timezone.utc) - timedelta(days=3)).timestamp()),
         }
         dynamodb.Table(table_name).put_item(Item=mock_item)
+
+
+@pytest.fixture
+def scan_pages(monkeypatch):
+    calls = []
+    original = CrudMixin._scan_page
+
+    def counting_scan_page(table, scan_attributes, limit=None, budget=None):
+        calls.append(scan_attributes.get("Limit"))
+        return original(table, scan_attributes, limit, budget)
+
+    monkeypatch.setattr(CrudMixin, "_scan_page", staticmethod(counting_scan_page))
+    return calls
+
+
+@pytest.fixture
+def slow_pages(request, monkeypatch):
+    # Records the thread that fetched each scan page; the delay per page (seconds) is set through
+    # indirect parametrisation and defaults to 50ms
+    delay = getattr(request, "param", 0.05)
+    calls = []
+    original = CrudMixin._scan_page
+
+    def slow_scan_page(table, scan_attributes, limit=None, budget=None):
+        calls.append(threading.current_thread().name)
+        if delay:
+            time.sleep(delay)
+        return original(table, scan_attributes, limit, budget)
+
+    monkeypatch.setattr(CrudMixin, "_scan_page", staticmethod(slow_scan_page))
+    return calls
+
+
+class TableSpy:
+    # Stands in for every model's table: records (operation, kwargs) and runs an optional hook per operation
+    OPERATIONS = ("get_item", "query", "scan", "put_item", "update_item", "delete_item")
+
+    def __init__(self):
+        self.calls = []
+        self.hooks = {}
+        self._lock = threading.Lock()
+
+    def of(self, operation):
+        with self._lock:
+            return [kwargs for name, kwargs in self.calls if name == operation]
+
+    def wrap(self, table):
+        spy = self
+
+        class SpyTable:
+            def __getattr__(self, item):
+                attribute = getattr(table, item)
+                if item not in spy.OPERATIONS:
+                    return attribute
+
+                def call(**kwargs):
+                    with spy._lock:
+                        spy.calls.append((item, kwargs))
+                    hook = spy.hooks.get(item)
+                    if hook is not None:
+                        hook(kwargs)
+                    return attribute(**kwargs)
+
+                return call
+
+        return SpyTable()
+
+
+@pytest.fixture
+def table_spy(monkeypatch):
+    spy = TableSpy()
+    original = CrudMixin._table
+    monkeypatch.setattr(CrudMixin, "_table", property(lambda self: spy.wrap(original.fget(self))))
+    return spy
+
+
+@pytest.fixture
+def batch_gets(monkeypatch):
+    calls = []
+    original = CrudMixin._batch_get
+
+    def recording_batch_get(self, keys, workers=None):
+        calls.append(list(keys))
+        return original(self, keys, workers=workers)
+
+    monkeypatch.setattr(CrudMixin, "_batch_get", recording_batch_get)
+    return calls
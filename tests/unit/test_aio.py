@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from dynolayer.aio import AsyncDynoLayer, AsyncQuery, shutdown_executor
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import QueryException, RecordNotFoundException
+from dynolayer.utils import Collection
+
+
+@pytest.fixture
+def async_user(get_user):
+    yield AsyncDynoLayer(get_user)
+    shutdown_executor()
+
+
+@pytest.fixture
+def active_calls(table_spy):
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def track(kwargs):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+
+    table_spy.hooks["get_item"] = track
+    return active
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncModel:
+    def test_get_item(self, async_user, create_table, aws_mock, save_records):
+        user = run(async_user.get_item({"id": 1}))
+
+        assert user.id == 1
+
+    def test_find_or_fail_raises(self, async_user, create_table, aws_mock, save_records):
+        with pytest.raises(RecordNotFoundException):
+            run(async_user.find_or_fail({"id": 999}))
+
+    def test_create_save_destroy(self, async_user, create_table, aws_mock):
+        async def scenario():
+            user = await async_user.create({"id": 50, "first_name": "Ana", "email": "a@example.com", "role": "admin"})
+            user.stars = 4
+            await async_user.save(user)
+            stored = await async_user.get_item({"id": 50})
+            await async_user.destroy(stored)
+            return stored, await async_user.get_item({"id": 50})
+
+        stored, deleted = run(scenario())
+
+        assert stored.stars == 4
+        assert deleted is None
+
+    def test_batch_operations(self, async_user, create_table, aws_mock):
+        async def scenario():
+            await async_user.batch_create([
+                {"id": i, "first_name": f"U{i}", "email": f"u{i}@example.com", "role": "common"} for i in range(1, 31)
+            ])
+            found = await async_user.batch_find([{"id": i} for i in range(1, 31)])
+            await async_user.batch_destroy([{"id": i} for i in range(1, 11)])
+            return found, await async_user.all().count()
+
+        found, remaining = run(scenario())
+
+        assert isinstance(found, Collection)
+        assert found.count() == 30
+        assert remaining == 20
+
+    def test_transactions(self, async_user, get_user, create_table, aws_mock, save_records):
+        async def scenario():
+            await async_user.transact_write([get_user.prepare_update({"id": 1}, {"stars": 9})])
+            return await async_user.transact_get([(get_user, {"id": 1}), (get_user, {"id": 2})])
+
+        first, second = run(scenario())
+
+        assert first.stars == 9
+        assert second.id == 2
+
+    def test_sync_helpers_pass_through(self, async_user, get_user):
+        assert async_user.fail() is None
+        assert async_user.model is get_user
+
+
+class TestAsyncQuery:
+    def test_builder_chain_and_get(self, async_user, create_table, aws_mock, save_records):
+        query = async_user.where("role", "admin").index("role-index").attributes_to_get(["id", "stars"])
+
+        assert isinstance(query, AsyncQuery)
+        result = run(query.get(all=True))
+
+        assert result.count() == run(async_user.where("role", "admin").index("role-index").count())
+        assert all(user.first_name is None for user in result)
+
+    def test_count_exists_first(self, async_user, create_table, aws_mock, save_records):
+        async def scenario():
+            return (
+                await async_user.all().count(),
+                await async_user.where("id", 3).exists(),
+                await async_user.where("id", 3).first(),
+            )
+
+        total, exists, first = run(scenario())
+
+        assert total == 20
+        assert exists is True
+        assert first.id == 3
+
+    def test_instance_only_builders(self, async_user, create_table, aws_mock, save_records):
+        result = run(async_user.query().where_in("id", [1, 2, 3]).get(all=True))
+
+        assert sorted(result.pluck("id")) == [1, 2, 3]
+
+    def test_stream(self, async_user, create_table, aws_mock, save_records):
+        async def scenario():
+            return [user.id async for user in async_user.all().limit(6).stream()]
+
+        assert sorted(run(scenario())) == list(range(1, 21))
+
+    def test_stream_pages(self, async_user, create_table, aws_mock, save_records):
+        async def scenario():
+            return [page.count() async for page in async_user.all().limit(5).stream_pages(chunk_size=8)]
+
+        assert run(scenario()) == [8, 8, 4]
+
+    def test_abandoned_stream_is_closed(self, async_user, create_table, aws_mock, save_records):
+        async def scenario():
+            stream = async_user.all().limit(2).stream(as_dicts=True)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+
+        assert "id" in run(scenario())
+
+    def test_errors_are_raised_in_the_caller(self, async_user, create_table, aws_mock):
+        with pytest.raises(QueryException):
+            run(async_user.query().get())
+
+
+class TestAsyncConcurrency:
+    def test_gather_runs_calls_concurrently(self, async_user, create_table, aws_mock, save_records, active_calls):
+        run(async_user.get_item({"id": 1}))
+
+        async def scenario():
+            return await asyncio.gather(*(async_user.get_item({"id": i}) for i in range(1, 9)))
+
+        users = run(scenario())
+
+        assert [user.id for user in users] == list(range(1, 9))
+        assert active_calls["peak"] > 1
+
+    def test_pool_size_bounds_concurrency(self, async_user, create_table, aws_mock, save_records, active_calls):
+        DynoLayer.configure(async_max_workers=2)
+
+        async def scenario():
+            await asyncio.gather(*(async_user.get_item({"id": i}) for i in range(1, 9)))
+
+        run(scenario())
+
+        assert active_calls["peak"] == 2
+
+    def test_session_follows_the_task(self, async_user, create_table, aws_mock, save_records):
+        async def scenario():
+            with DynoLayer.session() as session:
+                first = await async_user.get_item({"id": 1})
+                second = await async_user.get_item({"id": 1})
+            return first, second, session
+
+        first, second, session = run(scenario())
+
+        assert first is second
+        assert session.hits == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
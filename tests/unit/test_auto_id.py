@@ -1,7 +1,9 @@
 import re
+import threading
 
 import boto3
 import pytest
+from dynolayer.crud_mixin import CrudMixin
 from dynolayer.dynolayer import DynoLayer
 from dynolayer.exceptions import InvalidArgumentException, AutoIdException, ValidationException
 
@@ -104,6 +106,29 @@ def get_order_numeric():
     return Order
 
 
+@pytest.fixture
+def get_order_numeric_block():
+    class Order(DynoLayer):
+        raise_on_error = True
+
+        def __init__(self):
+            super().__init__(
+                entity="orders",
+                required_fields=["total"],
+                fillable=["id", "total", "status"],
+                timestamps=False,
+                auto_id="numeric",
+                auto_id_block_size=10,
+                partition_key="id",
+            )
+    return Order
+
+
+def get_sequence_value(entity="orders"):
+    dynamodb = boto3.resource("dynamodb", region_name="sa-east-1")
+    return int(dynamodb.Table("dynolayer_sequences").get_item(Key={"entity": entity})["Item"]["current_value"])
+
+
 # --- UUID4 Tests ---
 
 class TestAutoIdUuid4:
@@ -263,6 +288,106 @@ class TestAutoIdNumeric:
         assert orders[0].id == 1
 
 
+class TestAutoIdNumericBlocks:
+    def test_create_reserves_one_block(self, get_order_numeric_block, create_table_num_pk, create_sequences_table, aws_mock):
+        orders = [get_order_numeric_block.create({"total": i, "status": "pending"}) for i in range(3)]
+
+        assert [order.id for order in orders] == [1, 2, 3]
+        assert get_sequence_value() == 10
+
+    def test_new_block_reserved_when_exhausted(self, get_order_numeric_block, create_table_num_pk, create_sequences_table, aws_mock):
+        orders = [get_order_numeric_block.create({"total": i, "status": "pending"}) for i in range(12)]
+
+        assert [order.id for order in orders] == list(range(1, 13))
+        assert get_sequence_value() == 20
+
+    def test_batch_create_draws_from_block(self, get_order_numeric_block, create_table_num_pk, create_sequences_table, aws_mock):
+        first = get_order_numeric_block.create({"total": 1, "status": "pending"})
+        orders = get_order_numeric_block.batch_create([{"total": i, "status": "pending"} for i in range(15)])
+
+        assert first.id == 1
+        assert [order.id for order in orders] == list(range(2, 17))
+        assert get_sequence_value() == 20
+
+    def test_block_size_from_config(self, get_order_numeric, create_table_num_pk, create_sequences_table, aws_mock):
+        DynoLayer.configure(auto_id_block_size=5)
+
+        orders = [get_order_numeric.create({"total": i, "status": "pending"}) for i in range(2)]
+
+        assert [order.id for order in orders] == [1, 2]
+        assert get_sequence_value() == 5
+
+    def test_blocks_are_shared_between_instances(self, get_order_numeric_block, create_table_num_pk, create_sequences_table, aws_mock):
+        order = get_order_numeric_block()
+        order.total = 1
+        order.save()
+        created = get_order_numeric_block.create({"total": 2, "status": "pending"})
+
+        assert (order.id, created.id) == (1, 2)
+        assert get_sequence_value() == 10
+
+    def test_unit_blocks_skip_the_block_cache(self, get_order_numeric, create_table_num_pk, create_sequences_table, aws_mock):
+        orders = [get_order_numeric.create({"total": i, "status": "pending"}) for i in range(3)]
+
+        assert [order.id for order in orders] == [1, 2, 3]
+        assert get_sequence_value() == 3
+        assert CrudMixin._id_blocks == {}
+        assert CrudMixin._id_block_locks == {}
+
+    def test_sequences_do_not_wait_for_each_other(self, get_order_numeric_block, create_table_num_pk, create_sequences_table, aws_mock, monkeypatch):
+        class Invoice(DynoLayer):
+            raise_on_error = True
+
+            def __init__(self):
+                super().__init__(
+                    entity="invoices",
+                    fillable=["id", "total"],
+                    timestamps=False,
+                    auto_id="numeric",
+                    auto_id_block_size=10,
+                    partition_key="id",
+                )
+
+        boto3.resource("dynamodb", region_name="sa-east-1").create_table(
+            TableName="invoices",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "N"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        reserving, release = threading.Event(), threading.Event()
+        original = CrudMixin._thread_table
+
+        class SlowSequences:
+            def __init__(self, table):
+                self.table = table
+
+            def update_item(self, **kwargs):
+                reserving.set()
+                release.wait(timeout=10)
+                return self.table.update_item(**kwargs)
+
+        def thread_table(self, entity=None):
+            table = original(self, entity)
+            return SlowSequences(table) if self._entity == "invoices" and entity else table
+
+        monkeypatch.setattr(CrudMixin, "_thread_table", thread_table)
+        invoice = threading.Thread(target=Invoice.create, args=({"total": 1},))
+        invoice.start()
+        assert reserving.wait(timeout=5)
+
+        # The invoice reservation is still on the wire; orders draw from their own sequence meanwhile
+        orders = []
+        order = threading.Thread(target=lambda: orders.append(get_order_numeric_block.create({"total": 1})))
+        order.start()
+        order.join(timeout=5)
+        finished = not order.is_alive()
+        release.set()
+        invoice.join(timeout=5)
+
+        assert finished
+        assert orders[0].id == 1
+
+
 # --- Validation Tests ---
 
 class TestAutoIdValidation:
@@ -280,6 +405,20 @@ class TestAutoIdValidation:
                     super().__init__(entity="t", partition_key="id", auto_id="numeric", auto_id_length=16)
             Bad()
 
+    def test_block_size_requires_numeric(self):
+        with pytest.raises(InvalidArgumentException, match="only supported with 'numeric'"):
+            class Bad(DynoLayer):
+                def __init__(self):
+                    super().__init__(entity="t", partition_key="id", auto_id="uuid4", auto_id_block_size=10)
+            Bad()
+
+    def test_block_size_must_be_positive(self):
+        with pytest.raises(InvalidArgumentException, match="positive integer"):
+            class Bad(DynoLayer):
+                def __init__(self):
+                    super().__init__(entity="t", partition_key="id", auto_id="numeric", auto_id_block_size=0)
+            Bad()
+
     def test_length_below_minimum_raises(self):
         with pytest.raises(InvalidArgumentException, match="between 16 and 32"):
             class Bad(DynoLayer):
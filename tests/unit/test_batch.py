@@ -69,6 +69,98 @@ class TestBatchFind:
         assert result.count() == 0
 
 
+class TestBatchFindConcurrency:
+    def test_batch_find_many_chunks_concurrently(self, get_user, create_table, aws_mock):
+        get_user.batch_create([
+            {"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common"}
+            for i in range(1, 251)
+        ])
+
+        result = get_user.batch_find([{"id": i} for i in range(1, 251)], workers=3)
+        stats = get_user.last_batch_stats()
+
+        assert result.count() == 250
+        assert sorted(result.pluck("id")) == list(range(1, 251))
+        assert [chunk["keys"] for chunk in stats["chunks"]] == [100, 100, 50]
+        assert stats["retries"] == 0
+        assert all(chunk["latency_ms"] >= 0 for chunk in stats["chunks"])
+
+    def test_chunks_reuse_pool_threads(self, get_user, create_table, aws_mock, monkeypatch):
+        from dynolayer.config import DynoConfig
+        from dynolayer.crud_mixin import CrudMixin
+
+        DynoConfig.set(engine="resource")
+        items = [{"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common"}
+                 for i in range(1, 301)]
+        keys = [{"id": i} for i in range(1, 301)]
+        get_user.batch_create(items, pipeline=True, workers=3)
+        get_user.batch_find(keys, workers=3)
+        session = CrudMixin._get_session()
+        created = []
+        original = session.resource
+        monkeypatch.setattr(session, "resource", lambda *args, **kwargs: created.append(1) or original(*args, **kwargs))
+
+        for _ in range(3):
+            get_user.batch_create(items, pipeline=True, workers=3)
+            assert get_user.batch_find(keys, workers=3).count() == 300
+
+        assert created == []
+
+    def test_batch_find_retries_unprocessed_keys_with_backoff(self, get_user, monkeypatch):
+        from dynolayer.crud_mixin import CrudMixin
+
+        responses = [
+            {"Responses": {"users": [{"id": 1}]},
+             "UnprocessedKeys": {"users": {"Keys": [{"id": 2}]}}},
+            {"Responses": {"users": []},
+             "UnprocessedKeys": {"users": {"Keys": [{"id": 2}]}}},
+            {"Responses": {"users": [{"id": 2}]}, "UnprocessedKeys": {}},
+        ]
+        requests = []
+        delays = []
+
+        class FakeResource:
+            def batch_get_item(self, RequestItems):
+                requests.append(RequestItems)
+                return responses.pop(0)
+
+        monkeypatch.setattr(CrudMixin, "_get_thread_dynamodb", classmethod(lambda cls: FakeResource()))
+        monkeypatch.setattr("dynolayer.crud_mixin.time.sleep", delays.append)
+
+        result = get_user.batch_find([{"id": 1}, {"id": 2}])
+
+        assert sorted(result.pluck("id")) == [1, 2]
+        assert requests[1] == {"users": {"Keys": [{"id": 2}]}}
+        assert len(delays) == 2
+        assert get_user.last_batch_stats()["retries"] == 2
+        assert get_user.last_batch_stats()["chunks"][0]["retries"] == 2
+
+    def test_batch_find_raises_when_retries_are_exhausted(self, get_user, monkeypatch):
+        from dynolayer.config import DynoConfig
+        from dynolayer.crud_mixin import CrudMixin
+        from dynolayer.exceptions import BatchOperationException
+
+        class FakeResource:
+            def batch_get_item(self, RequestItems):
+                return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+        DynoConfig.set(batch_max_retries=2)
+        monkeypatch.setattr(CrudMixin, "_get_thread_dynamodb", classmethod(lambda cls: FakeResource()))
+        monkeypatch.setattr("dynolayer.crud_mixin.time.sleep", lambda delay: None)
+
+        with pytest.raises(BatchOperationException, match="unprocessed keys after 2 retries"):
+            get_user.batch_find([{"id": 1}])
+
+    def test_backoff_delay_is_capped(self):
+        from dynolayer.config import DynoConfig
+        from dynolayer.crud_mixin import CrudMixin
+
+        DynoConfig.set(batch_backoff_base=0.1, batch_backoff_max=0.5)
+
+        assert 0 <= CrudMixin._backoff_delay(0) <= 0.1
+        assert 0 <= CrudMixin._backoff_delay(10) <= 0.5
+
+
 class TestBatchDestroy:
     def test_batch_destroy_deletes_records(self, get_user, create_table, aws_mock):
         get_user.batch_create([
@@ -82,3 +174,103 @@ class TestBatchDestroy:
         remaining = get_user.all().get(all=True, paginate=True)
         assert remaining.count() == 1
         assert remaining.first().id == 3
+
+
+class TestBatchWritePipeline:
+    def test_batch_create_pipeline_writes_all_items(self, get_user, create_table, aws_mock):
+        users = get_user.batch_create([
+            {"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common"}
+            for i in range(1, 121)
+        ], pipeline=True, workers=3)
+        stats = get_user.last_batch_stats()
+
+        assert len(users) == 120
+        assert stats["written"] == 120
+        assert stats["failed"] == 0
+        assert stats["retried"] == 0
+        assert stats["elapsed_ms"] >= 0
+        assert get_user.all().count() == 120
+
+    def test_batch_destroy_pipeline(self, get_user, create_table, aws_mock):
+        get_user.batch_create([
+            {"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common"}
+            for i in range(1, 61)
+        ])
+
+        assert get_user.batch_destroy([{"id": i} for i in range(1, 51)], pipeline=True) is True
+        assert get_user.last_batch_stats()["written"] == 50
+        assert get_user.all().count() == 10
+
+    def test_single_worker_runs_in_the_calling_thread(self, get_user, monkeypatch):
+        import threading
+
+        from dynolayer.crud_mixin import CrudMixin
+
+        threads = set()
+
+        class FakeResource:
+            def batch_write_item(self, RequestItems):
+                threads.add(threading.current_thread())
+                return {}
+
+        monkeypatch.setattr(CrudMixin, "_get_thread_dynamodb", classmethod(lambda cls: FakeResource()))
+
+        assert get_user.batch_destroy([{"id": i} for i in range(1, 61)], pipeline=True, workers=1) is True
+        assert threads == {threading.current_thread()}
+
+    def test_pipeline_create_raises_when_items_never_drain(self, get_user, get_silent_user, monkeypatch):
+        from dynolayer.config import DynoConfig
+        from dynolayer.crud_mixin import CrudMixin
+        from dynolayer.exceptions import BatchOperationException
+
+        class FakeResource:
+            def batch_write_item(self, RequestItems):
+                requests = RequestItems["users"]
+                stuck = [r for r in requests if r["PutRequest"]["Item"]["id"] == 2]
+                return {"UnprocessedItems": {"users": stuck} if stuck else {}}
+
+        DynoConfig.set(batch_max_retries=2)
+        monkeypatch.setattr(CrudMixin, "_get_thread_dynamodb", classmethod(lambda cls: FakeResource()))
+        monkeypatch.setattr("dynolayer.crud_mixin.time.sleep", lambda delay: None)
+        items = [{"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common"}
+                 for i in range(1, 4)]
+
+        with pytest.raises(BatchOperationException, match="unprocessed items") as error:
+            get_user.batch_create(items, pipeline=True)
+
+        stats = get_user.last_batch_stats()
+        assert error.value.details == {"operation": "batch_write", "unprocessed": 1, "retries": 2}
+        assert stats["written"] == 2
+        assert [request["PutRequest"]["Item"]["id"] for request in stats["failed_items"]] == [2]
+
+        assert get_silent_user.batch_create(items, pipeline=True) == []
+        assert isinstance(get_silent_user.fail(), BatchOperationException)
+
+    def test_pipeline_destroy_raises_when_keys_never_drain(self, get_user, get_silent_user, monkeypatch):
+        from dynolayer.config import DynoConfig
+        from dynolayer.crud_mixin import CrudMixin
+        from dynolayer.exceptions import BatchOperationException
+
+        class FakeResource:
+            def batch_write_item(self, RequestItems):
+                requests = RequestItems["users"]
+                stuck = [r for r in requests if r["DeleteRequest"]["Key"]["id"] == 1]
+                return {"UnprocessedItems": {"users": stuck} if stuck else {}}
+
+        DynoConfig.set(batch_max_retries=3)
+        monkeypatch.setattr(CrudMixin, "_get_thread_dynamodb", classmethod(lambda cls: FakeResource()))
+        monkeypatch.setattr("dynolayer.crud_mixin.time.sleep", lambda delay: None)
+
+        with pytest.raises(BatchOperationException, match="unprocessed items") as error:
+            get_user.batch_destroy([{"id": 1}, {"id": 2}, {"id": 3}], pipeline=True)
+
+        stats = get_user.last_batch_stats()
+        assert error.value.details == {"operation": "batch_write", "unprocessed": 1, "retries": 3}
+        assert stats["written"] == 2
+        assert stats["retried"] == 3
+        assert stats["failed"] == 1
+        assert stats["failed_items"] == [{"DeleteRequest": {"Key": {"id": 1}}}]
+
+        assert get_silent_user.batch_destroy([{"id": 1}, {"id": 2}], pipeline=True) is False
+        assert isinstance(get_silent_user.fail(), BatchOperationException)
+        assert get_silent_user.last_batch_stats()["failed"] == 1
@@ -0,0 +1,230 @@
+import json
+from decimal import Decimal
+
+import boto3
+import pytest
+
+from dynolayer.checkpoint import (
+    CheckpointStore, FileCheckpointStore, ModelCheckpointStore, serialize_position, deserialize_position,
+)
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import InvalidArgumentException
+
+
+class MemoryStore(CheckpointStore):
+    def __init__(self, state=None):
+        self.state = state
+        self.saves = []
+        self.cleared = False
+
+    def load(self):
+        return self.state
+
+    def save(self, state):
+        self.state = state
+        self.saves.append(state)
+
+    def clear(self):
+        self.state = None
+        self.cleared = True
+
+
+@pytest.fixture
+def create_checkpoint_table(aws_mock):
+    dynamodb = boto3.resource("dynamodb", region_name="sa-east-1")
+    dynamodb.create_table(
+        TableName="checkpoints",
+        KeySchema=[{"AttributeName": "name", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "name", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+@pytest.fixture
+def get_checkpoint_model():
+    class Checkpoint(DynoLayer):
+        raise_on_error = True
+
+        def __init__(self) -> None:
+            super().__init__(entity="checkpoints", partition_key="name", fillable=["name", "checkpoint"],
+                             timestamps=False)
+
+    return Checkpoint
+
+
+class TestCheckpointStore:
+    def test_incomplete_store_cannot_be_instantiated(self):
+        class LoadOnly(CheckpointStore):
+            def load(self):
+                return None
+
+        with pytest.raises(TypeError):
+            LoadOnly()
+
+
+class TestPositionSerialization:
+    def test_round_trip(self):
+        position = {"id": Decimal(7), "role": "admin"}
+
+        state = serialize_position(position)
+
+        assert json.loads(json.dumps(state)) == state
+        assert deserialize_position(state) == position
+
+    def test_round_trip_with_segments(self):
+        position = {0: {"id": Decimal(3)}, 2: {}}
+
+        state = json.loads(json.dumps(serialize_position(position, segments=4)))
+
+        assert state["segments"] == 4
+        assert deserialize_position(state) == position
+
+
+class TestCheckpointedStream:
+    def test_resume_after_interruption(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore()
+        stream = get_user.all().limit(5).stream(checkpoint=store)
+        seen = [next(stream).id for _ in range(12)]
+        stream.close()
+
+        assert store.state is not None
+        assert len(store.saves) == 2
+
+        resumed = [user.id for user in get_user.all().limit(5).stream(checkpoint=store)]
+
+        # items of the unfinished page are delivered again (at-least-once)
+        assert set(seen) | set(resumed) == set(range(1, 21))
+        assert len(resumed) == 10
+        assert store.cleared is True
+        assert store.state is None
+
+    def test_checkpoint_every_n_pages(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore()
+
+        list(get_user.all().limit(2).stream(checkpoint=store, checkpoint_every=3))
+
+        assert len(store.saves) == 3
+        assert store.cleared is True
+
+    def test_explicit_offset_wins_over_checkpoint(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore(serialize_position({"id": Decimal(999)}))
+        first = next(get_user.all().limit(10).stream_pages())
+
+        rest = list(get_user.all().offset(first.last_evaluated_key()).stream(checkpoint=store))
+
+        assert len(rest) == 10
+
+    def test_chunked_pages_resume(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore()
+        chunks = get_user.all().limit(4).stream_pages(chunk_size=3, checkpoint=store)
+        first = [next(chunks), next(chunks)]
+        chunks.close()
+
+        saved = deserialize_position(store.state)
+        assert saved == first[0].last_evaluated_key()
+
+        resumed = get_user.all().limit(4).stream_pages(chunk_size=3, checkpoint=store)
+        ids = first[0].pluck("id") + [id for chunk in resumed for id in chunk.pluck("id")]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_parallel_segments_resume_independently(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore()
+        stream = get_user.all().limit(2).parallel(segments=3).stream(checkpoint=store)
+        seen = [next(stream).id for _ in range(7)]
+        stream.close()
+
+        assert store.state["segments"] == 3
+
+        resumed = [user.id for user in get_user.all().limit(2).parallel(segments=3).stream(checkpoint=store)]
+
+        assert set(seen) | set(resumed) == set(range(1, 21))
+        assert store.cleared is True
+
+    def test_segment_layout_mismatch_raises(self, get_user, create_table, aws_mock, save_records):
+        store = MemoryStore(serialize_position({0: {"id": Decimal(1)}}, segments=3))
+
+        with pytest.raises(InvalidArgumentException, match="parallel scan layout"):
+            list(get_user.all().parallel(segments=4).stream(checkpoint=store))
+
+    def test_scan_budget_keeps_checkpoint(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=8)
+        store = MemoryStore()
+
+        ids = [user.id for user in get_user.all().limit(4).stream(checkpoint=store)]
+
+        assert len(ids) == 8
+        assert store.cleared is False
+        assert deserialize_position(store.state) is not None
+
+        DynoLayer.configure(scan_max_items=100)
+        ids += [user.id for user in get_user.all().limit(4).stream(checkpoint=store)]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_invalid_checkpoint_every_raises(self, get_user):
+        with pytest.raises(InvalidArgumentException, match="checkpoint_every"):
+            get_user.all().stream(checkpoint=MemoryStore(), checkpoint_every=0)
+
+
+class TestFileCheckpointStore:
+    def test_save_load_clear(self, tmp_path):
+        store = FileCheckpointStore(str(tmp_path / "export.json"))
+
+        assert store.load() is None
+
+        store.save({"segments": None, "position": {"id": {"N": "5"}}})
+        assert store.load() == {"segments": None, "position": {"id": {"N": "5"}}}
+
+        store.clear()
+        assert store.load() is None
+        assert not (tmp_path / "export.json").exists()
+
+    def test_stream_with_file_store(self, get_user, create_table, aws_mock, save_records, tmp_path):
+        path = tmp_path / "users.json"
+        stream = get_user.all().limit(5).stream(checkpoint=FileCheckpointStore(str(path)))
+        for _ in range(6):
+            next(stream)
+        stream.close()
+
+        assert path.exists()
+
+        rest = list(get_user.all().limit(5).stream(checkpoint=FileCheckpointStore(str(path))))
+
+        assert len(rest) == 15
+        assert not path.exists()
+
+
+class TestModelCheckpointStore:
+    def test_save_load_clear(self, get_checkpoint_model, create_checkpoint_table):
+        store = ModelCheckpointStore(get_checkpoint_model, "users-export")
+
+        assert store.load() is None
+
+        store.save({"segments": 2, "position": {"0": {"id": {"N": "3"}}}})
+        assert store.load() == {"segments": 2, "position": {"0": {"id": {"N": "3"}}}}
+
+        store.clear()
+        assert store.load() is None
+
+    def test_record_without_the_attribute(self, get_checkpoint_model, create_checkpoint_table):
+        get_checkpoint_model.create({"name": "users-export"})
+
+        assert ModelCheckpointStore(get_checkpoint_model, "users-export").load() is None
+
+    def test_stream_with_model_store(self, get_user, get_checkpoint_model, create_table, create_checkpoint_table,
+                                     save_records):
+        store = ModelCheckpointStore(get_checkpoint_model, "users-export")
+        stream = get_user.all().limit(5).stream(checkpoint=store)
+        for _ in range(11):
+            next(stream)
+        stream.close()
+
+        rest = list(get_user.all().limit(5).stream(checkpoint=store))
+
+        assert len(rest) == 10
+        assert store.load() is None
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+from boto3.dynamodb.conditions import Key, Attr
+
+from dynolayer.crud_mixin import CrudMixin, _SingleFlight, _request_key
+from dynolayer.dynolayer import DynoLayer
+
+
+@pytest.fixture
+def slow_table(table_spy):
+    def slow(kwargs):
+        time.sleep(0.1)
+
+    table_spy.hooks.update(get_item=slow, query=slow)
+    return table_spy
+
+
+def concurrently(function, count=8):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(position):
+        barrier.wait()
+        try:
+            results[position] = function()
+        except Exception as e:
+            errors[position] = e
+
+    threads = [threading.Thread(target=worker, args=(position,)) for position in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestCoalescing:
+    def test_disabled_by_default(self, get_user, create_table, aws_mock, save_records, slow_table):
+        concurrently(lambda: get_user.get_item({"id": 1}), count=4)
+
+        assert len(slow_table.of("get_item")) == 4
+
+    def test_concurrent_get_item_share_one_call(self, get_user, create_table, aws_mock, save_records, slow_table):
+        DynoLayer.configure(coalesce_reads=True)
+        before = DynoLayer.coalesce_stats()
+
+        users, errors = concurrently(lambda: get_user.get_item({"id": 1}))
+
+        after = DynoLayer.coalesce_stats()
+        assert errors == [None] * 8
+        assert len(slow_table.of("get_item")) == 1
+        assert after["collapsed"] - before["collapsed"] == 7
+        assert after["executed"] - before["executed"] == 1
+        assert after["in_flight"] == 0
+        assert all(user.id == 1 for user in users)
+        assert len({id(user.data()) for user in users}) == 8
+
+    def test_different_keys_are_not_collapsed(self, get_user, create_table, aws_mock, save_records, slow_table):
+        get_user.coalesce_reads = True
+
+        ids = iter(range(1, 5))
+        lock = threading.Lock()
+
+        def read():
+            with lock:
+                user_id = next(ids)
+            return get_user.get_item({"id": user_id})
+
+        users, _ = concurrently(read, count=4)
+
+        assert len(slow_table.of("get_item")) == 4
+        assert sorted(user.id for user in users) == [1, 2, 3, 4]
+
+    def test_models_that_decode_differently_are_not_collapsed(self, get_user, create_table, aws_mock, save_records,
+                                                              slow_table):
+        DynoLayer.configure(coalesce_reads=True)
+
+        class FloatUser(get_user):
+            number_mode = "float"
+
+        models = iter([get_user, FloatUser] * 2)
+        lock = threading.Lock()
+
+        def read():
+            with lock:
+                model = next(models)
+            return model.get_item({"id": 1}), model.where("id", 1).get(all=True)
+
+        results, errors = concurrently(read, count=4)
+
+        assert errors == [None] * 4
+        assert len(slow_table.of("get_item")) == 2
+        assert len(slow_table.of("query")) == 2
+        expected = ["Decimal", "Decimal", "float", "float"]
+        assert sorted(type(user.id).__name__ for user, _ in results) == expected
+        assert sorted(type(rows.first().id).__name__ for _, rows in results) == expected
+
+    def test_errors_reach_every_waiter(self, get_user, create_table, aws_mock, save_records, slow_table):
+        get_user.coalesce_reads = True
+        def throttled(kwargs):
+            time.sleep(0.1)
+            raise RuntimeError("throttled")
+
+        slow_table.hooks["get_item"] = throttled
+
+        _, errors = concurrently(lambda: get_user.get_item({"id": 1}), count=4)
+
+        assert len(slow_table.of("get_item")) == 1
+        assert all(isinstance(error, RuntimeError) for error in errors)
+
+    def test_concurrent_identical_queries(self, get_user, create_table, aws_mock, save_records, slow_table):
+        get_user.coalesce_reads = True
+        expected = sorted(user.id for user in get_user.where("role", "admin").index("role-index").stream())
+        slow_table.calls.clear()
+
+        results, errors = concurrently(
+            lambda: get_user.where("role", "admin").index("role-index").get(all=True, paginate=True)
+        )
+
+        assert errors == [None] * 8
+        assert len(slow_table.of("query")) == 1
+        assert all(sorted(result.pluck("id")) == expected for result in results)
+
+    def test_different_queries_are_not_collapsed(self, get_user, create_table, aws_mock, save_records,
+                                                 slow_table):
+        get_user.coalesce_reads = True
+        roles = iter(["admin", "common"])
+        lock = threading.Lock()
+
+        def read():
+            with lock:
+                role = next(roles)
+            return get_user.where("role", role).index("role-index").get(all=True)
+
+        concurrently(read, count=2)
+
+        assert len(slow_table.of("query")) == 2
+
+    def test_deadline_reads_are_not_shared(self, get_user, create_table, aws_mock, save_records, slow_table):
+        get_user.coalesce_reads = True
+
+        concurrently(
+            lambda: get_user.where("role", "admin").index("role-index").get(all=True, paginate=True, deadline=60),
+            count=3,
+        )
+
+        assert len(slow_table.of("query")) == 3
+
+    def test_sequential_reads_are_not_cached(self, get_user, create_table, aws_mock, save_records, slow_table):
+        get_user.coalesce_reads = True
+
+        get_user.get_item({"id": 1})
+        get_user.get_item({"id": 1})
+
+        assert len(slow_table.of("get_item")) == 2
+
+
+class TestSingleFlight:
+    def test_leader_mutations_do_not_reach_waiters(self):
+        flight = _SingleFlight()
+
+        class SlowCopy:
+            def __init__(self, values):
+                self.values = values
+
+            def __deepcopy__(self, memo):
+                time.sleep(0.05)
+                return SlowCopy(list(self.values))
+
+        def operation():
+            while flight.stats()["collapsed"] < 3:
+                time.sleep(0.01)
+            return {"row": SlowCopy(["loaded"])}
+
+        def call():
+            result = flight.do("key", operation)
+            # Every caller changes its result right away, the leader included
+            result["row"].values.append("changed")
+            return result
+
+        results, errors = concurrently(call, count=4)
+
+        assert errors == [None] * 4
+        assert [result["row"].values for result in results] == [["loaded", "changed"]] * 4
+        assert len({id(result["row"]) for result in results}) == 4
+
+
+class TestRequestKey:
+    def test_equal_conditions_share_a_key(self):
+        first = Key("role").eq("admin") & Key("stars").gt(3)
+        second = Key("role").eq("admin") & Key("stars").gt(3)
+
+        assert _request_key({"KeyConditionExpression": first}) == _request_key({"KeyConditionExpression": second})
+
+    def test_values_and_types_are_distinguished(self):
+        assert _request_key(Attr("active").eq(True)) != _request_key(Attr("active").eq(1))
+        assert _request_key(Attr("role").eq("admin")) != _request_key(Key("role").eq("admin"))
+        assert _request_key({"id": 1}) != _request_key({"id": 2})
+
+
+if __name__ == "__main__":
+    pytest.main()
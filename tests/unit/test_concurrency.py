@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dynolayer.aio import AsyncDynoLayer, shutdown_executor
+from dynolayer.config import DynoConfig
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.exceptions import ValidationException
+
+
+def in_thread(function):
+    result = {}
+
+    def worker():
+        result["value"] = function()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+class TestContextErrorState:
+    def test_fail_is_isolated_between_threads(self, get_silent_user, create_table, aws_mock, save_records):
+        def failing():
+            get_silent_user.get_item({"wrong": 1})
+            return get_silent_user.fail()
+
+        def succeeding():
+            get_silent_user.get_item({"id": 1})
+            return get_silent_user.fail()
+
+        error = in_thread(failing)
+
+        assert isinstance(error, ValidationException)
+        assert in_thread(succeeding) is None
+        assert get_silent_user.fail() is None
+
+    def test_fail_is_isolated_between_tasks(self, get_silent_user, create_table, aws_mock, save_records):
+        async def request(key):
+            get_silent_user.get_item(key)
+            await asyncio.sleep(0.01)
+            return get_silent_user.fail()
+
+        async def main():
+            return await asyncio.gather(request({"wrong": 1}), request({"id": 1}))
+
+        failed, succeeded = asyncio.run(main())
+
+        assert isinstance(failed, ValidationException)
+        assert succeeded is None
+
+    def test_fail_is_kept_per_model(self, get_silent_user, create_table, aws_mock):
+        class OtherUser(get_silent_user):
+            pass
+
+        get_silent_user.get_item({"wrong": 1})
+
+        assert isinstance(get_silent_user.fail(), ValidationException)
+        assert OtherUser.fail() is None
+
+    def test_async_calls_report_fail_to_the_caller(self, get_silent_user, create_table, aws_mock):
+        async_user = AsyncDynoLayer(get_silent_user)
+
+        async def scenario():
+            await async_user.get_item({"wrong": 1})
+            return async_user.fail()
+
+        try:
+            assert isinstance(asyncio.run(scenario()), ValidationException)
+        finally:
+            shutdown_executor()
+
+    def test_batch_stats_are_isolated_between_threads(self, get_user, create_table, aws_mock, save_records):
+        def batch():
+            get_user.batch_find([{"id": 1}, {"id": 2}])
+            return get_user.last_batch_stats()
+
+        stats = in_thread(batch)
+
+        assert stats["operation"] == "batch_get"
+        assert get_user.last_batch_stats() is None
+
+
+class TestBotoResources:
+    def test_resources_are_per_thread(self, get_user, create_table, aws_mock):
+        DynoConfig.set(engine="resource")
+        user = get_user()
+
+        main_table = user._table
+        other_table = in_thread(lambda: user._table)
+
+        assert user._table is main_table
+        assert other_table is not main_table
+
+    def test_concurrent_client_creation_yields_one_client(self, aws_mock):
+        CrudMixin._reset_boto_clients()
+        barrier = threading.Barrier(8)
+
+        def create():
+            barrier.wait()
+            return CrudMixin._get_client()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: create(), range(8)))
+
+        assert len({id(client) for client in clients}) == 1
+
+    def test_thread_pool_fan_out(self, get_user, create_table, aws_mock):
+        def write_and_read(id):
+            get_user.create({"id": id, "first_name": f"U{id}", "email": f"u{id}@example.com", "role": "common"})
+            return get_user.get_item({"id": id}).first_name
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            names = list(executor.map(write_and_read, range(1, 65)))
+
+        assert names == [f"U{id}" for id in range(1, 65)]
+        assert get_user.all().count() == 64
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -43,6 +43,31 @@ class TestConditionalSave:
         with pytest.raises(ConditionalCheckException):
             user.save(condition=Attr("role").eq("moderator"))
 
+    def test_condition_is_checked_when_nothing_changed(self, get_user, create_table, aws_mock):
+        class PlainUser(get_user):
+            def __init__(self):
+                super().__init__()
+                self._timestamps = False
+
+        get_user.create({"id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin"})
+        user = PlainUser.get_item({"id": 1})
+
+        assert user.save(condition=Attr("role").eq("admin")) is True
+        with pytest.raises(ConditionalCheckException):
+            user.save(condition=Attr("role").eq("moderator"))
+
+    def test_failed_condition_without_changes_in_silent_mode(self, get_silent_user, create_table, aws_mock):
+        class PlainUser(get_silent_user):
+            def __init__(self):
+                super().__init__()
+                self._timestamps = False
+
+        get_silent_user.create({"id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin"})
+        user = PlainUser.get_item({"id": 1})
+
+        assert user.save(condition=Attr("role").eq("moderator")) is False
+        assert isinstance(user.fail(), ConditionalCheckException)
+
 
 if __name__ == "__main__":
     pytest.main()
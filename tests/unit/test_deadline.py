@@ -0,0 +1,90 @@
+import pytest
+
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import InvalidArgumentException
+
+
+class TestDeadlinePagination:
+    def test_low_remaining_time_returns_first_page(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().limit(5).get(all=True, paginate=True, deadline=lambda: 100)
+
+        assert result.count() == 5
+        assert result.last_evaluated_key() is not None
+
+    def test_generous_deadline_reads_every_page(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().limit(5).get(all=True, paginate=True, deadline=60)
+
+        assert result.count() == 20
+        assert result.last_evaluated_key() is None
+
+    def test_resume_from_partial_result(self, get_user, create_table, aws_mock, save_records):
+        first = get_user.all().limit(5).get(all=True, paginate=True, deadline=lambda: 0)
+
+        ids = first.pluck("id")
+        last_key = first.last_evaluated_key()
+        while last_key:
+            page = get_user.all().limit(5).offset(last_key).get(all=True, paginate=True, deadline=lambda: 0)
+            ids.extend(page.pluck("id"))
+            last_key = page.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_slow_pages_stop_before_deadline(self, get_user, create_table, aws_mock, save_records, slow_pages):
+        DynoLayer.configure(deadline_margin_ms=0)
+
+        # every page takes ~50ms of a 300ms budget, so the sixth one would overrun it
+        result = get_user.all().limit(2).get(all=True, paginate=True, deadline=lambda: 300 - 50 * len(slow_pages))
+
+        assert len(slow_pages) == 5
+        assert result.count() == len(slow_pages) * 2
+        assert result.last_evaluated_key() is not None
+
+    def test_margin_is_reserved(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(deadline_margin_ms=1000)
+
+        result = get_user.all().limit(5).get(all=True, paginate=True, deadline=lambda: 900)
+
+        assert result.count() == 5
+
+    def test_query_stops_at_deadline(self, get_user, create_table, aws_mock, save_records):
+        expected = get_user.where("role", "admin").index("role-index").count()
+
+        result = get_user.where("role", "admin").index("role-index").limit(1).get(
+            all=True, paginate=True, deadline=lambda: 0
+        )
+
+        assert result.count() == 1
+        assert expected > 1
+        assert result.last_evaluated_key() is not None
+
+    def test_parallel_scan_stops_every_segment(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().limit(2).parallel(segments=3)
+        first = query.get(all=True, paginate=True, deadline=lambda: 0)
+
+        assert first.count() <= 6
+        assert isinstance(first.last_evaluated_key(), dict)
+
+        ids = first.pluck("id")
+        last_key = first.last_evaluated_key()
+        while last_key:
+            page = get_user.all().limit(2).parallel(segments=3).offset(last_key).get(
+                all=True, paginate=True, deadline=lambda: 0
+            )
+            ids.extend(page.pluck("id"))
+            last_key = page.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_deadline_is_ignored_without_paginate(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().limit(5).get(all=True, deadline=lambda: 0)
+
+        assert result.count() == 5
+
+    @pytest.mark.parametrize("deadline", [0, -1, "30", True])
+    def test_invalid_deadline_raises(self, get_user, create_table, aws_mock, deadline):
+        with pytest.raises(InvalidArgumentException, match="deadline"):
+            get_user.all().get(all=True, paginate=True, deadline=deadline)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,165 @@
+import pytest
+
+from dynolayer.crud_mixin import CrudMixin
+
+
+@pytest.fixture
+def update_calls(monkeypatch):
+    calls = []
+    original = CrudMixin._update
+
+    def spy(self, data, index_key, condition=None, remove=None):
+        calls.append({"data": dict(data), "key": index_key, "remove": list(remove or [])})
+        return original(self, data, index_key, condition=condition, remove=remove)
+
+    monkeypatch.setattr(CrudMixin, "_update", spy)
+    return calls
+
+
+@pytest.fixture
+def stored_user(get_user, create_table, aws_mock):
+    get_user.create({
+        "id": 1, "first_name": "John", "last_name": "Doe", "email": "john@mail.com", "role": "admin", "stars": 3,
+    })
+
+
+class TestDirtyTracking:
+    def test_loaded_instance_is_clean(self, get_user, create_table, aws_mock, save_records):
+        user = get_user.get_item({"id": 1})
+
+        assert user.is_dirty() is False
+        assert user.get_dirty() == {}
+
+    def test_assignment_marks_dirty(self, get_user, create_table, aws_mock, save_records):
+        user = get_user.get_item({"id": 1})
+        user.first_name = "Changed"
+        user["stars"] = 5
+
+        assert user.is_dirty() is True
+        assert user.get_dirty() == {"first_name": "Changed", "stars": 5}
+
+    def test_rows_from_get_and_stream_are_clean(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.all().get().is_dirty() is False
+        assert next(get_user.all().stream()).is_dirty() is False
+        assert get_user.batch_find([{"id": 1}]).first().is_dirty() is False
+
+
+class TestPartialSave:
+    def test_save_sends_only_changed_fields(self, get_user, stored_user, update_calls):
+        user = get_user.get_item({"id": 1})
+        user.first_name = "Changed"
+        user.save()
+
+        assert len(update_calls) == 1
+        assert set(update_calls[0]["data"]) == {"first_name", "updated_at"}
+        assert get_user.get_item({"id": 1}).first_name == "Changed"
+        assert user.is_dirty() is False
+
+    def test_save_without_changes_skips_network(self, get_user, stored_user, update_calls):
+        user = get_user.get_item({"id": 1})
+
+        assert user.save() is True
+        assert update_calls == []
+
+    def test_deleted_fields_are_removed(self, get_user, stored_user, update_calls):
+        user = get_user.get_item({"id": 1})
+        del user["last_name"]
+        user.save()
+
+        assert update_calls[0]["remove"] == ["last_name"]
+        assert "last_name" not in get_user.get_item({"id": 1})
+
+    def test_mark_dirty_resends_mutated_nested_value(self, get_user, create_table, aws_mock, update_calls):
+        user = get_user.create({
+            "id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin", "stats": {"wins": 1},
+        })
+        user.stats["wins"] = 2
+        user.mark_dirty("stats").save()
+
+        assert "stats" in update_calls[0]["data"]
+        assert get_user.get_item({"id": 1}).stats == {"wins": 2}
+
+    def test_second_save_only_sends_new_changes(self, get_user, stored_user, update_calls):
+        user = get_user.get_item({"id": 1})
+        user.first_name = "First"
+        user.save()
+        user.stars = 4
+        user.save()
+
+        assert set(update_calls[1]["data"]) == {"stars", "updated_at"}
+
+    def test_new_instance_sends_all_fields(self, get_user, create_table, aws_mock, update_calls):
+        user = get_user()
+        user.id = 50
+        user.first_name = "New"
+        user.email = "new@mail.com"
+        user.role = "common"
+        user.save()
+
+        assert {"first_name", "email", "role", "created_at", "updated_at"} <= set(update_calls[0]["data"])
+
+    def test_changed_partition_key_writes_full_item(self, get_user, stored_user, update_calls):
+        user = get_user.get_item({"id": 1})
+        user.id = 500
+        user.save()
+
+        assert update_calls[0]["key"] == {"id": 500}
+        copy = get_user.get_item({"id": 500})
+        assert copy.first_name == user.first_name
+
+
+
+class TestInPlaceMutations:
+    @pytest.fixture
+    def user(self, get_user, create_table, aws_mock):
+        get_user.create({
+            "id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin", "last_name": "Doe",
+            "phones": ["a"], "stats": {"wins": 1, "history": [1]},
+        })
+        return get_user.get_item({"id": 1})
+
+    def test_mutations_mark_the_instance_dirty(self, user):
+        user.phones.append("b")
+        user.stats["history"].append(2)
+
+        assert user.is_dirty() is True
+        assert user.get_dirty() == {"phones": ["a", "b"], "stats": {"wins": 1, "history": [1, 2]}}
+
+    def test_appended_list_is_saved(self, get_user, user, update_calls):
+        user.phones.append("b")
+
+        assert user.save() is True
+        assert set(update_calls[0]["data"]) == {"phones", "updated_at"}
+        assert get_user.get_item({"id": 1}).phones == ["a", "b"]
+
+    def test_nested_map_change_is_saved(self, get_user, user, update_calls):
+        user.stats["wins"] += 1
+
+        assert user.save() is True
+        assert get_user.get_item({"id": 1}).stats == {"wins": 2, "history": [1]}
+
+    def test_changes_through_data_are_saved(self, get_user, user, update_calls):
+        user.data()["first_name"] = "Johnny"
+        del user.data()["last_name"]
+
+        assert user.save() is True
+        assert set(update_calls[0]["data"]) == {"first_name", "updated_at"}
+        assert update_calls[0]["remove"] == ["last_name"]
+        stored = get_user.get_item({"id": 1})
+        assert stored.first_name == "Johnny"
+        assert "last_name" not in stored
+
+    def test_saved_instance_compares_with_what_was_written(self, get_user, user, update_calls):
+        user.phones.append("b")
+        user.save()
+        user.phones.append("c")
+        user.save()
+
+        assert set(update_calls[1]["data"]) == {"phones", "updated_at"}
+        assert get_user.get_item({"id": 1}).phones == ["a", "b", "c"]
+        assert user.save() is True
+        assert len(update_calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,236 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+from dynolayer.config import DynoConfig
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.engine import ClientTable, ItemCodec, deserialize, serialize, serialize_item
+from dynolayer.exceptions import ConditionalCheckException, InvalidArgumentException
+
+VALUES = [
+    "text", "", 7, -3, Decimal("1.50"), Decimal("12345678901234567890"), True, False, None,
+    b"\x00\x01", Binary(b"bytes"), [1, "a", None], ("x", 2), {"nested": {"deep": [Decimal(1), {"ok": True}]}},
+    {"a", "b"}, {Decimal(1), 2}, {b"a", b"b"}, [], {},
+]
+
+
+def make_raw_page(count):
+    serializer = TypeSerializer()
+    return [
+        {key: serializer.serialize(value) for key, value in {
+            "id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common", "stars": i % 5,
+            "stats": {"wins": i, "tags": ["a", "b"]}, "active": True,
+        }.items()}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def client_engine(aws_mock):
+    DynoLayer.configure(engine="client")
+
+
+class TestSerialization:
+    @pytest.mark.parametrize("value", VALUES)
+    def test_serialize_matches_boto3(self, value):
+        assert serialize(value) == TypeSerializer().serialize(value)
+
+    @pytest.mark.parametrize("value", VALUES)
+    def test_round_trip_matches_boto3(self, value):
+        raw = TypeSerializer().serialize(value)
+
+        assert deserialize(raw) == TypeDeserializer().deserialize(raw)
+
+    @pytest.mark.parametrize("value", [Decimal("Infinity"), Decimal("NaN")])
+    def test_unsupported_values_raise_like_boto3(self, value):
+        with pytest.raises(TypeError):
+            TypeSerializer().serialize(value)
+        with pytest.raises(TypeError):
+            serialize(value)
+
+    @pytest.mark.parametrize("value", [1.5, -0.25, 3.0, 1e20, 2.5e-7])
+    def test_floats_are_written_without_decimal(self, value):
+        serialized = serialize(value)
+
+        assert list(serialized) == ["N"]
+        assert Decimal(serialized["N"]) == Decimal(repr(value))
+
+    @pytest.mark.parametrize("value", [float("inf"), float("nan")])
+    def test_non_finite_floats_raise(self, value):
+        with pytest.raises(TypeError):
+            serialize(value)
+
+
+class TestItemCodec:
+    def test_declared_types_decode_like_generic(self):
+        raw = make_raw_page(3)
+        codec = ItemCodec({"id": "N", "first_name": "S", "stats": "M", "active": "BOOL"})
+
+        assert codec.deserialize_items(raw) == ItemCodec().deserialize_items(raw)
+
+    def test_declared_type_falls_back_for_other_types(self):
+        codec = ItemCodec({"stars": "N"})
+
+        assert codec.deserialize_item({"stars": {"NULL": True}}) == {"stars": None}
+
+    def test_invalid_declared_type_raises(self):
+        with pytest.raises(InvalidArgumentException, match="stars"):
+            ItemCodec({"stars": "INT"})
+
+    def test_codec_is_built_once_per_model(self, get_user):
+        class TypedUser(get_user):
+            attribute_types = {"id": "N", "first_name": "S"}
+
+        assert TypedUser._codec() is TypedUser._codec()
+        assert TypedUser._codec().attribute_types == {"id": "N", "first_name": "S"}
+        assert get_user._codec().attribute_types == {}
+
+
+class TestClientEngine:
+    def test_engine_defaults_to_resource(self, get_user, create_table, aws_mock):
+        assert DynoConfig.get("engine") == "resource"
+        assert not isinstance(get_user()._table, ClientTable)
+
+    def test_configured_engine_uses_client_table(self, get_user, create_table, client_engine):
+        assert isinstance(get_user()._table, ClientTable)
+
+    def test_model_level_engine(self, get_user, create_table, aws_mock):
+        class ClientUser(get_user):
+            engine = "client"
+
+        assert isinstance(ClientUser()._table, ClientTable)
+        assert not isinstance(get_user()._table, ClientTable)
+
+    def test_invalid_engine_raises(self, get_user, create_table, aws_mock):
+        DynoConfig.set(engine="http")
+
+        with pytest.raises(InvalidArgumentException, match="engine"):
+            get_user.get_item({"id": 1})
+
+    def test_crud_round_trip(self, get_user, create_table, client_engine):
+        created = get_user.create({"id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin",
+                                   "stats": {"wins": 3, "tags": ["a"]}, "phones": ["1", "2"]})
+        user = get_user.get_item({"id": 1})
+
+        assert created.first_name == "John"
+        assert user.id == 1
+        assert user.stats == {"wins": 3, "tags": ["a"]}
+        assert isinstance(user.id, Decimal)
+
+        user.stars = 4
+        assert user.save() is True
+        assert get_user.get_item({"id": 1}).stars == 4
+
+        assert get_user.delete({"id": 1}) is True
+        assert get_user.get_item({"id": 1}) is None
+
+    def test_get_item_with_projection(self, get_user, create_table, client_engine, save_records):
+        user = get_user.get_item({"id": 3}, attributes=["id", "stars"])
+
+        assert user.id == 3
+        assert user.first_name is None
+
+    def test_unique_create_conflict(self, get_user, create_table, client_engine, save_records):
+        with pytest.raises(ConditionalCheckException):
+            get_user.create({"id": 1, "first_name": "John", "email": "john@mail.com", "role": "admin"}, unique=True)
+
+    def test_query_scan_and_count_match_resource_engine(self, get_user, create_table, aws_mock, save_records):
+        def snapshot():
+            return (
+                sorted(user.id for user in get_user.where("role", "admin").index("role-index").get(all=True)),
+                sorted(user.id for user in get_user.where("stars", ">", 2).force_scan().get(all=True)),
+                get_user.where("role", "common").index("role-index").count(),
+                sorted(row["id"] for row in get_user.all().limit(3).stream(as_dicts=True)),
+                sorted(user.id for user in get_user.all().parallel(segments=3).get(all=True, paginate=True)),
+            )
+
+        expected = snapshot()
+        DynoLayer.configure(engine="client")
+
+        assert snapshot() == expected
+        assert expected[3] == list(range(1, 21))
+
+    def test_pagination_keys_are_plain_values(self, get_user, create_table, client_engine, save_records):
+        query = get_user.all().limit(5)
+        first = query.get(all=True)
+        checkpoint = query.last_evaluated_key()
+
+        rest = get_user.all().offset(checkpoint).get(all=True, paginate=True)
+
+        assert isinstance(checkpoint["id"], Decimal)
+        assert sorted(first.pluck("id") + rest.pluck("id")) == list(range(1, 21))
+
+    def test_batch_operations(self, get_user, create_table, client_engine):
+        items = [{"id": i, "first_name": f"U{i}", "email": f"u{i}@mail.com", "role": "common"} for i in range(1, 31)]
+
+        get_user.batch_create(items)
+        found = get_user.batch_find([{"id": i} for i in range(1, 31)])
+        get_user.batch_destroy([{"id": i} for i in range(1, 11)])
+
+        assert sorted(found.pluck("id")) == list(range(1, 31))
+        assert get_user.all().count() == 20
+
+    def test_transactions(self, get_user, create_table, client_engine):
+        DynoLayer.transact_write([
+            get_user.prepare_put({"id": 1, "first_name": "Ann", "email": "ann@mail.com", "role": "admin"}),
+            get_user.prepare_put({"id": 2, "first_name": "Bob", "email": "bob@mail.com", "role": "common"}),
+        ])
+
+        first, second, missing = DynoLayer.transact_get([(get_user, {"id": 1}), (get_user, {"id": 2}),
+                                                         (get_user, {"id": 3})])
+
+        assert (first.first_name, second.first_name, missing) == ("Ann", "Bob", None)
+
+    def test_declared_types_hydrate_models(self, get_user, create_table, client_engine, save_records):
+        class TypedUser(get_user):
+            attribute_types = {"id": "N", "first_name": "S", "stars": "N"}
+
+        users = TypedUser.all().get(all=True, paginate=True)
+
+        assert sorted(users.pluck("id")) == list(range(1, 21))
+        assert all(isinstance(user, TypedUser) for user in users)
+
+    def test_request_does_not_mutate_arguments(self, get_user, create_table, client_engine, save_records):
+        table = get_user()._table
+        kwargs = {"KeyConditionExpression": Key("role").eq("admin"), "FilterExpression": Attr("stars").gte(0),
+                  "IndexName": "role-index"}
+        original = dict(kwargs)
+
+        response = table.query(**kwargs)
+
+        assert kwargs == original
+        assert all(isinstance(item["id"], Decimal) for item in response["Items"])
+
+    def test_expression_placeholders_do_not_collide(self, get_user, create_table, client_engine, save_records):
+        response = get_user()._table.query(
+            KeyConditionExpression=Key("role").eq("admin"),
+            FilterExpression=Attr("stars").gte(0) & Attr("first_name").exists(),
+            IndexName="role-index",
+        )
+
+        assert response["Count"] == get_user.where("role", "admin").index("role-index").count()
+
+
+class TestEngineParity:
+    def test_codec_matches_boto3_on_large_pages(self):
+        raw = make_raw_page(500)
+        deserializer = TypeDeserializer()
+
+        expected = [{key: deserializer.deserialize(value) for key, value in item.items()} for item in raw]
+
+        assert ItemCodec().deserialize_items(raw) == expected
+
+    def test_serializer_matches_boto3_on_large_batches(self):
+        rows = [{"id": i, "name": f"User{i}", "stars": Decimal(i % 5), "tags": ["a", "b"], "active": True}
+                for i in range(500)]
+        serializer = TypeSerializer()
+
+        expected = [{key: serializer.serialize(value) for key, value in row.items()} for row in rows]
+
+        assert [serialize_item(row) for row in rows] == expected
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,78 @@
+import pytest
+
+from dynolayer.exceptions import QueryException
+
+
+class TestExists:
+    def test_key_condition(self, get_user, create_table, aws_mock, save_records, table_spy):
+        assert get_user.where("id", 3).exists() is True
+        assert get_user.where("id", 999).exists() is False
+        assert [call["Limit"] for call in table_spy.of("query")] == [1, 1]
+        assert all(call["Select"] == "COUNT" for call in table_spy.of("query"))
+
+    def test_index_query(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.where("role", "nobody").index("role-index").exists() is False
+        assert get_user.where("role", "admin").exists() is (get_user.where("role", "admin").count() > 0)
+
+    def test_table_scan_reads_one_item(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        assert get_user.all().exists() is True
+        assert scan_pages == [1]
+
+    def test_empty_table(self, get_user, create_table, aws_mock, scan_pages):
+        assert get_user.all().exists() is False
+
+    def test_filter_pages_grow_until_exhausted(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        assert get_user.where("stars", ">=", 0).where("first_name", "ghost").exists() is False
+        assert scan_pages == [10, 20]
+
+    def test_filter_stops_at_first_match(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        assert get_user.where("stars", ">=", 0).exists() is True
+        assert scan_pages == [10]
+
+    def test_limit_sets_first_page_size(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        get_user.where("stars", ">=", 0).where("first_name", "ghost").limit(3).exists()
+
+        assert scan_pages[:3] == [3, 6, 12]
+
+    def test_missing_condition_raises(self, get_user, create_table, aws_mock):
+        with pytest.raises(QueryException):
+            get_user().exists()
+
+    def test_silent_mode_returns_false(self, get_silent_user, create_table, aws_mock):
+        query = get_silent_user.where("role", "admin").index("missing-index")
+
+        assert query.exists() is False
+        assert isinstance(query.fail(), QueryException)
+
+
+class TestFirst:
+    def test_key_condition(self, get_user, create_table, aws_mock, save_records, table_spy):
+        user = get_user.where("id", 4).first()
+
+        assert user.id == 4
+        assert table_spy.of("query")[0]["Limit"] == 1
+
+    def test_no_match_returns_none(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.where("id", 999).first() is None
+        assert get_user.where("stars", ">", 5).first() is None
+
+    def test_filtered_scan(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        user = get_user.where("stars", ">=", 0).first()
+
+        assert isinstance(user, get_user)
+        assert scan_pages == [10]
+
+    def test_projection_and_dicts(self, get_user, create_table, aws_mock, save_records):
+        row = get_user.where("id", 2).attributes_to_get(["id", "stars"]).first(as_dicts=True)
+
+        assert set(row) == {"id", "stars"}
+
+    def test_silent_mode_returns_none(self, get_silent_user, create_table, aws_mock):
+        query = get_silent_user.where("role", "admin").index("missing-index")
+
+        assert query.first() is None
+        assert isinstance(query.fail(), QueryException)
+
+
+if __name__ == "__main__":
+    pytest.main()
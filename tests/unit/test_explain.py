@@ -0,0 +1,142 @@
+import pytest
+
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.exceptions import QueryException
+
+
+@pytest.fixture
+def no_requests(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("explain() without analyze must not read items")
+
+    monkeypatch.setattr(CrudMixin, "_query", fail)
+    monkeypatch.setattr(CrudMixin, "_scan", fail)
+    monkeypatch.setattr(CrudMixin, "_analyze", fail)
+
+
+class TestExplain:
+    def test_query_plan_with_explicit_index(self, get_user, create_table, aws_mock, no_requests):
+        plan = (
+            get_user.where("role", "admin")
+            .and_where("stars", ">=", 3)
+            .index("role-index")
+            .attributes_to_get(["id", "stars"])
+            .explain()
+        )
+
+        assert plan["operation"] == "Query"
+        assert plan["index"] == "role-index"
+        assert plan["index_source"] == "explicit"
+        assert plan["key_conditions"] == [{"attribute": "role", "operator": "=", "value": "admin"}]
+        assert plan["filters"] == [{"connector": "AND", "attribute": "stars", "operator": ">=", "value": 3}]
+        assert plan["projection"] == ["id", "stars"]
+        assert plan["paginate"] is False
+        assert plan["warnings"] == []
+
+    def test_rendered_expressions(self, get_user, create_table, aws_mock):
+        plan = get_user.where("role", "admin").and_where("stars", ">", 2).index("role-index").explain()
+
+        names = plan["expression_attribute_names"]
+        values = plan["expression_attribute_values"]
+        role_name = next(name for name, attr in names.items() if attr == "role")
+        stars_name = next(name for name, attr in names.items() if attr == "stars")
+
+        assert plan["key_condition_expression"].startswith(f"{role_name} = ")
+        assert plan["filter_expression"].startswith(f"{stars_name} > ")
+        assert sorted(values.values(), key=str) == [2, "admin"]
+
+    def test_auto_index_is_reported(self, get_user, create_table, aws_mock):
+        plan = get_user.where("role", "admin").explain()
+
+        assert plan["operation"] == "Query"
+        assert plan["index"] == "role-index"
+        assert plan["index_source"] == "auto"
+
+    def test_scan_plan_reports_warning_and_estimate(self, get_user, create_table, aws_mock):
+        plan = get_user.where("stars", ">", 2).explain(paginate=True)
+
+        assert plan["operation"] == "Scan"
+        assert plan["index"] is None
+        assert plan["key_condition_expression"] is None
+        assert plan["paginate"] is True
+        assert plan["estimated_read_units"] >= 0.5
+        assert any("Full table scan" in warning for warning in plan["warnings"])
+
+    def test_range_on_partition_key_is_demoted_to_filter(self, get_user, create_table, aws_mock):
+        plan = get_user.where("id", ">", 3).explain()
+
+        assert plan["operation"] == "Scan"
+        assert plan["filters"] == [{"connector": "AND", "attribute": "id", "operator": ">", "value": 3}]
+        assert any("demoted" in warning for warning in plan["warnings"])
+
+    def test_explain_does_not_consume_builder(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.where("id", 1).attributes_to_get(["id", "stars"])
+        query.explain()
+
+        user = query.get()
+
+        assert user.id == 1
+        assert user.first_name is None
+
+    def test_parallel_scan_plan(self, get_user, create_table, aws_mock):
+        plan = get_user.all().parallel(segments=4).explain()
+
+        assert plan["operation"] == "Scan"
+        assert plan["segments"] == 4
+
+    def test_missing_condition_raises(self, get_user, create_table, aws_mock):
+        with pytest.raises(QueryException):
+            get_user().explain()
+
+    def test_silent_mode_returns_none(self, get_silent_user, create_table, aws_mock):
+        query = get_silent_user.where("role", "admin").index("missing-index")
+
+        assert query.explain() is None
+        assert isinstance(query.fail(), QueryException)
+
+
+class TestExplainAnalyze:
+    def test_analyze_query(self, get_user, create_table, aws_mock, save_records):
+        expected = get_user.where("role", "admin").index("role-index").count()
+
+        plan = get_user.where("role", "admin").index("role-index").explain(analyze=True)
+        stats = plan["analyze"]
+
+        assert stats["pages"] == 1
+        assert stats["count"] == expected
+        assert stats["scanned_count"] == expected
+        assert stats["consumed_capacity"] > 0
+        assert stats["elapsed_ms"] >= 0
+        assert stats["has_more"] is False
+
+    def test_analyze_scan_reports_scanned_vs_count(self, get_user, create_table, aws_mock, save_records):
+        expected = get_user.where("stars", 5).count()
+
+        stats = get_user.where("stars", 5).explain(paginate=True, analyze=True)["analyze"]
+
+        assert stats["scanned_count"] == 20
+        assert stats["count"] == expected
+
+    def test_analyze_without_paginate_reads_one_page(self, get_user, create_table, aws_mock, save_records):
+        stats = get_user.all().limit(5).explain(analyze=True)["analyze"]
+
+        assert stats["pages"] == 1
+        assert stats["scanned_count"] == 5
+        assert stats["has_more"] is True
+
+    def test_analyze_paginates(self, get_user, create_table, aws_mock, save_records):
+        stats = get_user.all().limit(5).explain(paginate=True, analyze=True)["analyze"]
+
+        assert stats["pages"] >= 4
+        assert stats["scanned_count"] == 20
+        assert stats["has_more"] is False
+
+    def test_analyze_parallel_scan(self, get_user, create_table, aws_mock, save_records):
+        stats = get_user.all().parallel(segments=3).explain(paginate=True, analyze=True)["analyze"]
+
+        assert stats["count"] == 20
+        assert stats["pages"] >= 3
+
+
+if __name__ == "__main__":
+    pytest.main()
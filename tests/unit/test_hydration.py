@@ -0,0 +1,85 @@
+import pytest
+from dynolayer.dynolayer import DynoLayer
+
+
+def make_rows(count):
+    return [
+        {"id": i, "first_name": f"User{i}", "email": f"user{i}@mail.com", "role": "common", "stars": i % 5}
+        for i in range(count)
+    ]
+
+
+class TestFastHydration:
+    def test_hydrated_instance_has_model_configuration(self, get_user):
+        user = get_user._hydrate({"id": 1, "first_name": "John"})
+
+        assert isinstance(user, get_user)
+        assert user._entity == "users"
+        assert user._partition_keys == ["id"]
+        assert user.fillable() == ["id", "first_name", "last_name", "email", "role", "stars", "stats", "phones"]
+        assert user.id == 1
+        assert user.is_dirty() is False
+
+    def test_hydrated_instance_attaches_row(self, get_user):
+        row = {"id": 1}
+        user = get_user._hydrate(row)
+
+        assert user.data() is row
+
+    def test_hydrated_instances_do_not_share_state(self, get_user):
+        first = get_user._hydrate({"id": 1})
+        second = get_user._hydrate({"id": 2})
+        first.first_name = "Changed"
+        first.where("role", "admin")
+
+        assert second.first_name is None
+        assert second.is_dirty() is False
+        assert second._key_condition_expression == []
+        assert second._filter_expression == []
+        assert get_user._prototype.data() == {}
+
+    def test_prototype_is_built_once_per_class(self, get_user, get_silent_user):
+        calls = []
+
+        class Counted(DynoLayer):
+            def __init__(self):
+                calls.append(1)
+                super().__init__(entity="counted", partition_key="id")
+
+        for row in make_rows(10):
+            Counted._hydrate(row)
+
+        get_user._hydrate({"id": 1})
+        get_silent_user._hydrate({"id": 1})
+
+        assert len(calls) == 1
+        assert get_user._prototype is not get_silent_user._prototype
+        assert DynoLayer._prototype is None
+
+    def test_get_returns_hydrated_models(self, get_user, create_table, aws_mock, save_records):
+        users = get_user.all().get(all=True, paginate=True)
+
+        assert users.count() == 20
+        assert all(isinstance(user, get_user) for user in users)
+
+
+class TestHydrationInitCalls:
+    def test_result_rows_do_not_run_init(self, get_user, create_table, aws_mock, save_records):
+        calls = []
+
+        class CountedUser(get_user):
+            def __init__(self):
+                calls.append(1)
+                super().__init__()
+
+        users = CountedUser.all().get(all=True, paginate=True)
+        rows = CountedUser.all().get(all=True, paginate=True)
+
+        assert users.count() == rows.count() == 20
+        assert all(isinstance(user, CountedUser) for user in users)
+        # One query builder per call plus the class prototype, never one per row
+        assert len(calls) == 3
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,198 @@
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.utils import Collection
+
+
+@pytest.fixture
+def operations(monkeypatch):
+    calls = []
+    original_query = CrudMixin._query
+    original_scan = CrudMixin._scan
+    original_count_query = CrudMixin._count_query
+
+    def query_spy(self, key_condition, filter_expression=None, index=None, *args, **kwargs):
+        calls.append(("query", index))
+        return original_query(self, key_condition, filter_expression, index, *args, **kwargs)
+
+    def count_query_spy(self, key_condition, filter_expression=None, index=None):
+        calls.append(("query", index))
+        return original_count_query(self, key_condition, filter_expression, index)
+
+    def scan_spy(self, *args, **kwargs):
+        calls.append(("scan", None))
+        return original_scan(self, *args, **kwargs)
+
+    monkeypatch.setattr(CrudMixin, "_query", query_spy)
+    monkeypatch.setattr(CrudMixin, "_count_query", count_query_spy)
+    monkeypatch.setattr(CrudMixin, "_scan", scan_spy)
+    return calls
+
+
+def admin_ids():
+    table = boto3.resource("dynamodb", region_name="sa-east-1").Table("users")
+    return sorted(item["id"] for item in table.scan()["Items"] if item["role"] == "admin")
+
+
+class TestIndexPlanner:
+    def test_equality_on_index_hash_key_becomes_query(self, get_user, create_table, aws_mock, save_records,
+                                                      operations):
+        result = get_user.where("role", "admin").get(all=True)
+
+        assert operations == [("query", "role-index")]
+        assert isinstance(result, Collection)
+        assert sorted(result.pluck("id")) == admin_ids()
+
+    def test_range_key_match_prefers_composite_index(self, get_user, create_table, aws_mock, save_records,
+                                                     operations):
+        get_user.create({"id": 100, "first_name": "Jane", "email": "jane@mail.com", "role": "admin"})
+
+        result = get_user.where("role", "admin").and_where("email", "begins_with", "jane").get(all=True)
+
+        assert operations == [("query", "role-email-index")]
+        assert result.pluck("id") == [100]
+
+    def test_sparse_composite_index_is_not_used_without_range_condition(self, get_user, create_table, aws_mock,
+                                                                        save_records, operations):
+        # save_records rows have no email, so role-email-index would silently drop them
+        result = get_user.where("role", "admin").and_where("stars", ">=", 0).get(all=True)
+
+        assert operations == [("query", "role-index")]
+        assert sorted(result.pluck("id")) == admin_ids()
+
+    def test_count_uses_planned_index(self, get_user, create_table, aws_mock, save_records, operations):
+        assert get_user.where("role", "admin").count() == len(admin_ids())
+        assert operations == [("query", "role-index")]
+
+    def test_stream_uses_planned_index(self, get_user, create_table, aws_mock, save_records, monkeypatch):
+        indexes = []
+        original_load = DynoLayer._load_indexes
+
+        def load_spy(self):
+            original_load(self)
+            indexes.append(self)
+
+        monkeypatch.setattr(DynoLayer, "_load_indexes", load_spy)
+
+        ids = sorted(user.id for user in get_user.where("role", "admin").stream())
+
+        assert ids == admin_ids()
+        assert len(indexes) == 1
+
+    def test_table_key_query_skips_describe(self, get_user, create_table, aws_mock, save_records, monkeypatch,
+                                            operations):
+        def fail_describe(self):
+            raise AssertionError("DescribeTable should not be called")
+
+        monkeypatch.setattr(CrudMixin, "_describe", fail_describe)
+
+        user = get_user.where("id", 1).and_where("role", "<>", "ghost").get()
+
+        assert user.id == 1
+        assert operations == [("query", None)]
+
+
+class TestIndexPlannerFallbacks:
+    def test_or_conditions_keep_scan(self, get_user, create_table, aws_mock, save_records, operations):
+        get_user.where("stars", 5).or_where("stars", 0).get(all=True)
+
+        assert operations == [("scan", None)]
+
+    def test_filter_only_query_keeps_scan(self, get_user, create_table, aws_mock, save_records, operations):
+        get_user.where("stars", ">", 2).get(all=True)
+
+        assert operations == [("scan", None)]
+
+    def test_class_opt_out(self, get_user, create_table, aws_mock, save_records, operations):
+        class ScanUser(get_user):
+            auto_index = False
+
+        result = ScanUser.where("role", "admin").get(all=True)
+
+        assert operations == [("scan", None)]
+        assert sorted(result.pluck("id")) == admin_ids()
+
+    def test_config_opt_out(self, get_user, create_table, aws_mock, save_records, operations):
+        DynoLayer.configure(auto_index=False)
+
+        get_user.where("role", "admin").get(all=True)
+
+        assert operations == [("scan", None)]
+
+    def test_class_opt_in_overrides_config(self, get_user, create_table, aws_mock, save_records, operations):
+        DynoLayer.configure(auto_index=False)
+
+        class IndexedUser(get_user):
+            auto_index = True
+
+        IndexedUser.where("role", "admin").get(all=True)
+
+        assert operations == [("query", "role-index")]
+
+    def test_force_scan_is_respected(self, get_user, create_table, aws_mock, save_records, operations):
+        get_user.where("role", "admin").force_scan().get(all=True)
+
+        assert operations == [("scan", None)]
+
+    def test_describe_failure_falls_back_to_scan_once(self, get_user, create_table, aws_mock, save_records,
+                                                      monkeypatch, operations):
+        describes = []
+
+        def denied_describe(self):
+            describes.append(self._entity)
+            raise ClientError({"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, "DescribeTable")
+
+        monkeypatch.setattr(CrudMixin, "_describe", denied_describe)
+
+        first = get_user.where("role", "admin").get(all=True)
+        get_user.where("role", "admin").get(all=True)
+
+        assert sorted(first.pluck("id")) == admin_ids()
+        assert operations == [("scan", None), ("scan", None)]
+        assert describes == ["users"]
+
+
+class TestKeyConditionRouting:
+    def test_negated_partition_key_is_a_filter(self, get_user, create_table, aws_mock, save_records, operations):
+        result = get_user().where_not("id", 1).get(all=True)
+
+        assert operations == [("scan", None)]
+        assert 1 not in result.pluck("id")
+        assert result.count() == 19
+
+    def test_non_key_operator_on_partition_key_is_a_filter(self, get_user, create_table, aws_mock, save_records,
+                                                           operations):
+        result = get_user().where_in("id", [1, 2, 3]).get(all=True)
+
+        assert operations == [("scan", None)]
+        assert sorted(result.pluck("id")) == [1, 2, 3]
+
+
+    def test_range_on_partition_key_is_a_filter(self, get_user, create_table, aws_mock, save_records, operations):
+        result = get_user.where("id", ">", 15).get(all=True, paginate=True)
+
+        assert operations == [("scan", None)]
+        assert sorted(result.pluck("id")) == [16, 17, 18, 19, 20]
+
+    def test_range_on_partition_key_counts_and_streams(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.where("id", "between", [5, 9]).count() == 5
+        assert sorted(user.id for user in get_user.where("id", "<=", 3).stream()) == [1, 2, 3]
+
+    def test_partition_key_equality_stays_a_query(self, get_user, create_table, aws_mock, save_records,
+                                                  operations):
+        user = get_user.where("id", 4).and_where("stars", ">=", 0).get()
+
+        assert user.id == 4
+        assert operations == [("query", None)]
+
+    def test_explicit_index_is_not_demoted(self, get_user, create_table, aws_mock, save_records, operations):
+        result = get_user.where("role", "admin").index("role-index").get(all=True)
+
+        assert operations == [("query", "role-index")]
+        assert all(user.role == "admin" for user in result)
+
+if __name__ == "__main__":
+    pytest.main()
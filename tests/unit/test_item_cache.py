@@ -0,0 +1,180 @@
+import time
+
+import boto3
+import pytest
+
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import InvalidArgumentException
+
+
+@pytest.fixture
+def cached_user(get_user):
+    class CachedUser(get_user):
+        item_cache = True
+
+    return CachedUser
+
+
+@pytest.fixture
+def users_table(aws_mock):
+    return boto3.resource("dynamodb", region_name="sa-east-1").Table("users")
+
+
+class TestItemCache:
+    def test_disabled_by_default(self, get_user, create_table, aws_mock, save_records):
+        get_user.get_item({"id": 1})
+
+        assert get_user.cache_stats() is None
+
+    def test_repeated_reads_hit_the_cache(self, cached_user, create_table, save_records, users_table):
+        first = cached_user.get_item({"id": 1})
+        users_table.delete_item(Key={"id": 1})
+
+        second = cached_user.get_item({"id": 1})
+
+        assert second.data() == first.data()
+        stats = cached_user.cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert stats["hit_ratio"] == 0.5
+
+    def test_enabled_through_config(self, get_user, create_table, save_records):
+        DynoLayer.configure(item_cache=True)
+
+        get_user.get_item({"id": 1})
+        get_user.get_item({"id": 1})
+
+        assert get_user.cache_stats()["hits"] == 1
+
+    def test_find_or_fail_uses_cache(self, cached_user, create_table, save_records, users_table):
+        cached_user.find_or_fail({"id": 2})
+        users_table.delete_item(Key={"id": 2})
+
+        assert cached_user.find_or_fail({"id": 2}).id == 2
+
+    def test_projection_is_served_from_full_item(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 3})
+
+        user = cached_user.get_item({"id": 3}, attributes=["id", "stars"])
+
+        assert set(user.data()) == {"id", "stars"}
+        assert cached_user.cache_stats()["hits"] == 1
+
+    def test_projected_reads_are_not_cached(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 3}, attributes=["id"])
+
+        assert cached_user.cache_stats()["size"] == 0
+
+    def test_mutating_a_model_does_not_touch_the_cache(self, cached_user, create_table, save_records):
+        user = cached_user.get_item({"id": 4})
+        user.stars = 99
+
+        assert cached_user.get_item({"id": 4}).stars != 99
+
+    def test_ttl_expires_entries(self, cached_user, create_table, save_records, users_table):
+        cached_user.item_cache_ttl = 0.05
+        cached_user.get_item({"id": 5})
+        users_table.delete_item(Key={"id": 5})
+        time.sleep(0.06)
+
+        assert cached_user.get_item({"id": 5}) is None
+        assert cached_user.cache_stats()["expirations"] == 1
+
+    def test_lru_eviction_by_entries(self, cached_user, create_table, save_records):
+        cached_user.item_cache_max_entries = 2
+        cached_user.get_item({"id": 1})
+        cached_user.get_item({"id": 2})
+        cached_user.get_item({"id": 1})
+        cached_user.get_item({"id": 3})
+
+        stats = cached_user.cache_stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+        cached_user.get_item({"id": 1})
+        assert cached_user.cache_stats()["hits"] == 2
+
+    def test_eviction_by_bytes(self, cached_user, create_table, save_records):
+        cached_user.item_cache_max_bytes = 300
+        for id in range(1, 6):
+            cached_user.get_item({"id": id})
+
+        stats = cached_user.cache_stats()
+        assert stats["bytes"] <= 300
+        assert stats["evictions"] >= 1
+
+    def test_invalid_setting_raises(self, cached_user, create_table, save_records):
+        cached_user.item_cache_ttl = -1
+
+        with pytest.raises(InvalidArgumentException, match="item_cache_ttl"):
+            cached_user.get_item({"id": 1})
+
+    def test_clear_cache(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 1})
+        cached_user.clear_cache()
+
+        assert cached_user.cache_stats() is None
+
+
+class TestCacheInvalidation:
+    def test_save(self, cached_user, create_table, save_records):
+        user = cached_user.get_item({"id": 1})
+        user.email = "cached@example.com"
+        user.stars = 42
+        user.save()
+
+        assert cached_user.get_item({"id": 1}).stars == 42
+
+    def test_destroy_and_delete(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 1}).destroy()
+        cached_user.get_item({"id": 2})
+        cached_user.delete({"id": 2})
+
+        assert cached_user.get_item({"id": 1}) is None
+        assert cached_user.get_item({"id": 2}) is None
+
+    def test_create(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 1})
+        cached_user.create({"id": 1, "first_name": "New", "email": "new@example.com", "role": "admin"})
+
+        assert cached_user.get_item({"id": 1}).first_name == "New"
+
+    def test_batch_create_and_destroy(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 1})
+        cached_user.get_item({"id": 2})
+
+        cached_user.batch_create([{"id": 1, "first_name": "Batch", "email": "b@example.com", "role": "admin"}])
+        cached_user.batch_destroy([{"id": 2}], pipeline=True)
+
+        assert cached_user.get_item({"id": 1}).first_name == "Batch"
+        assert cached_user.get_item({"id": 2}) is None
+
+    def test_transact_write(self, cached_user, create_table, save_records):
+        cached_user.get_item({"id": 1})
+
+        DynoLayer.transact_write([cached_user.prepare_update({"id": 1}, {"stars": 77})])
+
+        assert cached_user.get_item({"id": 1}).stars == 77
+
+
+class TestBatchFindCache:
+    def test_only_misses_are_fetched(self, cached_user, create_table, save_records, batch_gets):
+        cached_user.get_item({"id": 1})
+        cached_user.get_item({"id": 2})
+
+        result = cached_user.batch_find([{"id": 1}, {"id": 2}, {"id": 3}])
+
+        assert sorted(result.pluck("id")) == [1, 2, 3]
+        assert batch_gets == [[{"id": 3}]]
+
+    def test_all_hits_skip_the_request(self, cached_user, create_table, save_records, batch_gets):
+        cached_user.batch_find([{"id": 1}, {"id": 2}])
+
+        rows = cached_user.batch_find([{"id": 1}, {"id": 2}], as_dicts=True)
+
+        assert sorted(row["id"] for row in rows) == [1, 2]
+        assert len(batch_gets) == 1
+        assert cached_user.cache_stats()["hits"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
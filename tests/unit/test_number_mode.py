@@ -0,0 +1,207 @@
+from decimal import Decimal
+
+import pytest
+
+from dynolayer.config import DynoConfig
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.engine import ItemCodec, floats_to_decimal
+from dynolayer.exceptions import InvalidArgumentException
+
+ENGINES = ["resource", "client"]
+
+
+@pytest.fixture(params=ENGINES)
+def engine(request, aws_mock):
+    DynoLayer.configure(engine=request.param)
+    return request.param
+
+
+@pytest.fixture
+def save_scores(get_user, create_table, aws_mock):
+    get_user.create({"id": 1, "first_name": "Ann", "email": "ann@mail.com", "role": "admin", "stars": 4,
+                     "stats": {"ratio": Decimal("0.75"), "wins": 12, "history": [1, Decimal("2.5")]}})
+    get_user.create({"id": 2, "first_name": "Bob", "email": "bob@mail.com", "role": "admin", "stars": 2,
+                     "stats": {"ratio": Decimal("1.5"), "wins": 3, "history": []}})
+
+
+class TestItemCodecNumberMode:
+    def test_numbers_decode_in_a_single_pass(self):
+        raw = {"n": {"N": "3"}, "f": {"N": "2.5"}, "m": {"M": {"x": {"N": "-7"}}}, "l": {"L": [{"N": "1E+2"}]},
+               "ns": {"NS": ["1", "0.5"]}}
+
+        assert ItemCodec(number_mode="int_or_float").deserialize_item(raw) == {
+            "n": 3, "f": 2.5, "m": {"x": -7}, "l": [100.0], "ns": {1, 0.5},
+        }
+        assert type(ItemCodec(number_mode="int_or_float").deserialize_item(raw)["n"]) is int
+        assert all(type(value) is float for value in
+                   ItemCodec(number_mode="float").deserialize_item(raw)["ns"])
+        assert ItemCodec().deserialize_item(raw)["f"] == Decimal("2.5")
+
+    def test_declared_types_follow_number_mode(self):
+        codec = ItemCodec({"stars": "N"}, number_mode="float")
+
+        assert codec.deserialize_item({"stars": {"N": "4"}, "wins": {"N": "2"}}) == {"stars": 4.0, "wins": 2.0}
+
+    def test_resource_items_are_converted(self):
+        item = {"id": Decimal("1"), "ratio": Decimal("0.5"), "nested": {"values": [Decimal("3"), "x"]}}
+
+        converted = ItemCodec(number_mode="int_or_float").convert_item(item)
+
+        assert converted == {"id": 1, "ratio": 0.5, "nested": {"values": [3, "x"]}}
+        assert type(converted["id"]) is int
+        assert ItemCodec().convert_item(item) is item
+
+    def test_invalid_number_mode_raises(self):
+        with pytest.raises(InvalidArgumentException, match="number_mode"):
+            ItemCodec(number_mode="int")
+
+
+class TestFloatsToDecimal:
+    def test_nested_floats_are_converted(self):
+        item = {"price": 9.99, "stats": {"ratio": 0.5, "tags": ["a"]}, "history": [1, 2.5], "name": "x"}
+
+        assert floats_to_decimal(item) == {
+            "price": Decimal("9.99"), "stats": {"ratio": Decimal("0.5"), "tags": ["a"]},
+            "history": [1, Decimal("2.5")], "name": "x",
+        }
+
+    def test_items_without_floats_are_not_copied(self):
+        item = {"id": 1, "stats": {"wins": Decimal(3)}, "tags": ["a"]}
+
+        assert floats_to_decimal(item) is item
+
+
+class TestNumberMode:
+    def test_decimal_is_the_default(self, get_user, save_scores, engine):
+        user = get_user.get_item({"id": 1})
+
+        assert DynoConfig.get("number_mode") == "decimal"
+        assert isinstance(user.stars, Decimal)
+
+    def test_int_or_float_on_every_read_path(self, get_user, save_scores, engine):
+        DynoConfig.set(number_mode="int_or_float")
+
+        def first_user(users):
+            return next(user for user in users if user.id == 1)
+
+        reads = [
+            get_user.get_item({"id": 1}),
+            first_user(get_user.where("role", "admin").index("role-index").get(all=True)),
+            first_user(get_user.all().stream()),
+            first_user(get_user.batch_find([{"id": 1}, {"id": 2}])),
+            first_user(get_user.all().parallel(segments=2).get(all=True)),
+            get_user.where("id", 1).first(),
+            DynoLayer.transact_get([(get_user, {"id": 1})])[0],
+        ]
+
+        for user in reads:
+            assert type(user.id) is int
+            assert type(user.stars) is int
+            assert type(user.stats["ratio"]) is float
+            assert user.stats["history"] == [1, 2.5]
+
+    def test_dicts_use_the_number_mode(self, get_user, save_scores, engine):
+        DynoConfig.set(number_mode="float")
+
+        rows = get_user.all().get(all=True, as_dicts=True)
+
+        assert all(type(row["stars"]) is float for row in rows)
+
+    def test_model_level_number_mode(self, get_user, save_scores, engine):
+        class FloatUser(get_user):
+            number_mode = "float"
+
+        assert type(FloatUser.get_item({"id": 1}).stars) is float
+        assert isinstance(get_user.get_item({"id": 1}).stars, Decimal)
+
+    def test_loaded_floats_are_written_back(self, get_user, save_scores, engine):
+        DynoConfig.set(number_mode="int_or_float")
+        user = get_user.get_item({"id": 2})
+        user.stats = {"ratio": user.stats["ratio"] * 2, "wins": 4, "history": [0.25]}
+
+        assert user.save() is True
+
+        DynoConfig.set(number_mode="decimal")
+        assert get_user.get_item({"id": 2}).stats == {"ratio": Decimal("3"), "wins": 4, "history": [Decimal("0.25")]}
+
+    def test_prepare_update_writes_nested_floats(self, get_user, save_scores, engine):
+        DynoLayer.transact_write([get_user.prepare_update({"id": 1}, {"score": 4.5, "stats": {"ratio": 0.25}})])
+
+        user = get_user.get_item({"id": 1})
+
+        assert user.score == Decimal("4.5")
+        assert user.stats == {"ratio": Decimal("0.25")}
+
+    def test_prepare_update_keeps_floats_on_client_engine(self, get_user, aws_mock):
+        DynoLayer.configure(engine="client")
+
+        values = get_user.prepare_update({"id": 1}, {"score": 4.5})["Update"]["ExpressionAttributeValues"]
+
+        assert values == {":score_0": 4.5}
+
+    def test_pagination_keys_stay_serializable(self, get_user, save_scores, engine):
+        DynoConfig.set(number_mode="int_or_float")
+        query = get_user.all().limit(1)
+        first = query.get(all=True)
+
+        rest = get_user.all().offset(query.last_evaluated_key()).get(all=True, paginate=True)
+
+        assert sorted(first.pluck("id") + rest.pluck("id")) == [1, 2]
+
+    def test_invalid_number_mode_raises(self, get_user, save_scores):
+        DynoConfig.set(number_mode="int")
+
+        with pytest.raises(InvalidArgumentException, match="number_mode"):
+            get_user.get_item({"id": 1})
+
+
+class TestNumericKeys:
+    # Keys read in float/int_or_float mode go back to DynamoDB as numbers, not as raw floats
+    @pytest.fixture
+    def fractional_key(self, get_user, save_scores):
+        get_user.create({"id": Decimal("2.5"), "first_name": "Cid", "email": "cid@mail.com", "role": "admin",
+                         "stars": 1})
+
+    @pytest.mark.parametrize("number_mode", ["float", "int_or_float"])
+    def test_save_and_destroy(self, get_user, save_scores, fractional_key, engine, number_mode):
+        DynoConfig.set(number_mode=number_mode)
+
+        for user_id in (1, 2.5):
+            user = get_user.get_item({"id": user_id})
+            user.first_name = "Renamed"
+            assert user.save() is True
+            assert get_user.get_item({"id": user_id}).first_name == "Renamed"
+
+            assert user.destroy() is True
+            assert get_user.get_item({"id": user_id}) is None
+
+    def test_batch_destroy_with_loaded_keys(self, get_user, save_scores, fractional_key, engine):
+        DynoConfig.set(number_mode="float")
+        keys = [{"id": user.id} for user in get_user.all().get(all=True, paginate=True)]
+
+        assert get_user.batch_destroy(keys[:1]) is True
+        assert get_user.batch_destroy(keys[1:], pipeline=True) is True
+        assert get_user.batch_find(keys).count() == 0
+
+    def test_take_continuation_key(self, get_user, save_scores, fractional_key, engine):
+        DynoConfig.set(number_mode="float")
+        first = get_user.where("stars", ">=", 0).limit(3).take(1).get(all=True)
+
+        assert type(first.last_evaluated_key()["id"]) is float
+        rest = get_user.where("stars", ">=", 0).offset(first.last_evaluated_key()).get(all=True, paginate=True)
+
+        assert sorted(first.pluck("id") + rest.pluck("id")) == [1, 2, 2.5]
+
+    def test_stream_chunk_positions(self, get_user, save_scores, fractional_key, engine):
+        DynoConfig.set(number_mode="float")
+        chunks = get_user.all().stream_pages(chunk_size=1)
+        first = next(chunks)
+        chunks.close()
+
+        rest = get_user.all().offset(first.last_evaluated_key()).stream()
+
+        assert sorted(first.pluck("id") + [user.id for user in rest]) == [1, 2, 2.5]
+
+
+if __name__ == "__main__":
+    pytest.main()
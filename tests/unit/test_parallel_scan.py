@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from dynolayer.config import DynoConfig
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.utils import Collection
+from dynolayer.exceptions import InvalidArgumentException
+
+
+class TestParallelGet:
+    def test_parallel_get_returns_all_records(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().parallel(segments=4).get(all=True, paginate=True)
+
+        assert isinstance(result, Collection)
+        assert result.count() == 20
+        assert len(set(result.pluck("id"))) == 20
+
+    def test_parallel_get_with_filter(self, get_user, create_table, aws_mock, save_records):
+        expected = get_user().where("stars", ">=", 3).force_scan().get(all=True, paginate=True)
+        result = get_user().where("stars", ">=", 3).force_scan().parallel(segments=3, workers=2).get(
+            all=True, paginate=True)
+
+        assert sorted(result.pluck("id")) == sorted(expected.pluck("id"))
+        for user in result:
+            assert user.stars >= 3
+
+    def test_parallel_get_with_projection(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().attributes_to_get(["id", "stars"]).parallel(segments=2).get(all=True, paginate=True)
+
+        assert result.count() == 20
+        for user in result:
+            assert user.first_name is None
+            assert user.stars is not None
+
+    def test_parallel_get_resumes_from_segment_keys(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().limit(2).parallel(segments=2)
+        first_page = query.get(all=True)
+        last_key = query.last_evaluated_key()
+
+        assert isinstance(last_key, dict)
+        assert set(last_key).issubset({0, 1})
+
+        ids = first_page.pluck("id")
+        while last_key:
+            query = get_user.all().limit(2).parallel(segments=2).offset(last_key)
+            ids.extend(query.get(all=True).pluck("id"))
+            last_key = query.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_segment_keys_survive_a_json_round_trip(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().limit(2).parallel(segments=2)
+        first_page = query.get(all=True)
+        last_key = {str(segment): key for segment, key in query.last_evaluated_key().items()}
+
+        rest = get_user.all().parallel(segments=2).offset(last_key).get(all=True, paginate=True)
+
+        assert sorted(first_page.pluck("id") + rest.pluck("id")) == list(range(1, 21))
+
+    def test_segments_reuse_pool_threads(self, get_user, create_table, aws_mock, save_records, monkeypatch):
+        DynoConfig.set(engine="resource")
+        for _ in range(3):
+            get_user.all().parallel(segments=4).get(all=True, paginate=True)
+        session = CrudMixin._get_session()
+        created = []
+        original = session.resource
+        monkeypatch.setattr(session, "resource", lambda *args, **kwargs: created.append(1) or original(*args, **kwargs))
+
+        for _ in range(3):
+            assert get_user.all().parallel(segments=4).count() == 20
+            assert get_user.all().parallel(segments=4).get(all=True, paginate=True).count() == 20
+
+        assert created == []
+
+    def test_parallel_is_ignored_for_queries(self, get_user, create_table, aws_mock, save_records):
+        user = get_user.where("id", 1).parallel(segments=4).get()
+
+        assert user.id == 1
+
+
+class TestParallelCountAndStream:
+    def test_parallel_count(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.all().parallel(segments=4).count() == 20
+
+    def test_parallel_count_with_filter(self, get_user, create_table, aws_mock, save_records):
+        expected = get_user().where("stars", ">", 2).force_scan().count()
+
+        assert get_user().where("stars", ">", 2).force_scan().parallel(segments=3).count() == expected
+
+    def test_parallel_stream(self, get_user, create_table, aws_mock, save_records):
+        ids = [user.id for user in get_user.all().limit(3).parallel(segments=4, workers=2).stream()]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_parallel_stream_can_be_abandoned(self, get_user, create_table, aws_mock, save_records):
+        stream = get_user.all().limit(1).parallel(segments=4).stream()
+        first = next(stream)
+        stream.close()
+
+        assert first.id is not None
+
+    def test_parallel_calls_inside_a_parallel_stream(self, get_user, create_table, aws_mock, save_records):
+        # The stream runners must not hold the pool the nested parallel scans wait on
+        DynoLayer.configure(parallel_max_workers=4)
+        totals = []
+
+        def consume():
+            for _ in get_user.all().limit(1).parallel(segments=4).stream_pages():
+                totals.append(get_user.all().parallel(segments=4).get(all=True, paginate=True).count())
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        consumer.join(timeout=30)
+
+        assert not consumer.is_alive()
+        assert totals and set(totals) == {20}
+
+
+class TestParallelValidation:
+    @pytest.mark.parametrize("segments", [0, -1, 1.5, "4", True])
+    def test_invalid_segments_raise(self, get_user, segments):
+        with pytest.raises(InvalidArgumentException, match="segments"):
+            get_user.all().parallel(segments=segments)
+
+    def test_invalid_workers_raise(self, get_user):
+        with pytest.raises(InvalidArgumentException, match="workers"):
+            get_user.all().parallel(segments=2, workers=0)
+
+    @pytest.mark.parametrize("offset", [{"id": 5}, {0: {"id": 5}, 2: {"id": 9}}, {"0": "id"}])
+    def test_invalid_segment_offsets_raise(self, get_user, create_table, aws_mock, offset):
+        with pytest.raises(InvalidArgumentException, match="segment") as error:
+            get_user.all().parallel(segments=2).offset(offset).get(all=True)
+
+        assert error.value.details["method"] == "offset"
+
+    def test_parallel_state_is_reset_after_get(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().parallel(segments=2)
+        query.get(all=True)
+
+        assert query._segments is None
+        assert query._workers is None
+
+
+if __name__ == "__main__":
+    pytest.main()
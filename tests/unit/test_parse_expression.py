@@ -151,5 +151,67 @@ class TestParseExpressionErrors:
             parse_expression("age between :min and :max", min=18)
 
 
+class TestExpressionCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from dynolayer.utils import _expression_cache
+        _expression_cache.clear()
+        yield
+        _expression_cache.clear()
+
+    def test_repeated_terms_hit_cache(self):
+        from dynolayer.utils import expression_cache_stats
+
+        parse_expression("role = :r AND stars >= :s", r="admin", s=3)
+        parse_expression("role = :r AND stars >= :s", r="common", s=1)
+        stats = expression_cache_stats()
+
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["size"] == 1
+
+    def test_values_are_bound_per_call(self):
+        first = parse_expression("age between :a and :b AND name = :n", a=1, b=2, n="x")
+        second = parse_expression("age between :a and :b AND name = :n", a=5, b=9, n="y")
+
+        assert first == [("AND", "age", "between", [1, 2]), ("AND", "name", "=", "x")]
+        assert second == [("AND", "age", "between", [5, 9]), ("AND", "name", "=", "y")]
+
+    def test_missing_value_on_cached_expression(self):
+        parse_expression("user_id = :uid", uid="1")
+
+        with pytest.raises(InvalidArgumentException, match="Missing value for placeholder ':uid'"):
+            parse_expression("user_id = :uid")
+
+    def test_invalid_expressions_are_not_cached(self):
+        from dynolayer.utils import expression_cache_stats
+
+        for _ in range(2):
+            with pytest.raises(InvalidArgumentException):
+                parse_expression("invalid expression here")
+
+        assert expression_cache_stats()["size"] == 0
+
+    def test_cache_size_is_capped(self):
+        from dynolayer.config import DynoConfig
+        from dynolayer.utils import expression_cache_stats
+
+        DynoConfig.set(expression_cache_size=2)
+        for attr in ("a", "b", "c"):
+            parse_expression(f"{attr} = :v", v=1)
+        parse_expression("a = :v", v=1)
+        stats = expression_cache_stats()
+
+        assert stats["size"] == 2
+        assert stats["evictions"] == 2
+        assert stats["max_size"] == 2
+
+    def test_stats_exposed_on_model(self, get_user):
+        get_user().find("role = :r", r="admin")
+        get_user().find("role = :r", r="common")
+
+        assert get_user.expression_cache_stats()["hits"] == 1
+
+
 if __name__ == "__main__":
     pytest.main()
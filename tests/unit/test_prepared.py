@@ -0,0 +1,171 @@
+import pytest
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import InvalidArgumentException, QueryException
+from dynolayer.prepared import PreparedQuery
+from dynolayer.utils import Collection
+
+
+@pytest.fixture
+def admins(get_user, create_table, aws_mock):
+    get_user.batch_create([
+        {"id": i, "first_name": f"Admin{i}", "email": f"admin{i}@mail.com", "role": "admin", "stars": i}
+        for i in range(1, 6)
+    ] + [
+        {"id": 10, "first_name": "Common", "email": "common@mail.com", "role": "common", "stars": 5},
+    ])
+
+
+class TestPreparePlan:
+    def test_index_plan_resolves_key_conditions_and_filters(self, get_user, create_table, aws_mock):
+        plan = get_user.prepare("role = :role AND stars >= :min", index="role-index")
+
+        assert isinstance(plan, PreparedQuery)
+        assert plan.operation == "Query"
+        assert plan.index == "role-index"
+        assert plan.key_condition_expression == "#n0 = :v0"
+        assert plan.filter_expression == "(#n1 >= :v1)"
+        assert plan.expression_attribute_names == {"#n0": "role", "#n1": "stars"}
+
+    def test_plan_without_hash_key_scans(self, get_user, create_table, aws_mock):
+        plan = get_user.prepare("stars >= :min OR role = :role")
+
+        assert plan.operation == "Scan"
+        assert plan.key_condition_expression is None
+        assert plan.filter_expression == "((#n0 >= :v0) OR (#n1 = :v1))"
+
+    @pytest.mark.parametrize("terms", ["first_name = :n OR id = :id", "id = :id OR first_name = :n",
+                                       "first_name = :n AND NOT id = :id", "first_name = :n OR NOT id = :id"])
+    def test_key_attribute_outside_the_top_level_and_stays_a_filter(self, get_user, create_table, aws_mock, terms):
+        plan = get_user.prepare(terms)
+
+        assert plan.operation == "Scan"
+        assert plan.key_condition_expression is None
+
+    def test_key_condition_after_an_or_group(self, get_user, create_table, aws_mock):
+        plan = get_user.prepare("stars >= :min OR role = :role AND id = :id")
+
+        assert plan.operation == "Query"
+        assert plan.key_condition_expression == "#n0 = :v2"
+        assert plan.filter_expression == "((#n1 >= :v0) OR (#n2 = :v1))"
+        assert plan.expression_attribute_names == {"#n0": "id", "#n1": "stars", "#n2": "role"}
+
+    @pytest.mark.parametrize("name", ["limit", "offset", "all"])
+    def test_reserved_placeholder_raises(self, get_user, name):
+        with pytest.raises(InvalidArgumentException, match=f"':{name}' clashes"):
+            get_user.prepare(f"stars >= :{name}")
+
+    def test_plan_renders_function_operators(self, get_user, create_table, aws_mock):
+        plan = get_user.prepare(
+            "email begins_with :p AND NOT last_name exists AND stars between :a and :b AND stars in :list"
+        )
+
+        assert plan.filter_expression == (
+            "(begins_with(#n0, :v0)) AND (NOT (attribute_exists(#n1))) "
+            "AND (#n2 BETWEEN :v2a AND :v2b) AND (#n2 IN ({in3}))"
+        )
+
+    def test_unknown_index_raises(self, get_user, create_table, aws_mock):
+        with pytest.raises(QueryException, match="does not exist"):
+            get_user.prepare("role = :role", index="missing-index")
+
+    def test_index_without_hash_key_raises(self, get_user, create_table, aws_mock):
+        with pytest.raises(QueryException, match="requires partition key 'role'"):
+            get_user.prepare("stars = :s", index="role-index")
+
+    def test_invalid_terms_raise(self, get_user):
+        with pytest.raises(InvalidArgumentException, match="Invalid expression syntax"):
+            get_user.prepare("not valid")
+
+
+class TestPreparedExecution:
+    def test_get_binds_values(self, get_user, admins):
+        plan = get_user.prepare("role = :role AND stars >= :min", index="role-index")
+
+        result = plan.get(all=True, role="admin", min=3)
+
+        assert isinstance(result, Collection)
+        assert sorted(result.pluck("id")) == [3, 4, 5]
+        assert sorted(plan.get(all=True, role="common", min=0).pluck("id")) == [10]
+
+    def test_get_single_model(self, get_user, admins):
+        plan = get_user.prepare("id = :id")
+
+        assert plan.get(id=4).first_name == "Admin4"
+        assert plan.get(id=999) is None
+
+    def test_get_with_in_and_projection(self, get_user, admins):
+        plan = get_user.prepare("stars in :values", attributes=["id", "stars"])
+
+        rows = plan.get(all=True, paginate=True, as_dicts=True, values=[1, 2])
+
+        assert sorted(row["id"] for row in rows) == [1, 2]
+        assert all(set(row) == {"id", "stars"} for row in rows)
+
+    def test_get_pagination(self, get_user, admins):
+        plan = get_user.prepare("role = :role", index="role-index")
+
+        page = plan.get(all=True, limit=2, role="admin")
+        rest = plan.get(all=True, paginate=True, offset=page.last_evaluated_key(), role="admin")
+
+        assert page.count() == 2
+        assert page.last_evaluated_key() is not None
+        assert sorted(page.pluck("id") + rest.pluck("id")) == [1, 2, 3, 4, 5]
+
+    def test_count(self, get_user, admins):
+        plan = get_user.prepare("role = :role AND stars > :min", index="role-index", attributes=["id"])
+
+        assert plan.count(role="admin", min=1) == 4
+
+    def test_or_on_key_attribute(self, get_user, admins):
+        plan = get_user.prepare("first_name = :n OR id = :id")
+
+        rows = plan.get(all=True, paginate=True, n="Admin1", id=2)
+
+        assert sorted(rows.pluck("id")) == [1, 2]
+
+    def test_and_not_on_key_attribute(self, get_user, admins):
+        plan = get_user.prepare("first_name = :n AND NOT id = :id")
+
+        assert plan.get(all=True, paginate=True, n="Admin1", id=1).count() == 0
+        assert plan.get(all=True, paginate=True, n="Admin1", id=2).pluck("id") == [1]
+
+    def test_scan_follows_scan_policy(self, get_user, get_silent_user, admins):
+        DynoLayer.configure(scan_policy="raise")
+        plan = get_user.prepare("stars >= :min")
+
+        with pytest.raises(QueryException, match="would scan the whole table"):
+            plan.get(all=True, min=1)
+        with pytest.raises(QueryException, match="would scan the whole table"):
+            plan.count(min=1)
+        assert get_user.prepare("id = :id").get(id=1).id == 1
+
+        assert get_silent_user.prepare("stars >= :min").count(min=1) == 0
+        assert isinstance(get_silent_user.fail(), QueryException)
+
+    def test_scan_stops_at_the_budget(self, get_user, admins):
+        DynoLayer.configure(scan_max_pages=2)
+        plan = get_user.prepare("stars >= :min")
+
+        page = plan.get(all=True, paginate=True, limit=2, min=0)
+
+        assert page.count() == 4
+        assert page.last_evaluated_key() is not None
+
+        DynoLayer.configure(scan_max_pages=None, scan_max_items=3)
+        assert plan.count(min=0) == 3
+
+    def test_missing_value_raises(self, get_user, admins):
+        plan = get_user.prepare("role = :role", index="role-index")
+
+        with pytest.raises(InvalidArgumentException, match="Missing value for placeholder ':role'"):
+            plan.get()
+
+    def test_missing_value_silent_mode(self, get_silent_user, admins):
+        plan = get_silent_user.prepare("id = :id")
+
+        assert plan.get(all=True).count() == 0
+        assert isinstance(get_silent_user.fail(), InvalidArgumentException)
+
+
+if __name__ == "__main__":
+    pytest.main()
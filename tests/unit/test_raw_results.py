@@ -0,0 +1,65 @@
+import pytest
+from dynolayer.utils import Collection
+
+
+class TestRawGet:
+    def test_raw_builder_returns_dicts(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().raw().get(all=True, paginate=True)
+
+        assert isinstance(result, list)
+        assert len(result) == 20
+        assert all(type(row) is dict for row in result)
+
+    def test_get_as_dicts(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.where("id", 1).get(all=True, as_dicts=True)
+
+        assert result == [get_user.get_item({"id": 1}).data()]
+
+    def test_single_result_as_dict(self, get_user, create_table, aws_mock, save_records):
+        row = get_user.where("id", 1).get(as_dicts=True)
+
+        assert isinstance(row, dict)
+        assert row["id"] == 1
+
+    def test_single_result_as_dict_not_found(self, get_user, create_table, aws_mock, save_records):
+        assert get_user.where("id", 999).get(as_dicts=True) is None
+
+    def test_raw_keeps_pagination_metadata(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().limit(5).raw()
+        rows = query.fetch(all=True)
+
+        assert len(rows) == 5
+        assert query.get_count() == 5
+        assert query.last_evaluated_key() is not None
+
+    def test_raw_flag_is_reset(self, get_user, create_table, aws_mock, save_records):
+        query = get_user.all().raw()
+        query.get(all=True)
+
+        assert isinstance(query.all().get(all=True), Collection)
+
+    def test_silent_error_returns_empty_list(self, get_silent_user, create_table, aws_mock):
+        assert get_silent_user().raw().get(all=True) == []
+
+
+class TestRawStreamAndBatch:
+    def test_stream_as_dicts(self, get_user, create_table, aws_mock, save_records):
+        rows = list(get_user.all().limit(7).stream(as_dicts=True))
+
+        assert len(rows) == 20
+        assert all(type(row) is dict for row in rows)
+
+    def test_parallel_stream_raw(self, get_user, create_table, aws_mock, save_records):
+        rows = list(get_user.all().parallel(segments=2).raw().stream())
+
+        assert sorted(row["id"] for row in rows) == list(range(1, 21))
+
+    def test_batch_find_as_dicts(self, get_user, create_table, aws_mock, save_records):
+        rows = get_user.batch_find([{"id": 1}, {"id": 2}], as_dicts=True)
+
+        assert isinstance(rows, list)
+        assert sorted(row["id"] for row in rows) == [1, 2]
+
+
+if __name__ == "__main__":
+    pytest.main()
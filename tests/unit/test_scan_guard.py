@@ -0,0 +1,201 @@
+import warnings
+
+import pytest
+
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.exceptions import QueryException, InvalidArgumentException
+from dynolayer.utils import Collection
+
+
+class TestScanPolicy:
+    def test_default_policy_allows_scans(self, get_user, create_table, aws_mock, save_records):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = get_user.where("stars", ">=", 0).get(all=True)
+
+        assert result.count() == 20
+
+    def test_raise_blocks_implicit_scan(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        with pytest.raises(QueryException, match="scan the whole table"):
+            get_user.where("stars", 3).get(all=True)
+
+    def test_raise_blocks_implicit_count_and_stream(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        with pytest.raises(QueryException):
+            get_user.where("stars", 3).count()
+        with pytest.raises(QueryException):
+            list(get_user.where("stars", 3).stream())
+
+    def test_raise_covers_demoted_key_conditions(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        with pytest.raises(QueryException):
+            get_user.where("id", ">", 3).get(all=True)
+
+    def test_explicit_scans_are_allowed(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        assert get_user.all().get(all=True).count() == 20
+        assert get_user().find().get(all=True).count() == 20
+        assert get_user.where("stars", ">=", 0).force_scan().count() == 20
+
+    def test_queries_are_allowed(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        assert get_user.where("id", 1).get().id == 1
+        assert isinstance(get_user.where("role", "admin").get(all=True), Collection)
+
+    def test_silent_mode_stores_error(self, get_silent_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        query = get_silent_user.where("stars", 3)
+        result = query.get(all=True)
+
+        assert result.count() == 0
+        assert isinstance(query.fail(), QueryException)
+
+    def test_warn_emits_runtime_warning(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="warn")
+
+        with pytest.warns(RuntimeWarning, match="scan the whole table"):
+            result = get_user.where("stars", ">=", 0).get(all=True)
+
+        assert result.count() == 20
+
+    def test_model_policy_overrides_config(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_policy="raise")
+
+        class ReportUser(get_user):
+            scan_policy = "allow"
+
+        assert ReportUser.where("stars", ">=", 0).count() == 20
+
+    def test_invalid_policy_raises(self, get_user, create_table, aws_mock, save_records):
+        class BrokenUser(get_user):
+            scan_policy = "block"
+
+        with pytest.raises(InvalidArgumentException, match="scan_policy"):
+            BrokenUser.where("stars", 3).get(all=True)
+
+    def test_invalid_budget_raises(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_pages=0)
+
+        with pytest.raises(InvalidArgumentException, match="scan_max_pages"):
+            get_user.all().get(all=True)
+
+
+class TestScanBudget:
+    def test_page_budget_returns_continuation_key(self, get_user, create_table, aws_mock, save_records):
+        class BudgetUser(get_user):
+            scan_max_pages = 2
+
+        query = BudgetUser.all().limit(5)
+        first = query.get(all=True, paginate=True)
+
+        assert first.count() == 10
+        assert first.last_evaluated_key() is not None
+
+        ids = first.pluck("id")
+        last_key = first.last_evaluated_key()
+        while last_key:
+            page = BudgetUser.all().limit(5).offset(last_key).get(all=True, paginate=True)
+            ids.extend(page.pluck("id"))
+            last_key = page.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_item_budget_caps_scanned_items(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=7)
+
+        result = get_user.all().get(all=True, paginate=True)
+
+        assert result.count() == 7
+        assert result.last_evaluated_key() is not None
+
+    def test_budget_counts_scanned_not_returned_items(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=7)
+
+        result = get_user.where("stars", ">=", 0).where("first_name", "ghost").get(all=True, paginate=True)
+
+        assert result.count() == 0
+        assert result.last_evaluated_key() is not None
+
+    def test_budget_does_not_apply_to_queries(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_pages=1)
+        expected = get_user.where("role", "admin").force_scan().count()
+
+        result = get_user.where("role", "admin").index("role-index").limit(1).get(all=True, paginate=True)
+
+        assert result.count() == expected
+
+    def test_parallel_scan_shares_budget(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=6)
+
+        query = get_user.all().parallel(segments=3)
+        first = query.get(all=True, paginate=True)
+
+        assert first.count() <= 6
+        assert isinstance(first.last_evaluated_key(), dict)
+
+        ids = first.pluck("id")
+        last_key = first.last_evaluated_key()
+        while last_key:
+            page = get_user.all().parallel(segments=3).offset(last_key).get(all=True, paginate=True)
+            assert page.count() <= 6
+            ids.extend(page.pluck("id"))
+            last_key = page.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_count_stops_at_budget_and_resumes(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=8)
+
+        query = get_user.all()
+        total = query.count()
+        last_key = query.last_evaluated_key()
+
+        assert total == 8
+        while last_key:
+            query = get_user.all().offset(last_key)
+            total += query.count()
+            last_key = query.last_evaluated_key()
+
+        assert total == 20
+
+    def test_stream_stops_at_budget(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=5)
+
+        query = get_user.all()
+        ids = [user.id for user in query.stream()]
+        last_key = query.last_evaluated_key()
+
+        assert len(ids) == 5
+        assert last_key is not None
+
+        query = get_user.all().offset(last_key)
+        ids.extend(user.id for user in query.stream())
+
+        assert len(ids) == 10
+
+    def test_parallel_stream_stops_at_budget(self, get_user, create_table, aws_mock, save_records):
+        DynoLayer.configure(scan_max_items=6)
+
+        ids = []
+        query = get_user.all().parallel(segments=2)
+        ids.extend(user.id for user in query.stream())
+        last_key = query.last_evaluated_key()
+
+        assert len(ids) <= 6
+        while last_key:
+            query = get_user.all().parallel(segments=2).offset(last_key)
+            ids.extend(user.id for user in query.stream())
+            last_key = query.last_evaluated_key()
+
+        assert sorted(ids) == list(range(1, 21))
+
+
+if __name__ == "__main__":
+    pytest.main()
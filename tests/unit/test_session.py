@@ -0,0 +1,217 @@
+import asyncio
+import threading
+
+import pytest
+
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.dynolayer import DynoLayer
+from dynolayer.session import Session, current_session
+
+
+class TestSessionIdentityMap:
+    def test_repeated_get_item_returns_same_instance(self, get_user, create_table, save_records, table_spy):
+        with DynoLayer.session() as session:
+            first = get_user.get_item({"id": 1})
+            second = get_user.get_item({"id": 1})
+
+        assert first is second
+        assert len(table_spy.of("get_item")) == 1
+        assert (session.hits, session.misses) == (1, 1)
+
+    def test_map_is_discarded_on_exit(self, get_user, create_table, save_records, table_spy):
+        with DynoLayer.session() as session:
+            get_user.get_item({"id": 1})
+            assert len(session) == 1
+
+        assert len(session) == 0
+        assert current_session() is None
+        get_user.get_item({"id": 1})
+        assert len(table_spy.of("get_item")) == 2
+
+    def test_no_session_means_no_identity_map(self, get_user, create_table, save_records):
+        assert get_user.get_item({"id": 1}) is not get_user.get_item({"id": 1})
+
+    def test_find_or_fail_and_batch_find_share_identities(self, get_user, create_table, save_records,
+                                                           batch_gets):
+        with DynoLayer.session():
+            user = get_user.find_or_fail({"id": 2})
+            result = get_user.batch_find([{"id": 2}, {"id": 3}])
+            again = get_user.get_item({"id": 3})
+
+        assert any(item is user for item in result)
+        assert again is next(item for item in result if item.id == 3)
+        assert batch_gets == [[{"id": 3}]]
+
+    def test_batch_find_as_dicts(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            get_user.get_item({"id": 4})
+            rows = get_user.batch_find([{"id": 4}, {"id": 5}], as_dicts=True)
+
+        assert sorted(row["id"] for row in rows) == [4, 5]
+
+    def test_transact_get_reads_only_missing_items(self, get_user, create_table, save_records, monkeypatch):
+        requests = []
+        client = CrudMixin._get_client()
+        original = client.transact_get_items
+
+        def recording_transact_get_items(**kwargs):
+            requests.append(kwargs["TransactItems"])
+            return original(**kwargs)
+
+        monkeypatch.setattr(client, "transact_get_items", recording_transact_get_items)
+
+        with DynoLayer.session():
+            loaded = get_user.get_item({"id": 1})
+            items = DynoLayer.transact_get([(get_user, {"id": 1}), (get_user, {"id": 2})])
+            again = DynoLayer.transact_get([(get_user, {"id": 1}), (get_user, {"id": 2})])
+
+        assert items[0] is loaded
+        assert items[1].id == 2
+        assert again[1] is items[1]
+        assert len(requests) == 1
+        assert len(requests[0]) == 1
+
+    def test_projected_reads_are_not_mapped(self, get_user, create_table, save_records):
+        with DynoLayer.session() as session:
+            partial = get_user.get_item({"id": 1}, attributes=["id"])
+            full = get_user.get_item({"id": 1})
+
+        assert partial is not full
+        assert full.first_name is not None
+        assert session.misses == 2
+
+    def test_nested_sessions(self, get_user, create_table, save_records):
+        with DynoLayer.session() as outer:
+            user = get_user.get_item({"id": 1})
+            with DynoLayer.session() as inner:
+                assert current_session() is inner
+                assert get_user.get_item({"id": 1}) is not user
+            assert current_session() is outer
+            assert get_user.get_item({"id": 1}) is user
+
+    def test_other_model_on_same_table_is_not_reused(self, get_user, create_table, save_records):
+        class Admin(get_user):
+            pass
+
+        with DynoLayer.session():
+            user = get_user.get_item({"id": 1})
+            admin = Admin.get_item({"id": 1})
+
+        assert isinstance(admin, Admin)
+        assert admin is not user
+
+    def test_sessions_are_isolated_between_threads(self, get_user, create_table, save_records):
+        seen = {}
+
+        def worker():
+            seen["session"] = current_session()
+
+        with DynoLayer.session():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert seen["session"] is None
+
+    def test_sessions_are_isolated_between_tasks(self):
+        async def request(name):
+            with DynoLayer.session() as session:
+                await asyncio.sleep(0.01)
+                return current_session() is session
+
+        async def main():
+            return await asyncio.gather(request("a"), request("b"))
+
+        assert asyncio.run(main()) == [True, True]
+
+
+class TestSessionWrites:
+    def test_save_keeps_the_mapped_instance(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            user = get_user.get_item({"id": 1})
+            user.email = "session@example.com"
+            user.save()
+
+            assert get_user.get_item({"id": 1}) is user
+
+    def test_delete_and_destroy_evict(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            get_user.get_item({"id": 1}).destroy()
+            get_user.get_item({"id": 2})
+            get_user.delete({"id": 2})
+
+            assert get_user.get_item({"id": 1}) is None
+            assert get_user.get_item({"id": 2}) is None
+
+    def test_create_and_batch_writes_evict(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            get_user.get_item({"id": 1})
+            get_user.get_item({"id": 2})
+            get_user.create({"id": 1, "first_name": "New", "email": "n@example.com", "role": "admin"})
+            get_user.batch_destroy([{"id": 2}])
+
+            assert get_user.get_item({"id": 1}).first_name == "New"
+            assert get_user.get_item({"id": 2}) is None
+
+    def test_transact_write_evicts(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            get_user.get_item({"id": 1})
+            DynoLayer.transact_write([get_user.prepare_update({"id": 1}, {"stars": 55})])
+
+            assert get_user.get_item({"id": 1}).stars == 55
+
+    def test_writes_in_nested_session_evict_outer(self, get_user, create_table, save_records):
+        with DynoLayer.session():
+            get_user.get_item({"id": 1})
+            with DynoLayer.session():
+                get_user.delete({"id": 1})
+            assert get_user.get_item({"id": 1}) is None
+
+
+class TestSessionDiscard:
+    def test_full_item_evicts_only_its_identity(self):
+        session = Session()
+        first, second = object(), object()
+        session.add("users", {"id": 1}, first)
+        session.add("users", {"id": 2}, second)
+
+        session.discard("users", {"id": 1, "first_name": "John", "role": "admin"})
+
+        assert session.get("users", {"id": 1}) is None
+        assert session.get("users", {"id": 2}) is second
+
+    def test_composite_keys_are_matched_exactly(self):
+        session = Session()
+        order = object()
+        session.add("orders", {"user_id": 1, "order_id": 7}, order)
+
+        session.discard("orders", {"user_id": 1, "order_id": 8, "total": 10})
+        assert session.get("orders", {"user_id": 1, "order_id": 7}) is order
+
+        session.discard("orders", {"order_id": 7, "user_id": 1, "total": 10})
+        assert session.get("orders", {"user_id": 1, "order_id": 7}) is None
+
+    def test_partial_key_evicts_nothing(self):
+        session = Session()
+        session.add("orders", {"user_id": 1, "order_id": 7}, object())
+        session.add("orders", {"user_id": 1, "order_id": 8}, object())
+
+        session.discard("orders", {"user_id": 1})
+
+        assert len(session) == 2
+
+    def test_keep_and_other_entities_are_untouched(self):
+        session = Session()
+        user, order = object(), object()
+        session.add("users", {"id": 1}, user)
+        session.add("orders", {"id": 1}, order)
+
+        session.discard("users", {"id": 1}, keep=user)
+        session.discard("products", {"id": 1})
+
+        assert session.get("users", {"id": 1}) is user
+        assert session.get("orders", {"id": 1}) is order
+
+
+if __name__ == "__main__":
+    pytest.main()
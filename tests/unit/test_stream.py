@@ -0,0 +1,216 @@
+import threading
+
+import pytest
+
+from dynolayer.crud_mixin import CrudMixin
+from dynolayer.exceptions import InvalidArgumentException
+from dynolayer.utils import Collection
+
+
+class ProducerProbe:
+    # Counts the pages fetched and records how many had been fetched whenever the producer found the queue full
+    def __init__(self):
+        self.fetched = 0
+        self.blocked_at = []
+        self.finished = threading.Event()
+        self._changed = threading.Condition()
+
+    def fetch(self):
+        with self._changed:
+            self.fetched += 1
+            self._changed.notify_all()
+
+    def block(self):
+        with self._changed:
+            self.blocked_at.append(self.fetched)
+            self._changed.notify_all()
+
+    def wait(self, predicate) -> bool:
+        with self._changed:
+            return self._changed.wait_for(predicate, timeout=5)
+
+
+@pytest.fixture
+def producer(monkeypatch):
+    probe = ProducerProbe()
+    original_scan_page = CrudMixin._scan_page
+    original_publish = CrudMixin._publish
+
+    def scan_page(table, scan_attributes, limit=None, budget=None):
+        probe.fetch()
+        return original_scan_page(table, scan_attributes, limit, budget)
+
+    def publish(buffer, stop, message):
+        if buffer.full():
+            probe.block()
+        published = original_publish(buffer, stop, message)
+        if message[0] == "done":
+            probe.finished.set()
+        return published
+
+    monkeypatch.setattr(CrudMixin, "_scan_page", staticmethod(scan_page))
+    monkeypatch.setattr(CrudMixin, "_publish", staticmethod(publish))
+    return probe
+
+
+class TestStreamPrefetch:
+    def test_prefetch_yields_every_item(self, get_user, create_table, aws_mock, save_records):
+        ids = [user.id for user in get_user.all().limit(3).stream(prefetch=2)]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_prefetch_on_query(self, get_user, create_table, aws_mock, save_records):
+        expected = sorted(user.id for user in get_user.where("role", "admin").index("role-index").stream())
+
+        ids = sorted(user.id for user in get_user.where("role", "admin").index("role-index").limit(1)
+                     .stream(prefetch=3))
+
+        assert ids == expected
+
+    def test_prefetch_with_dicts(self, get_user, create_table, aws_mock, save_records):
+        rows = list(get_user.all().limit(4).stream(as_dicts=True, prefetch=1))
+
+        assert len(rows) == 20
+        assert all(isinstance(row, dict) for row in rows)
+
+    def test_pages_are_fetched_in_background(self, get_user, create_table, aws_mock, save_records, slow_pages):
+        list(get_user.all().limit(5).stream(prefetch=2))
+
+        assert slow_pages
+        assert all(thread.startswith("dynolayer-stream") for thread in slow_pages)
+
+    def test_queue_is_bounded(self, get_user, create_table, aws_mock, save_records, producer):
+        stream = get_user.all().limit(1).stream(prefetch=1)
+        next(stream)
+
+        # one page consumed, one waiting in the queue and one held by the producer, blocked on the full queue
+        assert producer.wait(lambda: 3 in producer.blocked_at)
+        assert producer.fetched == 3
+        stream.close()
+
+    def test_next_page_is_fetched_while_the_consumer_works(self, get_user, create_table, aws_mock, save_records,
+                                                           producer):
+        stream = get_user.all().limit(1).stream(prefetch=1)
+        next(stream)
+
+        assert producer.wait(lambda: producer.fetched >= 2)
+        stream.close()
+
+    def test_without_prefetch_pages_are_fetched_on_demand(self, get_user, create_table, aws_mock, save_records,
+                                                          producer):
+        stream = get_user.all().limit(1).stream()
+        next(stream)
+
+        assert producer.fetched == 1
+        stream.close()
+
+    def test_abandoned_stream_stops_producer(self, get_user, create_table, aws_mock, save_records, producer):
+        stream = get_user.all().limit(1).stream(prefetch=1)
+        next(stream)
+        assert producer.wait(lambda: 3 in producer.blocked_at)
+        stream.close()
+
+        assert producer.finished.wait(timeout=5)
+        assert producer.fetched == 3
+
+    def test_errors_reach_the_consumer(self, get_user, create_table, aws_mock, save_records, monkeypatch):
+        def broken_scan_page(table, scan_attributes, limit=None, budget=None):
+            raise RuntimeError("throttled")
+
+        monkeypatch.setattr(CrudMixin, "_scan_page", staticmethod(broken_scan_page))
+
+        with pytest.raises(RuntimeError, match="throttled"):
+            list(get_user.all().stream(prefetch=2))
+
+    def test_parallel_stream_with_prefetch(self, get_user, create_table, aws_mock, save_records):
+        ids = [user.id for user in get_user.all().limit(2).parallel(segments=3).stream(prefetch=1)]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    @pytest.mark.parametrize("prefetch", [-1, 1.5, "2", True])
+    def test_invalid_prefetch_raises(self, get_user, prefetch):
+        with pytest.raises(InvalidArgumentException, match="prefetch"):
+            get_user.all().stream(prefetch=prefetch)
+
+
+class TestStreamPages:
+    def test_one_collection_per_page(self, get_user, create_table, aws_mock, save_records):
+        pages = list(get_user.all().limit(5).stream_pages())
+
+        assert all(isinstance(page, Collection) for page in pages)
+        assert all(page.count() <= 5 for page in pages)
+        assert sorted(id for page in pages for id in page.pluck("id")) == list(range(1, 21))
+        assert all(page.last_evaluated_key() for page in pages[:-1])
+        assert pages[-1].last_evaluated_key() is None
+
+    def test_page_checkpoint_resumes(self, get_user, create_table, aws_mock, save_records):
+        pages = get_user.all().limit(6).stream_pages()
+        first = next(pages)
+        pages.close()
+
+        rest = get_user.all().limit(6).offset(first.last_evaluated_key()).stream_pages()
+        ids = first.pluck("id") + [id for page in rest for id in page.pluck("id")]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_fixed_size_chunks(self, get_user, create_table, aws_mock, save_records):
+        chunks = list(get_user.all().limit(5).stream_pages(chunk_size=7))
+
+        assert [chunk.count() for chunk in chunks] == [7, 7, 6]
+        assert chunks[-1].last_evaluated_key() is None
+
+    def test_chunk_checkpoint_resumes_exactly(self, get_user, create_table, aws_mock, save_records):
+        chunks = get_user.all().limit(5).stream_pages(chunk_size=7)
+        first = next(chunks)
+        chunks.close()
+
+        rest = get_user.all().limit(5).offset(first.last_evaluated_key()).stream(as_dicts=True)
+        ids = first.pluck("id") + [row["id"] for row in rest]
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_chunk_checkpoint_on_index_query(self, get_user, create_table, aws_mock, save_records):
+        expected = sorted(user.id for user in get_user.where("role", "admin").index("role-index").stream())
+        chunks = get_user.where("role", "admin").index("role-index").limit(2).stream_pages(chunk_size=1)
+        first = next(chunks)
+        chunks.close()
+
+        assert set(first.last_evaluated_key()) == {"id", "role"}
+
+        rest = get_user.where("role", "admin").index("role-index").offset(first.last_evaluated_key()).stream()
+        assert sorted(first.pluck("id") + [user.id for user in rest]) == expected
+
+    def test_chunk_checkpoint_with_projection(self, get_user, create_table, aws_mock, save_records):
+        chunks = get_user.all().attributes_to_get(["stars"]).limit(5).stream_pages(chunk_size=3)
+        first = next(chunks)
+        chunks.close()
+
+        assert set(first.last_evaluated_key()) == {"id"}
+        assert first.first().first_name is None
+
+    def test_parallel_chunk_checkpoint(self, get_user, create_table, aws_mock, save_records):
+        chunks = get_user.all().limit(2).parallel(segments=3).stream_pages(chunk_size=4)
+        first = next(chunks)
+        chunks.close()
+
+        checkpoint = first.last_evaluated_key()
+        assert set(checkpoint).issubset({0, 1, 2})
+
+        rest = get_user.all().parallel(segments=3).offset(checkpoint).stream()
+        assert sorted(first.pluck("id") + [user.id for user in rest]) == list(range(1, 21))
+
+    def test_chunks_as_dicts(self, get_user, create_table, aws_mock, save_records):
+        chunks = list(get_user.all().stream_pages(chunk_size=10, as_dicts=True, prefetch=1))
+
+        assert [chunk.count() for chunk in chunks] == [10, 10]
+        assert all(isinstance(row, dict) for chunk in chunks for row in chunk)
+        assert sorted(chunks[0].pluck("id") + chunks[1].pluck("id")) == list(range(1, 21))
+
+    @pytest.mark.parametrize("chunk_size", [0, -3, 2.5, "10", False])
+    def test_invalid_chunk_size_raises(self, get_user, chunk_size):
+        with pytest.raises(InvalidArgumentException, match="chunk_size"):
+            get_user.all().stream_pages(chunk_size=chunk_size)
+
+
+if __name__ == "__main__":
+    pytest.main()
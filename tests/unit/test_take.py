@@ -0,0 +1,105 @@
+import pytest
+
+from dynolayer.exceptions import InvalidArgumentException
+
+
+def drain(build, take):
+    ids = []
+    last_key = None
+    while True:
+        query = build().take(take)
+        if last_key:
+            query = query.offset(last_key)
+        page = query.get(all=True)
+        ids.extend(page.pluck("id"))
+        last_key = page.last_evaluated_key()
+        if not last_key:
+            return ids
+
+
+class TestTake:
+    def test_unfiltered_take_reads_exactly_n(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        result = get_user.all().take(7).get(all=True)
+
+        assert result.count() == 7
+        assert scan_pages == [7]
+        assert result.last_evaluated_key() == {"id": result.to_list()[-1]["id"]}
+
+    def test_filtered_take_fills_across_pages(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        result = get_user.where("stars", ">=", 0).limit(3).take(7).get(all=True)
+
+        assert result.count() == 7
+        assert len(scan_pages) == 3
+        assert result.last_evaluated_key() == {"id": result.to_list()[-1]["id"]}
+
+    def test_resume_returns_each_item_once(self, get_user, create_table, aws_mock, save_records):
+        ids = drain(lambda: get_user.where("stars", ">=", 0).limit(3), 7)
+
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_selective_filter(self, get_user, create_table, aws_mock, save_records):
+        wanted = [2, 5, 8, 11, 14, 17, 20]
+
+        ids = drain(lambda: get_user().where_in("id", wanted).limit(4), 3)
+
+        assert sorted(ids) == wanted
+
+    def test_fewer_matches_than_take(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.where("stars", ">=", 0).limit(6).take(50).get(all=True)
+
+        assert result.count() == 20
+        assert result.last_evaluated_key() is None
+
+    def test_take_on_index_query(self, get_user, create_table, aws_mock, save_records):
+        expected = sorted(user.id for user in get_user.where("role", "admin").index("role-index").stream())
+        if len(expected) < 2:
+            pytest.skip("not enough admins in the random fixture")
+
+        first = get_user.where("role", "admin").index("role-index").take(1).get(all=True)
+
+        assert set(first.last_evaluated_key()) == {"id", "role"}
+        ids = drain(lambda: get_user.where("role", "admin").index("role-index"), 1)
+        assert sorted(ids) == expected
+
+    def test_projection_keeps_key_attributes(self, get_user, create_table, aws_mock, save_records):
+        result = get_user.all().attributes_to_get(["stars"]).take(3).get(all=True)
+
+        assert result.count() == 3
+        assert set(result.last_evaluated_key()) == {"id"}
+
+    def test_parallel_take(self, get_user, create_table, aws_mock, save_records):
+        first = get_user.all().parallel(segments=3).take(5).get(all=True)
+
+        assert first.count() == 5
+        assert isinstance(first.last_evaluated_key(), dict)
+
+        ids = drain(lambda: get_user.all().parallel(segments=3), 5)
+        assert sorted(ids) == list(range(1, 21))
+
+    def test_parallel_take_splits_the_quota(self, get_user, create_table, aws_mock, save_records, scan_pages):
+        result = get_user.all().parallel(segments=3).take(5).get(all=True)
+
+        assert result.count() == 5
+        # One share of ceil(5 / 3) per segment plus top-ups, instead of 5 items from every segment
+        assert sum(scan_pages) <= 5 + 3 - 1
+
+    def test_parallel_take_tops_up_from_other_segments(self, get_user, create_table, aws_mock, save_records):
+        wanted = [1, 2, 3, 4, 5, 6, 7]
+
+        first = get_user().where_in("id", wanted).parallel(segments=4).take(6).get(all=True)
+        ids = drain(lambda: get_user().where_in("id", wanted).parallel(segments=4), 6)
+
+        assert first.count() == 6
+        assert sorted(ids) == wanted
+
+    def test_take_is_reported_by_explain(self, get_user, create_table, aws_mock):
+        assert get_user.all().take(4).explain()["take"] == 4
+
+    @pytest.mark.parametrize("count", [0, -2, 1.5, "3", True])
+    def test_invalid_take_raises(self, get_user, count):
+        with pytest.raises(InvalidArgumentException, match="take"):
+            get_user.all().take(count)
+
+
+if __name__ == "__main__":
+    pytest.main()